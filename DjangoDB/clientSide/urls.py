@@ -11,8 +11,11 @@ urlpatterns = [
         path('get/subcategories/', subcategories), # add and get api function are same 
         path('get/brands/', get_brands),
         path('get/product-list/', products_list),
+        path('get/products/search/', product_search),
         path('get/product-details/<int:id>/', product_detail),
+        path('get/stock/', product_stock), # ?ids=1,2,3 -> stock minus active holds
         path('get/product-reviews/', views.client_reviews),
+        path('get/product-reviews/<int:product_id>/', views.product_reviews),
         path("get/wishlist/", views.wishlist_items),
         path("get/cart/", views.cart_items),
         path("get/orders/", client_order_detail),
@@ -27,8 +30,11 @@ urlpatterns = [
 
         path("wishlist/add/", views.add_to_wishlist),
         path("cart/add/", views.add_to_cart),
+        path("cart/batch/", views.cart_batch), # add / set / remove ops in one request
+        path("cart/reserve/", views.cart_reserve), # POST hold stock for checkout, DELETE release
         path("reviews/submit/", views.submit_review), #client side api
         path("create/order/", create_order),# create order
+        path("cart/checkout/", checkout_cart), # order from cart, cart cleared
         path('contact/', views.mail_data), #send email admin
         
         path("banner/create/", views.create_sale_banner), 
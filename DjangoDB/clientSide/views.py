@@ -2,7 +2,7 @@ from rest_framework.response import Response
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import AllowAny
 from rest_framework import status
-from electricApp.models import Category, Subcategory
+from electricApp.cache import taxonomy_response
 
 
 # =========================
@@ -17,14 +17,7 @@ def categories(request):
     # if request.headers.get("X-API-KEY") != "YOUR_SECRET_KEY":
     #     return Response({"error": "Unauthorized"}, status=403)
 
-    data = []
-    for cat in Category.objects.all():
-        data.append({
-            "id": cat.id,
-            "name": cat.name,
-        })
-
-    return Response({"data": data})
+    return taxonomy_response(request, "categories")
 
 
 # =========================
@@ -36,15 +29,4 @@ def subcategories(request):
 
     #  (Optional) Secret Key verification yaha bhi laga sakte ho
 
-    data = []
-    for sub in Subcategory.objects.select_related('category').all():
-        data.append({
-            "id": sub.id,
-            "name": sub.name,
-            "category": {
-                "id": sub.category.id,
-                "name": sub.category.name
-            }
-        })
-
-    return Response({"data": data})
\ No newline at end of file
+    return taxonomy_response(request, "subcategories")
\ No newline at end of file
@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class ElectricappConfig(AppConfig):
     name = 'electricApp'
+
+    def ready(self):
+        from . import signals  # noqa: F401
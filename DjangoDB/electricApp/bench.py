@@ -0,0 +1,195 @@
+import json
+import platform
+import subprocess
+import time
+import django
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.utils.timezone import now
+from rest_framework_simplejwt.tokens import RefreshToken
+from .models import CustomUser, Product, Order
+from .seeding import seed_data
+
+
+# =============== ENDPOINT BENCHMARK ===============
+# Times the key endpoints through the Django test client (full middleware /
+# DRF / serialization stack, no network) on the current database.
+# Per endpoint:
+#   cold_*  -> first request after cache.clear()
+#   p50/p95 -> the following `repeat` requests (warm caches)
+#   queries -> most SQL queries seen in one warm request
+# run_benchmark() grows the seeded data (seeding.py) through several sizes,
+# manage.py bench_endpoints runs it on a throwaway test database and writes
+# JSON; compare_reports() diffs two of those files (e.g. two commits).
+# ==================================================
+
+BENCH_REPEAT = 20
+BENCH_ADMIN = "bench_admin"
+
+# name -> (method, url, user, body); {product} / {order} are filled per run
+BENCH_ENDPOINTS = {
+    "products_list": ("GET", "/api/products/?limit=20", "admin", None),
+    "products_list_page": ("GET", "/api/get/product-list/?limit=20&fields=id,name,price,image", None, None),
+    "product_search": ("GET", "/api/get/products/search/?q=cable&limit=20", None, None),
+    "product_detail": ("GET", "/api/products/{product}/", "admin", None),
+    "admin_orders": ("GET", "/api/orders/", "admin", None),
+    "admin_orders_filtered": ("GET", "/api/orders/?status=Delivered&sort=total_desc", "admin", None),
+    "admin_order_detail": ("GET", "/api/orders/{order}/", "admin", None),
+    "client_orders": ("GET", "/api/get/orders/", "customer", None),
+    "dashboard_overview": ("GET", "/api/dashboard/overview/", "admin", None),
+    "accounting_dashboard": ("GET", "/api/reports/accounting/dashboard/", "admin", None),
+    "orders_dashboard": ("GET", "/api/reports/orders/dashboard/", "admin", None),
+    "create_order": ("POST", "/api/create/order/", "customer", {
+        "customer_name": "Bench Customer",
+        "contact_number": "9000000000",
+        "address": "1 Bench Street, Bench City",
+        "items": [{"product_id": "{product}", "quantity": 1}],
+    }),
+}
+
+
+def percentile(values, p):
+    # nearest rank on sorted values
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+def _fill(value, targets):
+    if isinstance(value, str):
+        return value.format(**targets)
+    if isinstance(value, dict):
+        return {k: _fill(v, targets) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_fill(v, targets) for v in value]
+    return value
+
+
+def bench_headers():
+    admin = CustomUser.objects.filter(username=BENCH_ADMIN).first()
+    if admin is None:
+        admin = CustomUser.objects.create_superuser(BENCH_ADMIN, "bench_admin@example.com", None)
+    customer = CustomUser.objects.filter(username__startswith="seed_").order_by("id").first()
+    if customer is None:
+        customer = admin
+
+    return {
+        "admin": {"HTTP_AUTHORIZATION": f"Bearer {RefreshToken.for_user(admin).access_token}"},
+        "customer": {"HTTP_AUTHORIZATION": f"Bearer {RefreshToken.for_user(customer).access_token}"},
+        None: {},
+    }
+
+
+def bench_targets():
+    # a product that can take repeat orders and any order for the detail views
+    product = (
+        Product.objects
+        .filter(is_active=True, stock__gte=1000)
+        .order_by("id")
+        .values_list("id", flat=True)
+        .first()
+    ) or Product.objects.filter(is_active=True).order_by("-stock").values_list("id", flat=True).first()
+    order = Order.objects.order_by("id").values_list("id", flat=True).first()
+    return {"product": product or 0, "order": order or 0}
+
+
+def _request(client, method, url, body, headers):
+    with CaptureQueriesContext(connection) as queries:
+        started = time.perf_counter()
+        if method == "GET":
+            response = client.get(url, **headers)
+        else:
+            response = client.generic(method, url, json.dumps(body), content_type="application/json", **headers)
+        elapsed = time.perf_counter() - started
+    return response.status_code, elapsed * 1000, len(queries)
+
+
+def bench_endpoints(repeat=BENCH_REPEAT, endpoints=None):
+    # current database -> {name: stats}
+    client = Client()
+    headers = bench_headers()
+    targets = bench_targets()
+
+    results = {}
+    for name, (method, url, user, body) in (endpoints or BENCH_ENDPOINTS).items():
+        url, body = _fill(url, targets), _fill(body, targets)
+
+        cache.clear()
+        cold_status, cold_ms, cold_queries = _request(client, method, url, body, headers[user])
+
+        timings, query_counts, statuses = [], [], set()
+        for _ in range(repeat):
+            code, ms, count = _request(client, method, url, body, headers[user])
+            timings.append(ms)
+            query_counts.append(count)
+            statuses.add(code)
+        timings.sort()
+
+        results[name] = {
+            "method": method,
+            "status": sorted(statuses | {cold_status}),
+            "cold_ms": round(cold_ms, 2),
+            "cold_queries": cold_queries,
+            "p50_ms": round(percentile(timings, 0.50), 2) if timings else None,
+            "p95_ms": round(percentile(timings, 0.95), 2) if timings else None,
+            "mean_ms": round(sum(timings) / len(timings), 2) if timings else None,
+            "queries": max(query_counts) if query_counts else cold_queries,
+        }
+    return results
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, timeout=5, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def size_rows(size):
+    # catalog size -> seeded totals
+    return {"products": size, "users": max(10, size // 10), "orders": size}
+
+
+def run_benchmark(sizes, repeat=BENCH_REPEAT, seed=1, images=True, log=None):
+    report = {
+        "meta": {
+            "commit": _git_commit(),
+            "created_at": now().isoformat(),
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "database": connection.vendor,
+            "repeat": repeat,
+            "seed": seed,
+        },
+        "sizes": {},
+    }
+
+    for size in sorted(sizes):
+        started = time.perf_counter()
+        rows = size_rows(size)
+        seed_data(seed=seed, images=images, **rows)
+        if log:
+            log(f"size {size}: seeded in {time.perf_counter() - started:.1f}s, benchmarking")
+        report["sizes"][str(size)] = {
+            "rows": rows,
+            "endpoints": bench_endpoints(repeat=repeat),
+        }
+    return report
+
+
+def compare_reports(old, new, metric="p50_ms"):
+    # -> [(size, endpoint, old value, new value, old queries, new queries)], shared sizes only
+    rows = []
+    for size, current in new["sizes"].items():
+        previous = old["sizes"].get(size)
+        if previous is None:
+            continue
+        for name, stats in current["endpoints"].items():
+            before = previous["endpoints"].get(name)
+            if before is None:
+                continue
+            rows.append((size, name, before[metric], stats[metric], before["queries"], stats["queries"]))
+    return rows
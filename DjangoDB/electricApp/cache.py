@@ -0,0 +1,257 @@
+import time
+from django.core.cache import cache
+from django.http import Http404
+from django.shortcuts import get_object_or_404
+from django.utils.http import parse_etags
+from rest_framework.response import Response
+from rest_framework import status
+from .models import Category, Subcategory, Brand, Product
+from .images import image_fields, IMAGE_BANNER_WIDTH
+from .ratings import product_rating_payload
+
+
+# =============== CACHE HELPERS ===============
+# Two layers:
+#   shared cache  -> django cache (CACHES["default"], redis in production)
+#   in-process    -> plain dict per worker, checked against the shared version
+# Writers only bump a version number, old entries simply stop being read.
+#   taxonomy         -> categories / subcategories / brands lists
+#   product:<id>     -> product detail payload (version kept only for existing
+#                       products, a deleted product's version expires)
+# cached_for() is a plain short TTL entry for dashboards.
+# ==============================================
+
+_local = {}
+
+
+def get_version(name):
+    key = f"version:{name}"
+    version = cache.get(key)
+    if version is None:
+        # start from the clock so an emptied cache never reuses an old ETag
+        cache.add(key, int(time.time() * 1000), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def bump_version(name):
+    key = f"version:{name}"
+    try:
+        cache.incr(key)
+    except ValueError:
+        # key missing (expired / cache cleared) -> start again above any old value
+        cache.set(key, get_version(name) + 1, timeout=None)
+
+
+def cached_payload(name, version, build, timeout=None, local=True):
+    # ---------- in-process ----------
+    # (skipped with local=False for per-row keys, the dict would grow with the catalog)
+    if local:
+        cached = _local.get(name)
+        if cached and cached[0] == version:
+            return cached[1]
+
+    # ---------- shared ----------
+    key = f"payload:{name}:v{version}"
+    payload = cache.get(key)
+    if payload is None:
+        payload = build()
+        cache.set(key, payload, timeout=timeout)
+
+    if local:
+        _local[name] = (version, payload)
+    return payload
+
+
+def cached_for(name, timeout, build):
+    # plain TTL entry, for payloads that may be a few seconds stale (dashboards)
+    key = f"ttl:{name}"
+    payload = cache.get(key)
+    if payload is None:
+        payload = build()
+        cache.set(key, payload, timeout=timeout)
+    return payload
+
+
+def not_modified(request, etag):
+    header = request.headers.get("If-None-Match")
+    if not header:
+        return False
+    etags = parse_etags(header)
+    return etag in etags or "*" in etags
+
+
+def etag_response(request, etag, build_data):
+    if not_modified(request, etag):
+        response = Response(status=status.HTTP_304_NOT_MODIFIED)
+    else:
+        response = Response(build_data())
+    response["ETag"] = etag
+    return response
+
+
+# =============== TAXONOMY (categories / subcategories / brands) ===============
+TAXONOMY = "taxonomy"
+
+
+def build_categories():
+    return [
+        {"id": cat["id"], "name": cat["name"]}
+        for cat in Category.objects.values("id", "name")
+    ]
+
+
+def build_subcategories():
+    return [
+        {
+            "id": sub["id"],
+            "name": sub["name"],
+            "category": {
+                "id": sub["category_id"],
+                "name": sub["category__name"]
+            }
+        }
+        for sub in Subcategory.objects.values(
+            "id", "name", "category_id", "category__name"
+        )
+    ]
+
+
+def build_brands():
+    return [
+        {
+            "id": brd["id"],
+            "name": brd["name"],
+            "category": {
+                "id": brd["category_id"],
+                "name": brd["category__name"]
+            } if brd["category_id"] else None
+        }
+        for brd in Brand.objects.values(
+            "id", "name", "category_id", "category__name"
+        )
+    ]
+
+
+TAXONOMY_BUILDERS = {
+    "categories": build_categories,
+    "subcategories": build_subcategories,
+    "brands": build_brands,
+}
+
+
+def taxonomy_response(request, name):
+    # version check is a cache hit only, 304 is answered without any query
+    version = get_version(TAXONOMY)
+    etag = f'"{name}-v{version}"'
+    return etag_response(
+        request,
+        etag,
+        lambda: {
+            "data": cached_payload(
+                f"{TAXONOMY}:{name}", version, TAXONOMY_BUILDERS[name]
+            )
+        }
+    )
+
+
+def bump_taxonomy(**kwargs):
+    bump_version(TAXONOMY)
+
+
+# =============== PRODUCT DETAIL (one entry per product) ===============
+PRODUCT_DETAIL_TIMEOUT = 60 * 60
+
+
+def build_product_detail(id):
+    product = get_object_or_404(
+        Product.objects
+        .select_related("category", "subcategory", "rating")
+        .prefetch_related("specifications", "images"),
+        id=id
+    )
+
+    specs = [
+        {"key": s.key, "value": s.value}
+        for s in product.specifications.all()
+    ]
+
+    images = []
+    for img in product.images.all():
+        sized = image_fields(img.image.name, width=IMAGE_BANNER_WIDTH, formats=img.image_formats)
+        images.append({
+            "id": img.id,
+            "url": img.image.url,
+            "is_primary": img.is_primary,
+            "large": sized["image"],
+            "srcset": sized["image_srcset"],
+            "sources": sized["image_sources"],
+        })
+
+    return {
+        "id": product.id,
+        "name": product.name,
+        "price": product.price,
+        "stock": product.stock,
+        "sku": product.sku,
+        "part_number": product.part_number,
+        "is_active": product.is_active,
+        "category": {
+            "id": product.category.id,
+            "name": product.category.name
+        },
+        "subcategory": {
+            "id": product.subcategory.id,
+            "name": product.subcategory.name
+        },
+        "description": product.description,
+        "specifications": specs,
+        "short_description": product.short_description,
+        "datasheet_url": product.datasheet_url,
+        "images": images,
+        "rating": product_rating_payload(product),
+    }
+
+
+def product_detail_response(request, id):
+    # an unknown id (scans) must not leave a permanent version key behind
+    if cache.get(f"version:product:{id}") is None and not Product.objects.filter(id=id).exists():
+        raise Http404
+
+    # category / subcategory names are part of the payload, so taxonomy version is too
+    version = f"{get_version(TAXONOMY)}-{get_version(f'product:{id}')}"
+    etag = f'"product-{id}-v{version}"'
+    return etag_response(
+        request,
+        etag,
+        lambda: cached_payload(
+            f"product:{id}",
+            version,
+            lambda: build_product_detail(id),
+            timeout=PRODUCT_DETAIL_TIMEOUT,
+            local=False,
+        )
+    )
+
+
+def bump_product(product_id):
+    bump_version(f"product:{product_id}")
+
+
+def retire_product(product_id):
+    # deleted product: old ETags stop matching, the key goes away with the payloads
+    key = f"version:product:{product_id}"
+    cache.set(key, get_version(f"product:{product_id}") + 1, timeout=PRODUCT_DETAIL_TIMEOUT)
+
+
+def bump_products(product_ids):
+    # bulk writes (import / bulk update): two cache round trips for the whole batch
+    keys = [f"version:product:{pk}" for pk in product_ids]
+    if not keys:
+        return
+    current = cache.get_many(keys)
+    clock = int(time.time() * 1000)
+    cache.set_many(
+        {key: max(current.get(key, 0) + 1, clock) for key in keys},
+        timeout=None
+    )
@@ -0,0 +1,148 @@
+from django.db import transaction
+from django.db.models import Case, When, F, Q, Sum, Value, Window, BooleanField, DecimalField, ExpressionWrapper
+from django.utils.timezone import now
+from .models import Cart, CustomUser, Product
+from .images import image_fields
+from .holds import held_quantity
+
+
+# =============== CART ===============
+# apply_cart_ops -> a list of add / set / remove ops (quantity stepper bursts,
+#                   "move all to cart") in one transaction:
+#   1 query   -> lock the user row: batches of one shopper run one at a time,
+#                so two adds of a product not yet in the cart both count
+#   1 query   -> lock the user's cart rows for the touched products
+#   1 query   -> products exist
+#   1 delete  -> removed rows
+#   1 upsert  -> new + changed rows (bulk_create ON CONFLICT (user, product))
+# cart_summary   -> lines, line totals, cart total and stock availability in
+#                   ONE query (SUM() OVER () window), nothing summed in Python;
+#                   a line is available when stock minus other shoppers'
+#                   holds (holds.py) covers its quantity
+# ====================================
+
+CART_BATCH_MAX = 100
+CART_OPS = ("add", "set", "remove")
+
+MONEY = DecimalField(max_digits=12, decimal_places=2)
+LINE_TOTAL = ExpressionWrapper(F("quantity") * F("product__price"), output_field=MONEY)
+
+
+class CartError(Exception):
+    def __init__(self, message, status_code=400):
+        super().__init__(message)
+        self.message = message
+        self.status_code = status_code
+
+
+def parse_cart_ops(ops):
+    # [{"op": "add", "product_id": 1, "quantity": 2}, ...] -> [("add", 1, 2), ...]
+    if not ops or not isinstance(ops, list):
+        raise CartError("Ops must be a non-empty list")
+    if len(ops) > CART_BATCH_MAX:
+        raise CartError(f"At most {CART_BATCH_MAX} ops per request")
+
+    parsed = []
+    for op in ops:
+        if not isinstance(op, dict) or op.get("op") not in CART_OPS:
+            raise CartError(f"Each op must be one of: {', '.join(CART_OPS)}")
+        try:
+            product_id = int(op.get("product_id"))
+            quantity = int(op.get("quantity", 1)) if op["op"] != "remove" else 0
+        except (TypeError, ValueError):
+            raise CartError("product_id and quantity must be numbers")
+        if op["op"] != "remove" and quantity < 1:
+            raise CartError("Quantity must be >= 1")
+        parsed.append((op["op"], product_id, quantity))
+    return parsed
+
+
+def apply_cart_ops(user, ops):
+    # ops from parse_cart_ops, applied in list order -> {product_id: final quantity, 0 = removed}
+    product_ids = {product_id for _, product_id, _ in ops}
+
+    with transaction.atomic():
+        # cart rows that do not exist yet cannot be locked, the user row can
+        list(CustomUser.objects.select_for_update().filter(id=user.id).values_list("id", flat=True))
+        current = dict(
+            Cart.objects
+            .select_for_update()
+            .filter(user=user, product_id__in=product_ids)
+            .values_list("product_id", "quantity")
+        )
+
+        wanted = {product_id for op, product_id, _ in ops if op != "remove"} - current.keys()
+        found = set(Product.objects.filter(id__in=wanted).values_list("id", flat=True))
+        missing = sorted(wanted - found)
+        if missing:
+            raise CartError(f"Product with id {missing[0]} not found", 404)
+
+        final = dict(current)
+        for op, product_id, quantity in ops:
+            if op == "add":
+                final[product_id] = final.get(product_id, 0) + quantity
+            elif op == "set":
+                final[product_id] = quantity
+            else:
+                final[product_id] = 0
+
+        removed = [pid for pid, qty in final.items() if qty == 0 and pid in current]
+        changed = {pid: qty for pid, qty in final.items() if qty and current.get(pid) != qty}
+
+        if removed:
+            Cart.objects.filter(user=user, product_id__in=removed).delete()
+        if changed:
+            Cart.objects.bulk_create(
+                [Cart(user=user, product_id=pid, quantity=qty) for pid, qty in changed.items()],
+                update_conflicts=True,
+                unique_fields=["user", "product"],
+                update_fields=["quantity"],
+            )
+
+    return {pid: final[pid] for pid in product_ids}
+
+
+def cart_summary(user):
+    rows = (
+        Cart.objects
+        .filter(user=user)
+        .order_by("id")
+        .values(
+            "id", "product_id", "quantity",
+            "product__name", "product__price", "product__stock", "product__image", "product__image_formats",
+        )
+        .annotate(held=held_quantity(now(), exclude_user=user, product="product_id"))
+        .annotate(
+            line_total=LINE_TOTAL,
+            available=Case(
+                When(Q(product__is_active=True, product__stock__gte=F("quantity") + F("held")), then=Value(True)),
+                default=Value(False),
+                output_field=BooleanField(),
+            ),
+            cart_total=Window(Sum(LINE_TOTAL)),
+            cart_qty=Window(Sum("quantity")),
+        )
+    )
+
+    items = []
+    total, count = 0, 0
+    for row in rows:
+        total, count = row["cart_total"], row["cart_qty"]
+        items.append({
+            "id": row["id"],
+            "product_id": row["product_id"],
+            "name": row["product__name"],
+            "price": float(row["product__price"]),
+            "quantity": row["quantity"],
+            "subtotal": float(row["line_total"]),
+            "stock": max(row["product__stock"] - row["held"], 0),
+            "available": row["available"],
+            **image_fields(row["product__image"], formats=row["product__image_formats"]),
+        })
+
+    return {
+        "items": items,
+        "total": float(total),
+        "count": count,
+        "available": all(item["available"] for item in items),
+    }
@@ -0,0 +1,574 @@
+import csv
+import io
+import json
+from decimal import Decimal, InvalidOperation
+from django.db import connection, transaction, IntegrityError
+from django.db.models import F, Max, Value
+from django.db.models.functions import Round
+from django.utils.text import slugify
+from .models import Category, Subcategory, Brand, Product, ProductSpecification
+from .cache import bump_products
+from .search import index_products
+
+
+# =============== BULK CATALOG IMPORT / EXPORT ===============
+# CSV or JSONL, one product per row, upsert on sku:
+#   read_rows        -> streams (line number, dict) from the file
+#   import_products  -> chunks of IMPORT_CHUNK_SIZE rows, per chunk one transaction:
+#                       1 select (existing skus), bulk_create for new skus,
+#                       changed fields only for existing ones (shared patch -> 1 UPDATE),
+#                       specs replaced with 1 delete + 1 bulk_create
+# Bulk writes skip model signals, so the search index and product detail
+# cache are refreshed here once per chunk.
+# Empty cells / nulls mean "keep the current value" on update.
+# Used by manage.py import_products / export_products and products/import|export/
+# ============================================================
+
+IMPORT_CHUNK_SIZE = 1000
+IMPORT_MAX_ERRORS = 1000  # errors listed in the report, "failed" is always the full count
+IMPORT_FORMATS = ("csv", "jsonl")
+
+CATALOG_FIELDS = (
+    "sku", "name", "category", "subcategory", "brand", "part_number",
+    "price", "stock", "is_active", "short_description", "description",
+    "datasheet_url", "specifications",
+)
+UPDATE_FIELDS = [
+    "name", "category", "subcategory", "brand", "part_number",
+    "price", "stock", "is_in_stock", "is_active",
+    "short_description", "description", "datasheet_url",
+]
+TEXT_FIELDS = {
+    "name": 255,
+    "part_number": 100,
+    "short_description": None,
+    "description": None,
+    "datasheet_url": 200,
+}
+UPDATE_ATTNAMES = {
+    field: Product._meta.get_field(field).attname for field in UPDATE_FIELDS
+}
+MAX_PRICE = Decimal("99999999.99")
+
+
+class RowError(Exception):
+    pass
+
+
+def import_format(filename, fmt=None):
+    fmt = (fmt or filename.rsplit(".", 1)[-1]).lower()
+    fmt = {"ndjson": "jsonl", "json": "jsonl"}.get(fmt, fmt)
+    if fmt not in IMPORT_FORMATS:
+        raise ValueError(f"Unsupported format, use one of: {', '.join(IMPORT_FORMATS)}")
+    return fmt
+
+
+def read_rows(stream, fmt):
+    # stream is a binary file, rows are yielded one at a time (never loaded whole)
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    if fmt == "csv":
+        for line_no, row in enumerate(csv.DictReader(text), start=2):
+            yield line_no, {
+                key.strip().lower(): value
+                for key, value in row.items() if key
+            }
+        return
+
+    for line_no, line in enumerate(text, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            row = None
+        yield line_no, row
+
+
+# ---------- LOOKUPS : id or name (case-insensitive) -> id ----------
+class Taxonomy:
+    def __init__(self):
+        self.categories = {}
+        for pk, name in Category.objects.values_list("id", "name"):
+            self.categories[name.lower()] = pk
+            self.categories[str(pk)] = pk
+
+        self.subcategories = {}
+        self.subcategory_category = {}
+        for pk, category_id, name in Subcategory.objects.values_list("id", "category_id", "name"):
+            self.subcategories[(category_id, name.lower())] = pk
+            self.subcategories[(category_id, str(pk))] = pk
+            self.subcategory_category[pk] = category_id
+
+        self.brands = {}
+        for pk, name in Brand.objects.values_list("id", "name"):
+            self.brands[name.lower()] = pk
+            self.brands[str(pk)] = pk
+
+
+def _value(raw, field):
+    value = raw.get(field)
+    if isinstance(value, str):
+        value = value.strip()
+    return None if value in (None, "") else value
+
+
+def _bool(value):
+    if isinstance(value, bool):
+        return value
+    value = str(value).lower()
+    if value in ("true", "1", "yes", "y"):
+        return True
+    if value in ("false", "0", "no", "n"):
+        return False
+    raise RowError(f"Invalid boolean: {value}")
+
+
+def _price(value):
+    try:
+        price = Decimal(str(value)).quantize(Decimal("0.01"))
+    except InvalidOperation:
+        raise RowError(f"Invalid price: {value}")
+    if not Decimal("0") <= price <= MAX_PRICE:
+        raise RowError(f"Invalid price: {value}")
+    return price
+
+
+def _stock(value):
+    try:
+        stock = int(value)
+        if stock < 0:
+            raise ValueError
+    except (TypeError, ValueError):
+        raise RowError(f"Invalid stock: {value}")
+    return stock
+
+
+def _specifications(value):
+    # [{"key": .., "value": ..}] or {"key": "value"}, CSV cells hold the same as JSON
+    if isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except ValueError:
+            raise RowError("specifications must be JSON")
+    if isinstance(value, dict):
+        value = [{"key": k, "value": v} for k, v in value.items()]
+    if not isinstance(value, list):
+        raise RowError("specifications must be a list or an object")
+
+    specs = []
+    for spec in value:
+        if not isinstance(spec, dict):
+            raise RowError("Each specification needs key and value")
+        key = str(spec.get("key") or "").strip()
+        val = str(spec.get("value") or "").strip()
+        if key and val:
+            specs.append((key[:150], val[:255]))
+    return specs
+
+
+def product_slug(name, sku):
+    # sku is unique, so name + sku is too (name part trimmed to fit the 50 chars)
+    sku_part = slugify(sku)[:20] or "item"
+    name_part = slugify(name)[:49 - len(sku_part)].strip("-")
+    return f"{name_part}-{sku_part}" if name_part else sku_part
+
+
+def build_product(raw, sku, product, taxonomy):
+    # -> (Product ready to save, [(key, value)] or None when specs were not given)
+    creating = product is None
+    if creating:
+        product = Product(sku=sku, short_description="", description="")
+
+    for field, max_length in TEXT_FIELDS.items():
+        value = _value(raw, field)
+        if value is not None:
+            value = str(value)
+            if max_length and len(value) > max_length:
+                raise RowError(f"{field} is longer than {max_length} characters")
+            setattr(product, field, value)
+
+    category = _value(raw, "category")
+    if category is not None:
+        category_id = taxonomy.categories.get(str(category).lower())
+        if category_id is None:
+            raise RowError(f"Unknown category: {category}")
+        product.category_id = category_id
+
+    subcategory = _value(raw, "subcategory")
+    if subcategory is not None:
+        subcategory_id = taxonomy.subcategories.get((product.category_id, str(subcategory).lower()))
+        if subcategory_id is None:
+            raise RowError(f"Unknown subcategory for this category: {subcategory}")
+        product.subcategory_id = subcategory_id
+    elif product.subcategory_id and taxonomy.subcategory_category.get(product.subcategory_id) != product.category_id:
+        raise RowError("Subcategory does not belong to the category")
+
+    brand = _value(raw, "brand")
+    if brand is not None:
+        brand_id = taxonomy.brands.get(str(brand).lower())
+        if brand_id is None:
+            raise RowError(f"Unknown brand: {brand}")
+        product.brand_id = brand_id
+
+    price = _value(raw, "price")
+    if price is not None:
+        product.price = _price(price)
+
+    stock = _value(raw, "stock")
+    if stock is not None:
+        product.stock = _stock(stock)
+    product.is_in_stock = product.stock > 0
+
+    is_active = _value(raw, "is_active")
+    if is_active is not None:
+        product.is_active = _bool(is_active)
+
+    if creating:
+        missing = [
+            field for field, value in (
+                ("name", product.name),
+                ("category", product.category_id),
+                ("subcategory", product.subcategory_id),
+                ("price", product.price),
+            )
+            if value in (None, "")
+        ]
+        if missing:
+            raise RowError(f"Missing for new product: {', '.join(missing)}")
+        product.slug = product_slug(product.name, sku)
+
+    specs = _value(raw, "specifications")
+    return product, (None if specs is None else _specifications(specs))
+
+
+# ---------- IMPORT ----------
+def _error(report, line_no, sku, message):
+    report["failed"] += 1
+    if len(report["errors"]) < IMPORT_MAX_ERRORS:
+        report["errors"].append({"row": line_no, "sku": sku, "error": message})
+
+
+def _changes(product, original):
+    # {field: new value} for the UPDATE_FIELDS that differ from the loaded row
+    return {
+        field: getattr(product, attname)
+        for field, attname in UPDATE_ATTNAMES.items()
+        if getattr(product, attname) != original[field]
+    }
+
+
+def _write_updates(updates):
+    # rows sharing the same patch (a repriced brand, a restock) -> one UPDATE,
+    # the rest -> bulk_update limited to the fields that changed
+    patches = {}
+    for product, changes in updates:
+        patches.setdefault(tuple(sorted(changes.items())), []).append(product)
+
+    singles = {}
+    for patch, products in patches.items():
+        if len(products) > 1:
+            Product.objects.filter(id__in=[p.id for p in products]).update(**dict(patch))
+        else:
+            singles.setdefault(tuple(field for field, _ in patch), []).extend(products)
+
+    for fields, products in singles.items():
+        Product.objects.bulk_update(products, fields, batch_size=100)
+
+
+def _write_products(creates, updates, report):
+    # fast path: whole chunk in one go; a clash (slug / concurrent sku) -> row by row
+    try:
+        with transaction.atomic():
+            Product.objects.bulk_create([p for _, p in creates], batch_size=500)
+            _write_updates([(p, changes) for _, p, changes in updates])
+        return creates, updates
+    except IntegrityError:
+        for _, product in creates:
+            product.pk = None
+            product._state.adding = True
+
+    written_creates, written_updates = [], []
+    for line_no, product in creates:
+        try:
+            with transaction.atomic():
+                Product.objects.bulk_create([product])
+            written_creates.append((line_no, product))
+        except IntegrityError:
+            product.pk = None
+            _error(report, line_no, product.sku, "Duplicate sku or slug")
+    for line_no, product, changes in updates:
+        try:
+            with transaction.atomic():
+                _write_updates([(product, changes)])
+            written_updates.append((line_no, product, changes))
+        except IntegrityError as e:
+            _error(report, line_no, product.sku, str(e))
+    return written_creates, written_updates
+
+
+def _replace_specifications(specs, ids):
+    # raw delete: a queryset delete would send post_delete (and reindex) per spec
+    product_ids = [ids[sku] for sku in specs]
+    if not product_ids:
+        return
+    placeholders = ", ".join(["%s"] * len(product_ids))
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'DELETE FROM "{ProductSpecification._meta.db_table}" WHERE product_id IN ({placeholders})',
+            product_ids
+        )
+    ProductSpecification.objects.bulk_create([
+        ProductSpecification(product_id=ids[sku], key=key, value=value)
+        for sku, pairs in specs.items()
+        for key, value in pairs
+    ], batch_size=1000)
+
+
+def _import_chunk(chunk, taxonomy, report, dry_run):
+    rows = {}  # sku -> (line_no, raw), a later row with the same sku wins
+    for line_no, raw in chunk:
+        if not isinstance(raw, dict):
+            _error(report, line_no, None, "Row is not a valid object")
+            continue
+        sku = _value(raw, "sku")
+        if sku is None:
+            _error(report, line_no, None, "sku is required")
+            continue
+        sku = str(sku)
+        if len(sku) > 100:
+            _error(report, line_no, sku, "sku is longer than 100 characters")
+            continue
+        if sku in rows:
+            _error(report, rows[sku][0], sku, "Duplicate sku, a later row replaces it")
+        rows[sku] = (line_no, raw)
+
+    with transaction.atomic():
+        existing = {p.sku: p for p in Product.objects.filter(sku__in=rows.keys())}
+        originals = {
+            sku: {field: getattr(p, attname) for field, attname in UPDATE_ATTNAMES.items()}
+            for sku, p in existing.items()
+        }
+
+        creates, updates, specs = [], [], {}
+        unchanged = []
+        for sku, (line_no, raw) in rows.items():
+            try:
+                product, product_specs = build_product(raw, sku, existing.get(sku), taxonomy)
+            except RowError as e:
+                _error(report, line_no, sku, str(e))
+                continue
+
+            if product_specs is not None:
+                specs[sku] = product_specs
+            if not product.pk:
+                creates.append((line_no, product))
+                continue
+            changes = _changes(product, originals[sku])
+            if changes:
+                updates.append((line_no, product, changes))
+            elif sku in specs:
+                unchanged.append(sku)  # only the specifications are rewritten
+            else:
+                report["unchanged"] += 1
+
+        if not dry_run:
+            creates, updates = _write_products(creates, updates, report)
+
+            written = [p.sku for _, p in creates] + [p.sku for _, p, _ in updates] + unchanged
+            ids = dict(Product.objects.filter(sku__in=written).values_list("sku", "id"))
+            _replace_specifications({sku: s for sku, s in specs.items() if sku in ids}, ids)
+
+            index_products(ids.values())
+            product_ids = list(ids.values())
+            transaction.on_commit(lambda: bump_products(product_ids))
+
+    report["created"] += len(creates)
+    report["updated"] += len(updates) + len(unchanged)
+
+
+def import_products(rows, chunk_size=IMPORT_CHUNK_SIZE, dry_run=False):
+    # rows -> iterable of (line number, dict); returns the report dict
+    report = {
+        "rows": 0, "created": 0, "updated": 0, "unchanged": 0, "failed": 0,
+        "dry_run": dry_run, "errors": [],
+    }
+    taxonomy = Taxonomy()
+
+    chunk = []
+    for row in rows:
+        report["rows"] += 1
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            _import_chunk(chunk, taxonomy, report, dry_run)
+            chunk = []
+    if chunk:
+        _import_chunk(chunk, taxonomy, report, dry_run)
+    return report
+
+
+# =============== BULK UPDATE (price / stock / active flag) ===============
+# items  -> [{"id": 1, "price": "9.99", "stock": 5, "is_active": true}, ...]
+# filter -> {"brand": 3, "subcategory": 7, ...} + patch {"price_percent": -10, "is_active": false}
+# One transaction; is_in_stock follows stock; detail caches bumped after commit.
+# A price_percent that would push any matched price past MAX_PRICE is rejected.
+# ========================================================================
+
+BULK_UPDATE_MAX_ITEMS = 5000
+BULK_FILTERS = {
+    "ids": "id__in",
+    "category": "category_id",
+    "subcategory": "subcategory_id",
+    "brand": "brand_id",
+    "is_active": "is_active",
+    "in_stock": "is_in_stock",
+}
+
+
+def clean_patch(data, allow_percent=False):
+    # -> {field: value or expression}, raises RowError
+    if not isinstance(data, dict):
+        raise RowError("patch must be an object")
+
+    patch = {}
+    if _value(data, "price") is not None:
+        patch["price"] = _price(data["price"])
+    if allow_percent and _value(data, "price_percent") is not None:
+        if "price" in patch:
+            raise RowError("Use price or price_percent, not both")
+        try:
+            factor = 1 + Decimal(str(data["price_percent"])) / 100
+        except InvalidOperation:
+            raise RowError("Invalid price_percent")
+        if factor < 0:
+            raise RowError("Invalid price_percent")
+        patch["price"] = Round(F("price") * Value(factor), 2)
+    if _value(data, "stock") is not None:
+        patch["stock"] = _stock(data["stock"])
+        patch["is_in_stock"] = patch["stock"] > 0
+    if _value(data, "is_active") is not None:
+        patch["is_active"] = _bool(data["is_active"])
+
+    if not patch:
+        raise RowError("Nothing to update, pass price, stock or is_active")
+    return patch
+
+
+def clean_filter(data):
+    if not isinstance(data, dict) or not data:
+        raise RowError("filter must be a non-empty object")
+
+    lookups = {}
+    for key, value in data.items():
+        if key not in BULK_FILTERS:
+            raise RowError(f"Unknown filter: {key}, use one of: {', '.join(BULK_FILTERS)}")
+        try:
+            if key == "ids":
+                if not isinstance(value, list) or not value:
+                    raise ValueError
+                value = [int(pk) for pk in value]
+            elif key in ("is_active", "in_stock"):
+                value = _bool(value)
+            else:
+                value = int(value)
+        except (TypeError, ValueError, RowError):
+            raise RowError(f"Invalid value for filter {key}")
+        lookups[BULK_FILTERS[key]] = value
+    return lookups
+
+
+def bulk_update_items(items):
+    # -> {"matched", "updated", "not_found"}; any invalid item rejects the whole list
+    if not isinstance(items, list) or not items:
+        raise RowError("items must be a non-empty list")
+    if len(items) > BULK_UPDATE_MAX_ITEMS:
+        raise RowError(f"At most {BULK_UPDATE_MAX_ITEMS} items per request")
+
+    patches = {}
+    for n, item in enumerate(items):
+        try:
+            if not isinstance(item, dict):
+                raise RowError("item must be an object")
+            try:
+                pk = int(item.get("id"))
+            except (TypeError, ValueError):
+                raise RowError("id is required")
+            patches[pk] = clean_patch(item)
+        except RowError as e:
+            raise RowError(f"items[{n}]: {e}")
+
+    with transaction.atomic():
+        found = set(
+            Product.objects.filter(id__in=patches.keys()).values_list("id", flat=True)
+        )
+        _write_updates([
+            (Product(id=pk, **patch), patch)
+            for pk, patch in patches.items() if pk in found
+        ])
+        transaction.on_commit(lambda: bump_products(found))
+
+    return {
+        "matched": len(found),
+        "updated": len(found),
+        "not_found": sorted(set(patches) - found),
+    }
+
+
+def bulk_update_filtered(filters, patch):
+    lookups = clean_filter(filters)
+    patch = clean_patch(patch, allow_percent=True)
+
+    with transaction.atomic():
+        products = Product.objects.filter(**lookups)
+        ids = list(products.values_list("id", flat=True))
+        if ids and isinstance(patch.get("price"), Round):
+            # price_percent: the highest new price must still fit price (max_digits=10)
+            top = Product.objects.filter(id__in=ids).aggregate(top=Max(patch["price"]))["top"]
+            if top is not None and top > MAX_PRICE:
+                raise RowError(f"price_percent would raise a price above {MAX_PRICE}")
+        updated = Product.objects.filter(id__in=ids).update(**patch) if ids else 0
+        transaction.on_commit(lambda: bump_products(ids))
+
+    return {"matched": len(ids), "updated": updated, "not_found": []}
+
+
+# ---------- EXPORT (same columns, so an export can be edited and imported back) ----------
+def export_products(chunk_size=IMPORT_CHUNK_SIZE):
+    products = (
+        Product.objects
+        .select_related("category", "subcategory", "brand")
+        .prefetch_related("specifications")
+        .order_by("id")
+        .iterator(chunk_size=chunk_size)
+    )
+    for p in products:
+        yield {
+            "sku": p.sku,
+            "name": p.name,
+            "category": p.category.name,
+            "subcategory": p.subcategory.name,
+            "brand": p.brand.name if p.brand else "",
+            "part_number": p.part_number,
+            "price": str(p.price),
+            "stock": p.stock,
+            "is_active": p.is_active,
+            "short_description": p.short_description,
+            "description": p.description,
+            "datasheet_url": p.datasheet_url or "",
+            "specifications": [
+                {"key": s.key, "value": s.value} for s in p.specifications.all()
+            ],
+        }
+
+
+def export_csv_rows(products):
+    yield list(CATALOG_FIELDS)
+    for p in products:
+        p["is_active"] = "true" if p["is_active"] else "false"
+        p["specifications"] = json.dumps(p["specifications"], ensure_ascii=False)
+        yield [p[field] for field in CATALOG_FIELDS]
+
+
+def export_jsonl_lines(products):
+    for p in products:
+        yield json.dumps(p, ensure_ascii=False) + "\n"
@@ -0,0 +1,183 @@
+import csv
+from datetime import datetime
+from decimal import Decimal
+from django.db.models import Sum
+from django.http import StreamingHttpResponse
+from django.utils.timezone import make_aware
+from reportlab.lib.pagesizes import A4
+from reportlab.pdfgen import canvas
+from .models import Order, OrderItem, DailySales
+
+
+# =============== REPORT EXPORTS ===============
+# Row generators read with values_list + iterator(chunk_size) so memory stays
+# flat, filters are created_at ranges (index friendly, no month/year casts).
+# write_*_pdf() draw into any file-like output (HttpResponse, job file).
+# ===============================================
+
+EXPORT_CHUNK_SIZE = 2000
+
+
+class Echo:
+    # csv.writer target that hands the formatted line back instead of storing it
+    def write(self, value):
+        return value
+
+
+def month_bounds(month, year):
+    # raises ValueError on a bad month / year
+    month, year = int(month), int(year)
+    start = datetime(year, month, 1)
+    end = datetime(year + 1, 1, 1) if month == 12 else datetime(year, month + 1, 1)
+    return make_aware(start), make_aware(end)
+
+
+def filter_month(orders, month, year, field="created_at"):
+    if month and year:
+        start, end = month_bounds(month, year)
+        orders = orders.filter(**{f"{field}__gte": start, f"{field}__lt": end})
+    return orders
+
+
+# ---------- ACCOUNTING CSV ----------
+def accounting_csv_rows(month=None, year=None):
+    orders = filter_month(Order.objects.filter(order_status="Delivered"), month, year)
+
+    yield [
+        "Order ID",
+        "Date",
+        "Customer",
+        "Gross Amount",
+        "Discount (5%)",
+        "Tax (12%)",
+        "Net Amount",
+        "Payment Status",
+    ]
+
+    rows = (
+        orders
+        .order_by("id")
+        .values_list("order_id", "created_at", "customer_name", "total_amount", "payment_status")
+        .iterator(chunk_size=EXPORT_CHUNK_SIZE)
+    )
+    for order_id, created_at, customer_name, total_amount, payment_status in rows:
+        discount = total_amount * Decimal("0.05")
+        tax = total_amount * Decimal("0.12")
+        net = total_amount - discount - tax
+
+        yield [
+            order_id,
+            created_at.strftime("%d-%m-%Y"),
+            customer_name,
+            float(total_amount),
+            float(discount),
+            float(tax),
+            float(net),
+            payment_status,
+        ]
+
+
+# ---------- ORDERS CSV (one row per item) ----------
+def orders_csv_rows(month=None, year=None, order_status=None):
+    items = filter_month(OrderItem.objects.all(), month, year, field="order__created_at")
+    if order_status:
+        items = items.filter(order__order_status=order_status)
+
+    yield [
+        "Order ID",
+        "Date",
+        "Customer",
+        "Product",
+        "Quantity",
+        "Order Status",
+        "Amount",
+    ]
+
+    rows = (
+        items
+        .order_by("order_id", "id")
+        .values_list(
+            "order__order_id", "order__created_at", "order__customer_name",
+            "product__name", "quantity", "order__order_status", "order__total_amount"
+        )
+        .iterator(chunk_size=EXPORT_CHUNK_SIZE)
+    )
+    for order_id, created_at, customer_name, product_name, quantity, order_status, total_amount in rows:
+        yield [
+            order_id,
+            created_at.strftime("%d-%m-%Y"),
+            customer_name,
+            product_name,
+            quantity,
+            order_status,
+            float(total_amount),
+        ]
+
+
+def stream_csv(rows, filename):
+    writer = csv.writer(Echo())
+    response = StreamingHttpResponse(
+        (writer.writerow(row) for row in rows),
+        content_type="text/csv"
+    )
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return response
+
+
+# ---------- PDF : accounting summary ----------
+def write_accounting_pdf(output):
+    c = canvas.Canvas(output, pagesize=A4)
+    width, height = A4
+
+    y = height - 50
+    c.setFont("Helvetica-Bold", 16)
+    c.drawString(50, y, "Accounting Report")
+
+    y -= 40
+    c.setFont("Helvetica", 11)
+
+    total = DailySales.objects.aggregate(Sum("delivered_amount"))["delivered_amount__sum"] or Decimal("0")
+    discount = total * Decimal("0.05")
+    tax = total * Decimal("0.12")
+    net = total - discount - tax
+
+    lines = [
+        f"Gross Sales: ₹{float(total)}",
+        f"Discount (5%): ₹{float(discount)}",
+        f"Tax (12%): ₹{float(tax)}",
+        f"Net Profit: ₹{float(net)}",
+    ]
+
+    for line in lines:
+        c.drawString(50, y, line)
+        y -= 20
+
+    c.showPage()
+    c.save()
+
+
+# ---------- PDF : orders summary ----------
+def write_orders_pdf(output):
+    c = canvas.Canvas(output, pagesize=A4)
+    width, height = A4
+
+    y = height - 40
+    c.setFont("Helvetica-Bold", 16)
+    c.drawString(50, y, "Orders Report")
+
+    y -= 30
+    c.setFont("Helvetica", 11)
+
+    counts = DailySales.objects.aggregate(
+        Pending=Sum("pending_orders"),
+        Delivered=Sum("delivered_orders"),
+        Cancelled=Sum("cancelled_orders"),
+    )
+
+    for s, count in counts.items():
+        c.drawString(50, y, f"{s} Orders: {count or 0}")
+        y -= 20
+
+    c.showPage()
+    c.save()
+
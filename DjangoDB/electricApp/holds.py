@@ -0,0 +1,115 @@
+from datetime import timedelta
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+from django.utils.timezone import now
+from .models import Product, StockHold
+
+
+# =============== STOCK HOLDS ===============
+# Short reservations for sale rushes: a shopper starting checkout holds the
+# cart's quantities for STOCK_HOLD_SECONDS, other shoppers see
+#   available = stock - active holds of everyone else
+# computed by a SUM subquery over StockHold (product, expires_at index).
+# A hold is its own (user, product) row, so a burst of shoppers on one hot
+# product inserts rows instead of updating the Product row; Product.stock
+# only changes when an order is placed (orders.py), which also consumes the
+# buyer's holds. Expired holds are ignored by every query and deleted by
+# manage.py expire_holds.
+# Holds are soft: two concurrent holds on postgres may over-reserve a little,
+# the order-time stock >= 0 CHECK is still what prevents overselling.
+# ===========================================
+
+STOCK_HOLD_SECONDS = getattr(settings, "STOCK_HOLD_SECONDS", 10 * 60)
+HOLD_SWEEP_BATCH = 5000
+
+
+class HoldError(Exception):
+    def __init__(self, message, status_code=400):
+        super().__init__(message)
+        self.message = message
+        self.status_code = status_code
+
+
+def held_quantity(at, user=None, exclude_user=None, product="pk"):
+    # annotation: active held quantity of the row's product (0 without holds),
+    # product = the outer column holding the product id
+    holds = StockHold.objects.filter(product=OuterRef(product), expires_at__gt=at)
+    if user is not None:
+        holds = holds.filter(user=user)
+    if exclude_user is not None:
+        holds = holds.exclude(user=exclude_user)
+    return Coalesce(
+        Subquery(holds.order_by().values("product").annotate(total=Sum("quantity")).values("total")),
+        Value(0),
+    )
+
+
+def available_stock(product_ids, user=None):
+    # -> {product_id: stock - holds of other users}, one query
+    rows = (
+        Product.objects
+        .filter(id__in=product_ids, is_active=True)
+        .annotate(held=held_quantity(now(), exclude_user=user))
+        .values_list("id", "stock", "held")
+    )
+    return {pid: max(stock - held, 0) for pid, stock, held in rows}
+
+
+def place_holds(user, items, seconds=STOCK_HOLD_SECONDS):
+    # {product_id: quantity} -> expires_at; all or nothing, the user's holds become
+    # exactly these items (holds on products no longer in the cart are dropped)
+    at = now()
+    expires_at = at + timedelta(seconds=seconds)
+
+    with transaction.atomic():
+        found = set(
+            Product.objects.filter(id__in=items.keys(), is_active=True).values_list("id", flat=True)
+        )
+        missing = sorted(set(items) - found)
+        if missing:
+            raise HoldError(f"Product with id {missing[0]} not found", 404)
+
+        StockHold.objects.filter(user=user).exclude(product_id__in=items.keys()).delete()
+        StockHold.objects.bulk_create(
+            [
+                StockHold(user=user, product_id=pid, quantity=qty, expires_at=expires_at)
+                for pid, qty in items.items()
+            ],
+            update_conflicts=True,
+            unique_fields=["user", "product"],
+            update_fields=["quantity", "expires_at"],
+        )
+
+        # checked after the insert so holds committed meanwhile are counted too
+        short = (
+            Product.objects
+            .filter(id__in=items.keys())
+            .annotate(held=held_quantity(at))
+            .filter(stock__lt=F("held"))
+            .values_list("name", flat=True)
+            .first()
+        )
+        if short:
+            raise HoldError(f"Insufficient stock for {short}")
+
+    return expires_at
+
+
+def release_holds(user, product_ids=None):
+    holds = StockHold.objects.filter(user=user)
+    if product_ids is not None:
+        holds = holds.filter(product_id__in=product_ids)
+    return holds.delete()[0]
+
+
+def expire_holds(batch=HOLD_SWEEP_BATCH):
+    # delete expired holds in batches (short write transactions) -> rows deleted
+    at = now()
+    deleted = 0
+    while True:
+        ids = list(StockHold.objects.filter(expires_at__lte=at).values_list("id", flat=True)[:batch])
+        if not ids:
+            return deleted
+        deleted += StockHold.objects.filter(id__in=ids).delete()[0]
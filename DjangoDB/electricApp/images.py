@@ -0,0 +1,127 @@
+import io
+import logging
+import os
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image, ImageOps, features
+
+
+# =============== IMAGE DERIVATIVES ===============
+# Uploaded originals stay as they are, resized copies live next to them:
+#   products/foo.jpg -> derived/products/foo-jpg-400w.webp (+ .avif when Pillow has it)
+# Built after commit by signals.py on upload, backfill: manage.py build_image_derivatives
+# The formats actually written (every width present in storage) are recorded on
+# the Product / ProductImage rows using that file (image_formats), because the
+# Pillow build (AVIF or not) differs between processes and a write can fail.
+# API rows use image_fields(name, formats=row.image_formats): "image" is a list
+# sized WebP, srcset / sources let the storefront pick a size, "image_original"
+# is the upload itself. Formats not recorded -> the original URL is served.
+# =================================================
+
+IMAGE_WIDTHS = (200, 400, 800)
+IMAGE_LIST_WIDTH = 400     # list / cart / order rows (200px slots on 2x screens)
+IMAGE_BANNER_WIDTH = 800
+IMAGE_QUALITY = {"webp": 80, "avif": 60}
+IMAGE_FORMATS = [fmt for fmt in ("avif", "webp") if features.check(fmt)]
+IMAGE_TYPES = {"avif": "image/avif", "webp": "image/webp"}
+
+logger = logging.getLogger(__name__)
+
+
+def derivative_name(name, width, fmt="webp"):
+    stem, ext = os.path.splitext(name)
+    return f"derived/{stem}{ext.replace('.', '-')}-{width}w.{fmt}"
+
+
+def derived_formats(name, storage=default_storage):
+    # -> "avif,webp": formats with every width in storage
+    return ",".join(
+        fmt for fmt in IMAGE_TYPES
+        if all(storage.exists(derivative_name(name, width, fmt)) for width in IMAGE_WIDTHS)
+    )
+
+
+def record_formats(name, formats):
+    # rows using this file, only the ones that changed (no signals, detail cache bumped)
+    from .cache import bump_products  # cache.py imports this module
+    from .models import Product, ProductImage
+
+    product_ids = set()
+    for rows, column in ((Product.objects, "id"), (ProductImage.objects, "product_id")):
+        stale = rows.filter(image=name).exclude(image_formats=formats)
+        ids = list(stale.values_list(column, flat=True))
+        if ids:
+            stale.update(image_formats=formats)
+            product_ids.update(ids)
+    bump_products(product_ids)
+
+
+def make_derivatives(name, storage=default_storage):
+    # returns the number of files written, existing derivatives are skipped;
+    # what is in storage afterwards is recorded on the rows using the file
+    written = _write_derivatives(name, storage)
+    record_formats(name, derived_formats(name, storage))
+    return written
+
+
+def _write_derivatives(name, storage):
+    wanted = [
+        (width, fmt, derivative_name(name, width, fmt))
+        for width in IMAGE_WIDTHS
+        for fmt in IMAGE_FORMATS
+    ]
+    wanted = [w for w in wanted if not storage.exists(w[2])]
+    if not wanted:
+        return 0
+
+    try:
+        with storage.open(name, "rb") as f:
+            original = ImageOps.exif_transpose(Image.open(f))
+            original.load()
+    except (OSError, Image.DecompressionBombError) as e:
+        logger.warning("Cannot build derivatives for %s: %s", name, e)
+        return 0
+
+    has_alpha = original.mode in ("RGBA", "LA", "PA") or "transparency" in original.info
+    original = original.convert("RGBA" if has_alpha else "RGB")
+
+    written = 0
+    for width, fmt, target in wanted:
+        image = original.copy()
+        image.thumbnail((width, width * 4))  # never upscales
+
+        buf = io.BytesIO()
+        try:
+            image.save(buf, fmt.upper(), quality=IMAGE_QUALITY[fmt])
+        except (OSError, ValueError) as e:
+            # encoder failed: the format stays unrecorded, the other one is still written
+            logger.warning("Cannot write %s: %s", target, e)
+            continue
+        storage.save(target, ContentFile(buf.getvalue()))
+        written += 1
+    return written
+
+
+def image_fields(name, request=None, width=IMAGE_LIST_WIDTH, storage=default_storage, formats=""):
+    # name + recorded image_formats -> {"image", "image_srcset", "image_sources", "image_original"}
+    if not name:
+        return {"image": None, "image_srcset": None, "image_sources": {}, "image_original": None}
+
+    def url(path):
+        path = storage.url(path)
+        return request.build_absolute_uri(path) if request else path
+
+    written = [fmt for fmt in (formats or "").split(",") if fmt in IMAGE_TYPES]
+    sources = {
+        IMAGE_TYPES[fmt]: ", ".join(
+            f"{url(derivative_name(name, w, fmt))} {w}w" for w in IMAGE_WIDTHS
+        )
+        for fmt in written
+    }
+
+    return {
+        "image": url(derivative_name(name, width)) if "webp" in written else url(name),
+        "image_srcset": sources.get("image/webp"),
+        "image_sources": sources,
+        "image_original": url(name),
+    }
@@ -0,0 +1,158 @@
+import csv
+import io
+import tempfile
+from datetime import timedelta
+from django.core.files import File
+from django.utils.timezone import now
+from .models import Order, ExportJob
+from .exports import (
+    month_bounds, accounting_csv_rows, orders_csv_rows,
+    write_accounting_pdf, write_orders_pdf,
+)
+from .labels import write_parcel_label
+
+
+# =============== EXPORT JOBS ===============
+# Heavy exports run outside the request worker:
+#   POST reports/jobs/        -> ExportJob(status="queued")
+#   manage.py run_export_jobs -> claim_job + run_job, file saved under MEDIA_ROOT/exports/
+#   GET  reports/jobs/<id>/download/ once status == "done"
+# The queue is the ExportJob table, no broker. A job is claimed with a
+# conditional UPDATE so several workers never run the same job.
+# ===========================================
+
+JOB_STALE_MINUTES = 30  # "running" longer than this -> worker died, queue again
+JOB_KEEP_DAYS = 7       # finished jobs (and their files) are purged after this
+
+
+def _write_csv(output, rows):
+    text = io.TextIOWrapper(output, encoding="utf-8", newline="")
+    csv.writer(text).writerows(rows)
+    text.flush()
+    text.detach()
+
+
+# ---------- RUNNERS : (params, binary output) -> download filename ----------
+def run_accounting_csv(params, output):
+    _write_csv(output, accounting_csv_rows(params.get("month"), params.get("year")))
+    return "accounting_report.csv"
+
+
+def run_orders_csv(params, output):
+    _write_csv(output, orders_csv_rows(params.get("month"), params.get("year"), params.get("status")))
+    return "orders_report.csv"
+
+
+def run_accounting_pdf(params, output):
+    write_accounting_pdf(output)
+    return "accounting_report.pdf"
+
+
+def run_orders_pdf(params, output):
+    write_orders_pdf(output)
+    return "orders_report.pdf"
+
+
+def run_parcel_label(params, output):
+    order = Order.objects.prefetch_related("items__product").get(id=params["order_id"])
+    write_parcel_label(output, order)
+    return f"parcel_{order.order_id}.pdf"
+
+
+RUNNERS = {
+    "accounting_csv": run_accounting_csv,
+    "orders_csv": run_orders_csv,
+    "accounting_pdf": run_accounting_pdf,
+    "orders_pdf": run_orders_pdf,
+    "parcel_label": run_parcel_label,
+}
+
+
+def clean_params(kind, data):
+    # request data -> params stored on the job, raises ValueError with a message
+    if kind not in RUNNERS:
+        raise ValueError(f"Invalid kind, use one of: {', '.join(RUNNERS)}")
+
+    params = {}
+    if kind in ("accounting_csv", "orders_csv"):
+        month, year = data.get("month"), data.get("year")
+        if month and year:
+            try:
+                month_bounds(month, year)
+            except ValueError:
+                raise ValueError("Invalid month or year")
+            params.update(month=int(month), year=int(year))
+
+    if kind == "orders_csv" and data.get("status"):
+        if data["status"] not in dict(Order.ORDER_STATUS):
+            raise ValueError("Invalid status")
+        params["status"] = data["status"]
+
+    if kind == "parcel_label":
+        try:
+            order_id = int(data.get("order_id"))
+        except (TypeError, ValueError):
+            raise ValueError("order_id is required")
+        if not Order.objects.filter(id=order_id).exists():
+            raise ValueError("Order not found")
+        params["order_id"] = order_id
+
+    return params
+
+
+# ---------- WORKER ----------
+def claim_job():
+    # oldest queued job, or None; losing the UPDATE race just tries the next one
+    queued = (
+        ExportJob.objects
+        .filter(status="queued")
+        .order_by("id")
+        .values_list("id", flat=True)[:10]
+    )
+    for job_id in queued:
+        claimed = ExportJob.objects.filter(id=job_id, status="queued").update(
+            status="running", started_at=now()
+        )
+        if claimed:
+            return ExportJob.objects.get(id=job_id)
+    return None
+
+
+def run_job(job):
+    try:
+        with tempfile.TemporaryFile() as output:
+            filename = RUNNERS[job.kind](job.params, output)
+            output.seek(0)
+            # storage renames on a clash (exports/orders_report_x7Yz.csv): the file is
+            # opened by the name it returned, the runner's name is only the download name
+            job.file.name = job.file.storage.save(job.file.field.generate_filename(job, filename), File(output))
+            job.filename = filename
+        job.status = "done"
+        job.error = ""
+    except Exception as e:
+        job.status = "failed"
+        job.error = str(e) or e.__class__.__name__
+    job.finished_at = now()
+    job.save(update_fields=["file", "filename", "status", "error", "finished_at"])
+    return job
+
+
+def requeue_stale_jobs():
+    return ExportJob.objects.filter(
+        status="running",
+        started_at__lt=now() - timedelta(minutes=JOB_STALE_MINUTES),
+    ).update(status="queued", started_at=None)
+
+
+def purge_old_jobs():
+    old = ExportJob.objects.filter(
+        status__in=("done", "failed"),
+        finished_at__lt=now() - timedelta(days=JOB_KEEP_DAYS),
+    )
+    count = 0
+    for job in old.iterator():
+        if job.file:
+            job.file.delete(save=False)
+        job.delete()
+        count += 1
+    return count
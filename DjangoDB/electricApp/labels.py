@@ -0,0 +1,256 @@
+import hashlib
+import io
+import os
+import tempfile
+from django.conf import settings
+from django.core.cache import cache
+from reportlab.lib.pagesizes import A6
+from reportlab.pdfgen import canvas
+from reportlab.lib.units import mm
+from reportlab.graphics.barcode import code128
+from reportlab.lib.utils import ImageReader
+import qrcode
+
+
+# =============== PARCEL LABELS ===============
+# One A6 page per order. The QR PNG only depends on the order id, so it is
+# rendered once and kept in the cache (fetched with one get_many per batch).
+# The Code128 barcode is vector drawing, nothing to cache there.
+#
+# Single label PDFs are also kept on disk: MEDIA_ROOT/labels/<order id>-<hash>.pdf
+# where hash covers every field the label prints, so an edited order gets a
+# new file. Hits touch the mtime, writes evict the oldest files (LRU) above
+# LABEL_CACHE_MAX_BYTES. update_order_status drops an order's files.
+# ==============================================
+
+LABEL_ORDER_URL = "https://www.lab.arthkarya.com/admin/orders/{id}"
+LABEL_QR_TIMEOUT = 60 * 60 * 24 * 7
+LABEL_BATCH_MAX = 500
+
+LABEL_CACHE_DIR = os.path.join(settings.MEDIA_ROOT, "labels")
+LABEL_CACHE_MAX_BYTES = 200 * 1024 * 1024
+LABEL_LAYOUT_VERSION = 1  # bump when draw_parcel_label changes
+
+
+def order_url(order):
+    return LABEL_ORDER_URL.format(id=order.id)
+
+
+def _qr_key(order_id):
+    return f"label:qr:{order_id}"
+
+
+def qr_pngs(orders):
+    # {order.id: png bytes}, only the missing ones are rendered
+    keys = {_qr_key(order.id): order for order in orders}
+    found = cache.get_many(keys.keys())
+
+    pngs = {}
+    missing = {}
+    for key, order in keys.items():
+        if key in found:
+            pngs[order.id] = found[key]
+            continue
+        buf = io.BytesIO()
+        qrcode.make(order_url(order)).save(buf)
+        pngs[order.id] = missing[key] = buf.getvalue()
+
+    if missing:
+        cache.set_many(missing, LABEL_QR_TIMEOUT)
+    return pngs
+
+
+# ---------- PAGE (order with items__product prefetched) ----------
+def draw_parcel_label(c, order, qr_png):
+    width, height = A6
+
+    x_margin = 6 * mm
+    y = height - 10 * mm
+
+    def text(txt, size=9, bold=False):
+        nonlocal y
+        font = "Helvetica-Bold" if bold else "Helvetica"
+        c.setFont(font, size)
+        c.drawString(x_margin, y, txt)
+        y -= 4.5 * mm
+
+    # ================= HEADER =================
+    c.setFillColorRGB(0.1, 0.1, 0.1)
+    c.rect(0, height - 18 * mm, width, 18 * mm, fill=1)
+    c.setFillColorRGB(1, 1, 1)
+    c.setFont("Helvetica-Bold", 12)
+    c.drawCentredString(width / 2, height - 12 * mm, "PARCEL SHIPPING LABEL")
+    c.setFillColorRGB(0, 0, 0)
+
+    y = height - 24 * mm
+
+    # ================= BARCODE (URL so scanner shows data) =================
+    barcode = code128.Code128(
+        order_url(order),
+        barHeight=12 * mm,
+        barWidth=0.4
+    )
+    barcode.drawOn(c, x_margin, y - 12 * mm)
+    y -= 16 * mm
+
+    # ================= ORDER INFO =================
+    text(f"Order ID : {order.order_id}", bold=True)
+    text(f"Date     : {order.created_at.strftime('%d %b %Y')}")
+    text(f"Payment  : {order.payment_status}")
+    y -= 2 * mm
+
+    # ================= CUSTOMER =================
+    text("Customer Details", 10, True)
+    text(f"Name  : {order.customer_name}")
+    text(f"Email : {order.customer_email or '-'}")
+    y -= 2 * mm
+
+    # ================= ADDRESS =================
+    text("Shipping Address", 10, True)
+    for line in order.address.split(","):
+        text(line.strip(), 8)
+    y -= 2 * mm
+
+    # ================= ITEMS =================
+    text("Items", 10, True)
+    for item in order.items.all():
+        text(f"- {item.product.name} x{item.quantity}", 8)
+
+    y -= 2 * mm
+    text(f"Total Qty : {order.qty}", bold=True)
+    text(f"Amount    : ₹{order.total_amount}", bold=True)
+
+    # ================= QR CODE =================
+    c.drawImage(
+        ImageReader(io.BytesIO(qr_png)),
+        width - 32 * mm,
+        6 * mm,
+        26 * mm,
+        26 * mm
+    )
+
+    c.showPage()
+
+
+def write_parcel_label(output, order):
+    write_parcel_labels(output, [order])
+
+
+def write_parcel_labels(output, orders, chunk_size=100):
+    # orders: any iterable (queryset iterator is fine), QR lookups are batched per chunk
+    c = canvas.Canvas(output, pagesize=A6)
+    pages = 0
+    chunk = []
+
+    def flush():
+        pngs = qr_pngs(chunk)
+        for order in chunk:
+            draw_parcel_label(c, order, pngs[order.id])
+        chunk.clear()
+
+    for order in orders:
+        chunk.append(order)
+        pages += 1
+        if len(chunk) == chunk_size:
+            flush()
+    flush()
+
+    c.save()
+    return pages
+
+
+# ---------- ON-DISK LABEL CACHE ----------
+def label_hash(order):
+    # order with items__product prefetched
+    parts = [
+        LABEL_LAYOUT_VERSION,
+        order.id,
+        order.order_id,
+        order.created_at.strftime("%d %b %Y"),
+        order.payment_status,
+        order.customer_name,
+        order.customer_email,
+        order.address,
+        order.qty,
+        order.total_amount,
+    ]
+    parts += [(item.product.name, item.quantity) for item in order.items.all()]
+    return hashlib.sha256(repr(parts).encode()).hexdigest()[:20]
+
+
+def cached_label_path(order):
+    path = os.path.join(LABEL_CACHE_DIR, f"{order.id}-{label_hash(order)}.pdf")
+
+    if os.path.exists(path):
+        try:
+            os.utime(path)  # LRU: mtime = last use
+            return path
+        except FileNotFoundError:
+            pass  # evicted / invalidated just now, render again
+
+    os.makedirs(LABEL_CACHE_DIR, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=LABEL_CACHE_DIR, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as output:
+            write_parcel_label(output, order)
+        os.replace(tmp_path, path)  # readers never see a half written file
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+    # older artifacts of the same order are stale now
+    invalidate_labels(order.id, keep=path)
+    evict_labels()
+    return path
+
+
+def open_cached_label(order):
+    # -> open binary file. Another request may evict / invalidate the file between
+    # cached_label_path() and open(): render it again, once.
+    for attempt in range(2):
+        path = cached_label_path(order)
+        try:
+            return open(path, "rb")
+        except FileNotFoundError:
+            if attempt:
+                raise
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except (FileNotFoundError, PermissionError):
+        pass  # already gone / still open for a download (windows), next sweep gets it
+
+
+def evict_labels(max_bytes=None):
+    max_bytes = LABEL_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+    if not os.path.isdir(LABEL_CACHE_DIR):
+        return 0
+
+    files = []
+    total = 0
+    with os.scandir(LABEL_CACHE_DIR) as entries:
+        for entry in entries:
+            if entry.is_file() and entry.name.endswith(".pdf"):
+                stat = entry.stat()
+                files.append((stat.st_mtime, stat.st_size, entry.path))
+                total += stat.st_size
+
+    removed = 0
+    for mtime, size, path in sorted(files):
+        if total <= max_bytes:
+            break
+        _remove(path)
+        total -= size
+        removed += 1
+    return removed
+
+
+def invalidate_labels(order_id, keep=None):
+    if not os.path.isdir(LABEL_CACHE_DIR):
+        return
+    for name in os.listdir(LABEL_CACHE_DIR):
+        path = os.path.join(LABEL_CACHE_DIR, name)
+        if name.startswith(f"{order_id}-") and name.endswith(".pdf") and path != keep:
+            _remove(path)
@@ -0,0 +1,180 @@
+import asyncio
+import random
+import time
+import httpx
+from .bench import percentile
+
+
+# =============== LOAD TEST ===============
+# asyncio + httpx virtual users against a running server (runserver / gunicorn).
+# Each user loops: pick an action from the mix by weight, send it, think, repeat.
+#   browse        GET  get/product-list/  (follows next_cursor, back to page 1 at the end)
+#   detail        GET  get/product-details/<id>/
+#   cart_add      POST cart/add/
+#   checkout      POST create/order/      (1-3 products, quantity 1)
+#   admin_overview GET dashboard/overview/
+#   admin_orders  GET  orders/?page=1
+# Responses are counted as ok (2xx/3xx), rejected (4xx: out of stock, validation)
+# or error (5xx, timeouts, connection errors). Tokens and product ids come from
+# the server's database (manage.py load_test runs with the same settings).
+# =========================================
+
+LOAD_MIXES = {
+    # storefront day: mostly browsing, a few checkouts, an admin tab polling
+    "storefront": {"browse": 45, "detail": 30, "cart_add": 12, "checkout": 8, "admin_overview": 3, "admin_orders": 2},
+    # checkout rush: concurrent create_order on a few hot products
+    "checkout": {"checkout": 90, "detail": 10},
+    # back office: several admins polling while shoppers browse
+    "admin": {"admin_overview": 40, "admin_orders": 40, "browse": 20},
+}
+
+
+class LoadContext:
+    def __init__(self, client, admin_token, customer_tokens, product_ids, hot_ids=None, think=0.0):
+        self.client = client
+        self.admin = {"Authorization": f"Bearer {admin_token}"}
+        self.customers = [{"Authorization": f"Bearer {t}"} for t in customer_tokens]
+        self.product_ids = product_ids
+        self.hot_ids = hot_ids or product_ids
+        self.think = think
+
+
+# ---------- ACTIONS : (ctx, user state) -> response ----------
+async def browse(ctx, state):
+    params = {"limit": 20, "fields": "id,name,price,image"}
+    if state.get("cursor"):
+        params["cursor"] = state["cursor"]
+    response = await ctx.client.get("/api/get/product-list/", params=params)
+    if response.status_code == 200:
+        state["cursor"] = response.json().get("next_cursor")
+    return response
+
+
+async def detail(ctx, state):
+    return await ctx.client.get(f"/api/get/product-details/{random.choice(ctx.product_ids)}/")
+
+
+async def cart_add(ctx, state):
+    return await ctx.client.post(
+        "/api/cart/add/",
+        json={"product_id": random.choice(ctx.product_ids), "quantity": 1},
+        headers=state["customer"],
+    )
+
+
+async def checkout(ctx, state):
+    items = random.sample(ctx.hot_ids, min(len(ctx.hot_ids), random.randint(1, 3)))
+    return await ctx.client.post(
+        "/api/create/order/",
+        json={
+            "customer_name": "Load Test",
+            "contact_number": "9000000000",
+            "address": "1 Load Street, Test City",
+            "items": [{"product_id": pid, "quantity": 1} for pid in items],
+        },
+        headers=state["customer"],
+    )
+
+
+async def admin_overview(ctx, state):
+    return await ctx.client.get("/api/dashboard/overview/", headers=ctx.admin)
+
+
+async def admin_orders(ctx, state):
+    return await ctx.client.get("/api/orders/", params={"page": 1}, headers=ctx.admin)
+
+
+ACTIONS = {
+    "browse": browse,
+    "detail": detail,
+    "cart_add": cart_add,
+    "checkout": checkout,
+    "admin_overview": admin_overview,
+    "admin_orders": admin_orders,
+}
+
+
+# ---------- RUN ----------
+async def _user(ctx, number, mix, deadline, remaining, samples):
+    names = list(mix)
+    weights = [mix[n] for n in names]
+    state = {"customer": ctx.customers[number % len(ctx.customers)]}
+
+    while time.monotonic() < deadline:
+        if remaining is not None:
+            if remaining[0] <= 0:
+                return
+            remaining[0] -= 1
+
+        name = random.choices(names, weights)[0]
+        started = time.perf_counter()
+        try:
+            response = await ACTIONS[name](ctx, state)
+            outcome = response.status_code
+        except httpx.TimeoutException:
+            outcome = "timeout"
+        except httpx.HTTPError as e:
+            outcome = e.__class__.__name__
+        samples.append((name, outcome, time.perf_counter() - started))
+
+        if ctx.think:
+            await asyncio.sleep(random.uniform(0, 2 * ctx.think))
+
+
+async def run_load(base_url, mix, users, duration, admin_token, customer_tokens, product_ids,
+                   hot_ids=None, requests=None, think=0.0, timeout=30.0):
+    # -> (samples [(action, status or error name, seconds)], wall seconds)
+    limits = httpx.Limits(max_connections=users, max_keepalive_connections=users)
+    async with httpx.AsyncClient(base_url=base_url, timeout=timeout, limits=limits) as client:
+        ctx = LoadContext(client, admin_token, customer_tokens, product_ids, hot_ids, think)
+        samples = []
+        remaining = [requests] if requests else None
+        deadline = time.monotonic() + duration
+        started = time.perf_counter()
+        await asyncio.gather(*[
+            _user(ctx, n, mix, deadline, remaining, samples) for n in range(users)
+        ])
+        return samples, time.perf_counter() - started
+
+
+# ---------- REPORT ----------
+def _outcome(status):
+    if isinstance(status, int) and status < 400:
+        return "ok"
+    if isinstance(status, int) and status < 500:
+        return "rejected"
+    return "error"
+
+
+def _stats(samples, wall):
+    timings = sorted(s[2] * 1000 for s in samples)
+    counts = {"ok": 0, "rejected": 0, "error": 0}
+    statuses = {}
+    for _, status, _ in samples:
+        counts[_outcome(status)] += 1
+        statuses[str(status)] = statuses.get(str(status), 0) + 1
+
+    n = len(samples)
+    return {
+        "requests": n,
+        "rps": round(n / wall, 2) if wall else 0,
+        **counts,
+        "error_rate": round(counts["error"] / n, 4) if n else 0,
+        "reject_rate": round(counts["rejected"] / n, 4) if n else 0,
+        "statuses": statuses,
+        "p50_ms": round(percentile(timings, 0.50), 2) if timings else None,
+        "p95_ms": round(percentile(timings, 0.95), 2) if timings else None,
+        "p99_ms": round(percentile(timings, 0.99), 2) if timings else None,
+        "max_ms": round(timings[-1], 2) if timings else None,
+    }
+
+
+def load_report(samples, wall):
+    by_action = {}
+    for sample in samples:
+        by_action.setdefault(sample[0], []).append(sample)
+    return {
+        "wall_seconds": round(wall, 2),
+        "total": _stats(samples, wall),
+        "actions": {name: _stats(rows, wall) for name, rows in sorted(by_action.items())},
+    }
@@ -0,0 +1,128 @@
+import os
+import tempfile
+import threading
+import time
+import uuid
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from electricApp.models import CustomUser, Category, Subcategory, Product, OrderItem
+from electricApp.orders import OrderError, place_order
+
+
+class Command(BaseCommand):
+    help = (
+        "Run N parallel checkouts against one product and check that stock is "
+        "never oversold (runs on a throwaway copy of the configured database, "
+        "so bench orders never reach the real tables or reports)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--threads", type=int, default=20)
+        parser.add_argument("--orders", type=int, default=200, help="checkouts in total")
+        parser.add_argument("--stock", type=int, default=50)
+        parser.add_argument("--quantity", type=int, default=1, help="units per checkout")
+
+    def handle(self, *args, **options):
+        # ---------- THROWAWAY DATABASE ----------
+        # same engine, migrated from scratch (Django's test database machinery),
+        # dropped after the run; worker threads connect to it too
+        old_name = connection.settings_dict["NAME"]
+        with tempfile.TemporaryDirectory() as tmp:
+            if connection.vendor == "sqlite":
+                test_name = os.path.join(tmp, "bench_checkout.sqlite3")
+            else:
+                test_name = f"{old_name}_bench_checkout"
+            connection.settings_dict["TEST"]["NAME"] = test_name
+            connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+            try:
+                self.bench(options)
+            finally:
+                connection.creation.destroy_test_db(old_name, verbosity=0)
+
+    def bench(self, options):
+        tag = uuid.uuid4().hex[:8]
+
+        # ---------- BENCH DATA ----------
+        user = CustomUser.objects.create_user(f"bench_{tag}", password=None)
+        category = Category.objects.create(name=f"bench_{tag}")
+        subcategory = Subcategory.objects.create(category=category, name=f"bench_{tag}")
+        product = Product.objects.create(
+            category=category,
+            subcategory=subcategory,
+            name=f"Bench product {tag}",
+            slug=f"bench-{tag}",
+            sku=f"BENCH-{tag}",
+            price=10,
+            stock=options["stock"],
+            short_description="",
+            description="",
+        )
+
+        counter = {"next": 0}
+        lock = threading.Lock()
+        results = {"placed": 0, "rejected": 0, "busy": 0, "errors": 0}
+        latencies = []
+
+        def worker():
+            try:
+                while True:
+                    with lock:
+                        if counter["next"] >= options["orders"]:
+                            return
+                        counter["next"] += 1
+
+                    started = time.perf_counter()
+                    try:
+                        place_order(
+                            user,
+                            {product.id: options["quantity"]},
+                            customer_name="bench",
+                            payment_status="Pending",
+                        )
+                        outcome = "placed"
+                    except OrderError as e:
+                        outcome = "busy" if e.status_code == 503 else "rejected"
+                    except Exception:
+                        outcome = "errors"
+                    elapsed = time.perf_counter() - started
+
+                    with lock:
+                        results[outcome] += 1
+                        latencies.append(elapsed)
+            finally:
+                connection.close()
+
+        # ---------- RUN ----------
+        started = time.perf_counter()
+        threads = [threading.Thread(target=worker) for _ in range(options["threads"])]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        wall = time.perf_counter() - started
+
+        # ---------- CHECK ----------
+        product.refresh_from_db()
+        sold = OrderItem.objects.filter(product=product).count() * options["quantity"]
+        latencies.sort()
+
+        def pct(p):
+            return latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000
+
+        self.stdout.write(f"database        : {connection.vendor}")
+        self.stdout.write(f"threads         : {options['threads']}")
+        self.stdout.write(f"checkouts       : {options['orders']} x {options['quantity']} unit(s)")
+        self.stdout.write(f"initial stock   : {options['stock']}")
+        self.stdout.write(f"placed          : {results['placed']}")
+        self.stdout.write(f"rejected (stock): {results['rejected']}")
+        self.stdout.write(f"busy (retries)  : {results['busy']}")
+        self.stdout.write(f"errors          : {results['errors']}")
+        self.stdout.write(f"final stock     : {product.stock}")
+        self.stdout.write(f"throughput      : {results['placed'] / wall:.1f} orders/s")
+        self.stdout.write(f"latency p50/p95 : {pct(0.5):.1f} / {pct(0.95):.1f} ms")
+
+        if sold + product.stock != options["stock"]:
+            raise CommandError(
+                f"Stock mismatch: sold {sold} + left {product.stock} != {options['stock']}"
+            )
+        self.stdout.write(self.style.SUCCESS("No overselling"))
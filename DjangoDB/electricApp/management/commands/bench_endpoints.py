@@ -0,0 +1,85 @@
+import json
+import tempfile
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import override_settings, setup_test_environment, teardown_test_environment
+from electricApp.bench import BENCH_REPEAT, run_benchmark, compare_reports
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a throwaway test database at several sizes and time the key endpoints "
+        "(query counts, p50 / p95 latency) -> JSON"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sizes", default="100,1000,10000", help="comma separated product counts")
+        parser.add_argument("--repeat", type=int, default=BENCH_REPEAT, help="warm requests per endpoint")
+        parser.add_argument("--seed", type=int, default=1)
+        parser.add_argument("--no-images", action="store_true")
+        parser.add_argument("--output", help="write the JSON report here (default: stdout)")
+        parser.add_argument("--compare", help="earlier JSON report to diff against")
+
+    def handle(self, *args, **options):
+        try:
+            sizes = sorted({int(s) for s in options["sizes"].split(",") if s.strip()})
+        except ValueError:
+            raise CommandError("--sizes must be comma separated numbers")
+        if not sizes or sizes[0] <= 0:
+            raise CommandError("--sizes must be positive")
+
+        baseline = None
+        if options["compare"]:
+            try:
+                with open(options["compare"]) as f:
+                    baseline = json.load(f)
+            except (OSError, ValueError) as e:
+                raise CommandError(f"Cannot read {options['compare']}: {e}")
+
+        # ---------- ISOLATED RUN : test database, local cache, temp media ----------
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            with tempfile.TemporaryDirectory() as media, override_settings(
+                CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "bench"}},
+                MEDIA_ROOT=media,
+                QUERY_BUDGET_MODE="off",
+            ):
+                report = run_benchmark(
+                    sizes,
+                    repeat=options["repeat"],
+                    seed=options["seed"],
+                    images=not options["no_images"],
+                    log=lambda line: self.stderr.write(line),
+                )
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        text = json.dumps(report, indent=2)
+        if options["output"]:
+            with open(options["output"], "w") as f:
+                f.write(text + "\n")
+        else:
+            self.stdout.write(text)
+
+        # ---------- SUMMARY ----------
+        out = self.stderr if not options["output"] else self.stdout
+        for size, result in report["sizes"].items():
+            out.write(f"\n{size} products")
+            for name, stats in result["endpoints"].items():
+                out.write(
+                    f"  {name:<24} {stats['queries']:>3} q  "
+                    f"p50 {stats['p50_ms']:>8} ms  p95 {stats['p95_ms']:>8} ms  "
+                    f"cold {stats['cold_ms']:>8} ms / {stats['cold_queries']} q"
+                )
+
+        if baseline:
+            out.write(f"\nvs {options['compare']} (commit {baseline['meta'].get('commit')})")
+            for size, name, before, after, q_before, q_after in compare_reports(baseline, report):
+                change = (after - before) / before * 100 if before else 0
+                flag = "  <-- queries" if q_after > q_before else ""
+                out.write(
+                    f"  {size:>6} {name:<24} p50 {before:>8} -> {after:>8} ms ({change:+.0f}%)  "
+                    f"queries {q_before} -> {q_after}{flag}"
+                )
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+from electricApp.images import make_derivatives
+from electricApp.models import Product, ProductImage
+
+
+class Command(BaseCommand):
+    help = "Build resized WebP / AVIF copies for product images that have none yet"
+
+    def handle(self, *args, **options):
+        names = set(
+            Product.objects.exclude(image="").exclude(image__isnull=True)
+            .values_list("image", flat=True)
+        )
+        names.update(
+            ProductImage.objects.exclude(image="").values_list("image", flat=True)
+        )
+
+        written = 0
+        for name in sorted(names):
+            written += make_derivatives(name)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Checked {len(names)} images, wrote {written} derivative files"
+        ))
@@ -0,0 +1,21 @@
+import time
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from electricApp.holds import expire_holds
+
+
+class Command(BaseCommand):
+    help = "Delete expired stock holds (once, or every --interval seconds)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--interval", type=float, default=0, help="keep sweeping every N seconds")
+
+    def handle(self, *args, **options):
+        while True:
+            close_old_connections()
+            deleted = expire_holds()
+            if deleted or not options["interval"]:
+                self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} expired hold(s)"))
+            if not options["interval"]:
+                return
+            time.sleep(options["interval"])
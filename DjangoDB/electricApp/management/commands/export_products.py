@@ -0,0 +1,23 @@
+import csv
+import sys
+from django.core.management.base import BaseCommand
+from electricApp.catalog import export_products, export_csv_rows, export_jsonl_lines
+
+
+class Command(BaseCommand):
+    help = "Write every product as CSV or JSONL (same columns import_products reads)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", nargs="?", help="default: stdout")
+        parser.add_argument("--format", choices=["csv", "jsonl"], default="csv")
+
+    def handle(self, *args, **options):
+        output = open(options["path"], "w", encoding="utf-8", newline="") if options["path"] else sys.stdout
+        try:
+            if options["format"] == "csv":
+                csv.writer(output).writerows(export_csv_rows(export_products()))
+            else:
+                output.writelines(export_jsonl_lines(export_products()))
+        finally:
+            if options["path"]:
+                output.close()
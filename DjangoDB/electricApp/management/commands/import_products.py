@@ -0,0 +1,47 @@
+import csv
+import time
+from django.core.management.base import BaseCommand, CommandError
+from electricApp.catalog import IMPORT_CHUNK_SIZE, import_format, read_rows, import_products
+
+
+class Command(BaseCommand):
+    help = "Create / update products from a CSV or JSONL file (upsert on sku)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("path")
+        parser.add_argument("--format", choices=["csv", "jsonl"], help="default: from the file extension")
+        parser.add_argument("--chunk-size", type=int, default=IMPORT_CHUNK_SIZE)
+        parser.add_argument("--dry-run", action="store_true", help="validate only, write nothing")
+
+    def handle(self, *args, **options):
+        try:
+            fmt = import_format(options["path"], options["format"])
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        started = time.perf_counter()
+        try:
+            with open(options["path"], "rb") as f:
+                report = import_products(
+                    read_rows(f, fmt),
+                    chunk_size=options["chunk_size"],
+                    dry_run=options["dry_run"],
+                )
+        except (OSError, UnicodeDecodeError, csv.Error) as e:
+            raise CommandError(str(e))
+        elapsed = time.perf_counter() - started
+
+        for error in report["errors"]:
+            self.stdout.write(self.style.ERROR(
+                f"row {error['row']} ({error['sku'] or '-'}): {error['error']}"
+            ))
+        if report["failed"] > len(report["errors"]):
+            self.stdout.write(f"... {report['failed'] - len(report['errors'])} more errors")
+
+        rate = report["rows"] / elapsed * 60 if elapsed else 0
+        self.stdout.write(self.style.SUCCESS(
+            f"{'Checked' if options['dry_run'] else 'Imported'} {report['rows']} rows: "
+            f"{report['created']} created, {report['updated']} updated, "
+            f"{report['unchanged']} unchanged, {report['failed']} failed "
+            f"in {elapsed:.1f}s ({rate:.0f} rows/min)"
+        ))
@@ -0,0 +1,110 @@
+import asyncio
+import json
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils.timezone import now
+from rest_framework_simplejwt.tokens import RefreshToken
+from electricApp.models import CustomUser, Product
+
+
+class Command(BaseCommand):
+    help = (
+        "Simulate concurrent shoppers / admins against a running server "
+        "(throughput, latency percentiles, error rates). Needs httpx and seeded data "
+        "(manage.py seed_data); run with the same settings / database as the server."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--url", default="http://127.0.0.1:8000")
+        parser.add_argument("--mix", default="storefront", help="storefront, checkout or admin")
+        parser.add_argument("--users", type=int, default=20, help="concurrent virtual users")
+        parser.add_argument("--duration", type=float, default=30, help="seconds")
+        parser.add_argument("--requests", type=int, help="stop after this many requests")
+        parser.add_argument("--think", type=float, default=0, help="mean pause between requests (ms)")
+        parser.add_argument("--hot", type=int, default=0, help="checkout only these N products (contention)")
+        parser.add_argument("--timeout", type=float, default=30)
+        parser.add_argument("--output", help="write the JSON report here")
+
+    def handle(self, *args, **options):
+        try:
+            import httpx
+            from electricApp.loadtest import LOAD_MIXES, run_load, load_report
+        except ImportError:
+            raise CommandError("load_test needs httpx: pip install httpx")
+
+        if options["mix"] not in LOAD_MIXES:
+            raise CommandError(f"--mix must be one of: {', '.join(LOAD_MIXES)}")
+        if options["users"] < 1:
+            raise CommandError("--users must be positive")
+
+        # ---------- TOKENS + PRODUCTS from the server's database ----------
+        customers = list(
+            CustomUser.objects.filter(username__startswith="seed_").order_by("id")[:options["users"]]
+        )
+        if not customers:
+            raise CommandError("No seeded customers, run manage.py seed_data first")
+        admin = CustomUser.objects.filter(role="admin", is_active=True).order_by("id").first()
+        if admin is None:
+            admin = CustomUser.objects.create_superuser("load_admin", "load_admin@example.com", None)
+
+        in_stock = Product.objects.filter(is_active=True, stock__gt=0)
+        product_ids = list(in_stock.order_by("id").values_list("id", flat=True)[:5000])
+        if not product_ids:
+            raise CommandError("No products in stock")
+        hot_ids = None
+        if options["hot"]:
+            hot_ids = list(in_stock.order_by("-stock", "id").values_list("id", flat=True)[:options["hot"]])
+
+        try:
+            httpx.get(f"{options['url']}/api/get/product-list/", params={"limit": 1}, timeout=10)
+        except httpx.HTTPError as e:
+            raise CommandError(f"Server not reachable at {options['url']}: {e}")
+
+        # ---------- RUN ----------
+        self.stderr.write(
+            f"{options['users']} users, mix {options['mix']}, "
+            f"{options['requests'] or 'unlimited'} requests / {options['duration']}s ..."
+        )
+        samples, wall = asyncio.run(run_load(
+            options["url"],
+            LOAD_MIXES[options["mix"]],
+            options["users"],
+            options["duration"],
+            admin_token=str(RefreshToken.for_user(admin).access_token),
+            customer_tokens=[str(RefreshToken.for_user(c).access_token) for c in customers],
+            product_ids=product_ids,
+            hot_ids=hot_ids,
+            requests=options["requests"],
+            think=options["think"] / 1000,
+            timeout=options["timeout"],
+        ))
+
+        report = {
+            "meta": {
+                "created_at": now().isoformat(),
+                "url": options["url"],
+                "database": connection.vendor,
+                "mix": options["mix"],
+                "users": options["users"],
+                "hot_products": options["hot"] or None,
+                "think_ms": options["think"],
+            },
+            **load_report(samples, wall),
+        }
+
+        if options["output"]:
+            with open(options["output"], "w") as f:
+                f.write(json.dumps(report, indent=2) + "\n")
+
+        # ---------- SUMMARY ----------
+        total = report["total"]
+        self.stdout.write(f"database   : {connection.vendor}")
+        self.stdout.write(f"requests   : {total['requests']} in {report['wall_seconds']}s ({total['rps']} req/s)")
+        self.stdout.write(f"p50/p95/p99: {total['p50_ms']} / {total['p95_ms']} / {total['p99_ms']} ms")
+        self.stdout.write(f"errors     : {total['error']} ({total['error_rate']:.2%}), rejected {total['rejected']}")
+        for name, stats in report["actions"].items():
+            self.stdout.write(
+                f"  {name:<15} {stats['requests']:>6}  {stats['rps']:>7} req/s  "
+                f"p50 {stats['p50_ms']:>8}  p95 {stats['p95_ms']:>8}  p99 {stats['p99_ms']:>8} ms  "
+                f"err {stats['error_rate']:.2%}  rej {stats['reject_rate']:.2%}  {stats['statuses']}"
+            )
@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from electricApp.ratings import rebuild_ratings
+
+
+class Command(BaseCommand):
+    help = "Rebuild ProductRating (count / avg / star histogram) from approved reviews"
+
+    def handle(self, *args, **options):
+        products = rebuild_ratings()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt ratings for {products} products"))
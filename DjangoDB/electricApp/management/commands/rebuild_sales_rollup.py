@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+from electricApp.rollups import rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = "Rebuild DailySales / DailyProductSales from Order and OrderItem"
+
+    def handle(self, *args, **options):
+        days, product_rows = rebuild_rollups()
+        self.stdout.write(self.style.SUCCESS(
+            f"Rebuilt {days} daily rows and {product_rows} product rows"
+        ))
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+from electricApp.search import rebuild_index, search_vendor
+
+
+class Command(BaseCommand):
+    help = "Rebuild the product search index (FTS5 on sqlite, tsvector on postgres)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        if search_vendor() is None:
+            self.stdout.write("No search index for this database, nothing to do")
+            return
+
+        total = rebuild_index(chunk_size=options["chunk_size"])
+        self.stdout.write(self.style.SUCCESS(f"Indexed {total} products"))
@@ -0,0 +1,39 @@
+import time
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from electricApp.jobs import claim_job, run_job, requeue_stale_jobs, purge_old_jobs
+
+
+class Command(BaseCommand):
+    help = "Run queued export jobs (reports / PDFs) outside the web workers"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--once", action="store_true", help="run queued jobs then exit")
+        parser.add_argument("--interval", type=float, default=2.0, help="seconds between polls when idle")
+
+    def handle(self, *args, **options):
+        requeued = requeue_stale_jobs()
+        if requeued:
+            self.stdout.write(f"Requeued {requeued} stale job(s)")
+        purged = purge_old_jobs()
+        if purged:
+            self.stdout.write(f"Purged {purged} old job(s)")
+
+        while True:
+            close_old_connections()
+            job = claim_job()
+
+            if job is None:
+                if options["once"]:
+                    return
+                time.sleep(options["interval"])
+                continue
+
+            started = time.perf_counter()
+            run_job(job)
+            elapsed = (time.perf_counter() - started) * 1000
+
+            if job.status == "done":
+                self.stdout.write(self.style.SUCCESS(f"{job} {elapsed:.0f} ms"))
+            else:
+                self.stdout.write(self.style.ERROR(f"{job} {job.error}"))
@@ -0,0 +1,44 @@
+import time
+from django.core.management.base import BaseCommand, CommandError
+from electricApp.seeding import seed_data, clear_seed_data
+
+
+class Command(BaseCommand):
+    help = (
+        "Grow the synthetic benchmark data up to N products (with specs / images), "
+        "M users and K orders (uses the configured database)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--products", type=int, default=1000)
+        parser.add_argument("--users", type=int, default=100)
+        parser.add_argument("--orders", type=int, default=1000)
+        parser.add_argument("--seed", type=int, default=1, help="same seed -> same data")
+        parser.add_argument("--no-images", action="store_true", help="skip placeholder images")
+        parser.add_argument("--clear", action="store_true", help="remove all seeded rows and exit")
+
+    def handle(self, *args, **options):
+        if options["clear"]:
+            deleted = clear_seed_data()
+            self.stdout.write(self.style.SUCCESS(
+                f"Removed {deleted['products']} products, {deleted['users']} users, "
+                f"{deleted['orders']} orders"
+            ))
+            return
+
+        started = time.perf_counter()
+        try:
+            created = seed_data(
+                products=options["products"],
+                users=options["users"],
+                orders=options["orders"],
+                seed=options["seed"],
+                images=not options["no_images"],
+            )
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Created {created['products']} products, {created['users']} users, "
+            f"{created['orders']} orders in {time.perf_counter() - started:.1f}s"
+        ))
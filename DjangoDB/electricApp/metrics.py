@@ -0,0 +1,263 @@
+import hmac
+import logging
+import os
+import threading
+import time
+from contextlib import ExitStack
+from django.conf import settings
+from django.db import connections
+from django.http import HttpResponse, JsonResponse
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+
+# =============== REQUEST METRICS ===============
+# RequestMetricsMiddleware (first in MIDDLEWARE) records per resolved view:
+#   queries / db time  -> execute_wrapper on every connection
+#   render time        -> DRF Response render (process_template_response)
+#   total latency
+# With settings.SERVER_TIMING on (env SERVER_TIMING=1, off by default: query
+# counts and db time are backend internals) each response carries a
+# Server-Timing header (browser devtools show it),
+# totals are kept per worker process and served by GET api/metrics/
+# (Prometheus text, ?format=json for a readable summary) to an admin JWT or
+# "Authorization: Bearer <settings.METRICS_TOKEN>" (scrapers), and only from
+# METRICS_ALLOWED_IPS.
+#
+# QUERY_BUDGETS caps queries per view. settings.QUERY_BUDGET_MODE:
+#   "warn"  -> log (default)    "raise" -> QueryBudgetExceeded (tests)    "off"
+# ===============================================
+
+logger = logging.getLogger(__name__)
+
+# max queries per request, auth lookup included
+QUERY_BUDGETS = {
+    # catalog
+    "electricApp.views.products_list": 2,
+    "electricApp.views.product_search": 8,
+    "electricApp.views.product_detail": 5,
+    "electricApp.views.product_stock": 2,
+    "electricApp.views.categories": 2,
+    "electricApp.views.add_subcategory": 2,
+    "electricApp.views.get_brands": 2,
+    "clientSide.views.categories": 2,
+    "clientSide.views.subcategories": 2,
+    # orders (create_order / checkout_cart: +1 when the buyer's stock holds are consumed)
+    "electricApp.views.create_order": 16,
+    "electricApp.views.checkout_cart": 18,
+    "electricApp.views.admin_orders": 4,
+    "electricApp.views.admin_order_detail": 4,
+    "electricApp.views.client_order_detail": 4,
+    # reports
+    "electricApp.views.dashboard_overview": 7,
+    "electricApp.views.accounting_dashboard": 5,
+    "electricApp.views.orders_dashboard": 5,
+    "electricApp.views.export_jobs": 3,
+    # customer / admin lists
+    "userApp.views.cart_items": 2,
+    "userApp.views.cart_batch": 8,
+    "userApp.views.cart_reserve": 9,
+    "userApp.views.wishlist_items": 2,
+    "userApp.views.sale_banner": 2,
+    "userApp.views.client_reviews": 2,
+    "userApp.views.product_reviews": 3,
+    "userApp.views.admin_reviews": 3,
+    "userApp.views.update_review_status": 8,
+    "userApp.views.review_batch_status": 8,
+    "userApp.views.get_users": 2,
+}
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+_stats = {}
+_lock = threading.Lock()
+
+
+class QueryBudgetExceeded(Exception):
+    pass
+
+
+class QueryCounter:
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.duration += time.perf_counter() - started
+
+
+class RequestMetricsMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        counter = QueryCounter()
+        request._metrics_render = 0.0
+
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            for alias in connections:
+                stack.enter_context(connections[alias].execute_wrapper(counter))
+            response = self.get_response(request)
+        total = time.perf_counter() - started
+
+        match = getattr(request, "resolver_match", None)
+        view = match.view_name if match else "unresolved"
+        render = request._metrics_render
+
+        if getattr(settings, "SERVER_TIMING", False):
+            response["Server-Timing"] = ", ".join([
+                f'db;dur={counter.duration * 1000:.1f};desc="{counter.count} queries"',
+                f"render;dur={render * 1000:.1f}",
+                f"app;dur={max(total - counter.duration - render, 0) * 1000:.1f}",
+                f"total;dur={total * 1000:.1f}",
+            ])
+
+        record(view, request.method, response.status_code, total, counter, render)
+        check_budget(view, counter.count)
+        return response
+
+    def process_template_response(self, request, response):
+        # runs just before render(), the callback right after it
+        started = time.perf_counter()
+
+        def rendered(response):
+            request._metrics_render = time.perf_counter() - started
+
+        response.add_post_render_callback(rendered)
+        return response
+
+
+def check_budget(view, count):
+    budget = QUERY_BUDGETS.get(view)
+    mode = getattr(settings, "QUERY_BUDGET_MODE", "warn")
+    if budget is None or count <= budget or mode == "off":
+        return
+    message = f"{view} ran {count} queries, budget is {budget}"
+    if mode == "raise":
+        raise QueryBudgetExceeded(message)
+    logger.warning(message)
+
+
+def record(view, method, status_code, total, counter, render):
+    key = (view, method)
+    with _lock:
+        stats = _stats.get(key)
+        if stats is None:
+            stats = _stats[key] = {
+                "requests": 0,
+                "errors": 0,
+                "seconds": 0.0,
+                "db_seconds": 0.0,
+                "render_seconds": 0.0,
+                "queries": 0,
+                "max_queries": 0,
+                "max_seconds": 0.0,
+                "buckets": [0] * len(LATENCY_BUCKETS),
+            }
+        stats["requests"] += 1
+        stats["errors"] += status_code >= 500
+        stats["seconds"] += total
+        stats["db_seconds"] += counter.duration
+        stats["render_seconds"] += render
+        stats["queries"] += counter.count
+        stats["max_queries"] = max(stats["max_queries"], counter.count)
+        stats["max_seconds"] = max(stats["max_seconds"], total)
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if total <= bound:
+                stats["buckets"][i] += 1
+                break
+
+
+def snapshot():
+    with _lock:
+        return {key: dict(stats, buckets=list(stats["buckets"])) for key, stats in _stats.items()}
+
+
+def reset():
+    with _lock:
+        _stats.clear()
+
+
+# ---------- EXPORT ----------
+def prometheus_text(stats):
+    lines = [
+        "# HELP http_request_duration_seconds Request latency per view",
+        "# TYPE http_request_duration_seconds histogram",
+    ]
+    for (view, method), s in sorted(stats.items()):
+        labels = f'view="{view}",method="{method}"'
+        cumulative = 0
+        for bound, count in zip(LATENCY_BUCKETS, s["buckets"]):
+            cumulative += count
+            lines.append(f'http_request_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+        lines.append(f'http_request_duration_seconds_bucket{{{labels},le="+Inf"}} {s["requests"]}')
+        lines.append(f"http_request_duration_seconds_sum{{{labels}}} {s['seconds']:.6f}")
+        lines.append(f"http_request_duration_seconds_count{{{labels}}} {s['requests']}")
+
+    counters = (
+        ("http_request_errors_total", "counter", "5xx responses per view", "errors"),
+        ("http_request_db_seconds_total", "counter", "Time spent in SQL per view", "db_seconds"),
+        ("http_request_render_seconds_total", "counter", "Time spent rendering responses per view", "render_seconds"),
+        ("http_request_queries_total", "counter", "SQL queries per view", "queries"),
+        ("http_request_max_queries", "gauge", "Most queries seen in one request per view", "max_queries"),
+    )
+    for name, kind, help_text, field in counters:
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        for (view, method), s in sorted(stats.items()):
+            lines.append(f'{name}{{view="{view}",method="{method}"}} {s[field]}')
+
+    return "\n".join(lines) + "\n"
+
+
+def summary(stats):
+    rows = []
+    for (view, method), s in sorted(stats.items(), key=lambda item: -item[1]["seconds"]):
+        n = s["requests"]
+        rows.append({
+            "view": view,
+            "method": method,
+            "requests": n,
+            "errors": s["errors"],
+            "avg_ms": round(s["seconds"] / n * 1000, 2),
+            "max_ms": round(s["max_seconds"] * 1000, 2),
+            "avg_db_ms": round(s["db_seconds"] / n * 1000, 2),
+            "avg_render_ms": round(s["render_seconds"] / n * 1000, 2),
+            "avg_queries": round(s["queries"] / n, 2),
+            "max_queries": s["max_queries"],
+            "query_budget": QUERY_BUDGETS.get(view),
+        })
+    return rows
+
+
+def metrics_authorized(request):
+    # scraper token from settings, otherwise an admin JWT
+    token = getattr(settings, "METRICS_TOKEN", None)
+    header = request.META.get("HTTP_AUTHORIZATION", "")
+    if token and hmac.compare_digest(header.encode(), f"Bearer {token}".encode()):
+        return True
+    try:
+        auth = JWTAuthentication().authenticate(request)
+    except AuthenticationFailed:
+        return False
+    return auth is not None and auth[0].role == "admin"
+
+
+def metrics_view(request):
+    # plain Django view: admin JWT or METRICS_TOKEN, the IP list is an extra check
+    allowed = getattr(settings, "METRICS_ALLOWED_IPS", ("127.0.0.1", "::1"))
+    if request.META.get("REMOTE_ADDR") not in allowed:
+        return JsonResponse({"error": "Forbidden"}, status=403)
+    if not metrics_authorized(request):
+        return JsonResponse({"error": "Admin role or metrics token required"}, status=401)
+
+    stats = snapshot()
+    if request.GET.get("format") == "json":
+        return JsonResponse({"pid": os.getpid(), "views": summary(stats)})
+    return HttpResponse(prometheus_text(stats), content_type="text/plain; version=0.0.4")
@@ -0,0 +1,79 @@
+from django.db import migrations
+
+
+# search index lives outside the ORM (FTS5 / tsvector), see electricApp/search.py
+
+SQLITE_CREATE = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS electricapp_product_fts USING fts5(
+        name, sku, part_number, short_description, specs,
+        tokenize = 'unicode61'
+    )
+    """,
+    # column weights for bm25 -> name, sku, part_number, short_description, specs
+    """
+    INSERT INTO electricapp_product_fts (electricapp_product_fts, rank)
+    VALUES ('rank', 'bm25(10.0, 8.0, 8.0, 2.0, 4.0)')
+    """,
+    """
+    INSERT INTO electricapp_product_fts
+        (rowid, name, sku, part_number, short_description, specs)
+    SELECT p.id, p.name, p.sku, p.part_number, p.short_description,
+        COALESCE((
+            SELECT group_concat(s.key || ' ' || s.value, ' ')
+            FROM "electricApp_productspecification" s WHERE s.product_id = p.id
+        ), '')
+    FROM "electricApp_product" p
+    """,
+]
+
+POSTGRES_CREATE = [
+    """
+    CREATE TABLE IF NOT EXISTS electricapp_product_search (
+        product_id bigint PRIMARY KEY
+            REFERENCES "electricApp_product" (id) ON DELETE CASCADE,
+        document tsvector NOT NULL
+    )
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS electricapp_product_search_document_idx
+    ON electricapp_product_search USING GIN (document)
+    """,
+    """
+    INSERT INTO electricapp_product_search (product_id, document)
+    SELECT p.id,
+        setweight(to_tsvector('simple', p.name), 'A')
+        || setweight(to_tsvector('simple', p.sku || ' ' || p.part_number), 'A')
+        || setweight(to_tsvector('simple', COALESCE(string_agg(s.key || ' ' || s.value, ' '), '')), 'B')
+        || setweight(to_tsvector('simple', p.short_description), 'C')
+    FROM "electricApp_product" p
+    LEFT JOIN "electricApp_productspecification" s ON s.product_id = p.id
+    GROUP BY p.id
+    """,
+]
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    statements = {"sqlite": SQLITE_CREATE, "postgresql": POSTGRES_CREATE}.get(vendor, [])
+    for sql in statements:
+        schema_editor.execute(sql)
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        schema_editor.execute("DROP TABLE IF EXISTS electricapp_product_fts")
+    elif vendor == "postgresql":
+        schema_editor.execute("DROP TABLE IF EXISTS electricapp_product_search")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('electricApp', '0017_salebanner_is_active'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,94 @@
+# Generated by Django 6.0.1 on 2026-10-18 08:45
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Sum, Count, F, Q
+from django.db.models.functions import TruncDate
+
+
+def fill_rollups(apps, schema_editor):
+    # same numbers as rollups.rebuild_rollups(), with historical models
+    Order = apps.get_model("electricApp", "Order")
+    OrderItem = apps.get_model("electricApp", "OrderItem")
+    DailySales = apps.get_model("electricApp", "DailySales")
+    DailyProductSales = apps.get_model("electricApp", "DailyProductSales")
+
+    days = (
+        Order.objects
+        .annotate(day=TruncDate("created_at"))
+        .values("day")
+        .annotate(
+            orders=Count("id"),
+            gross_amount=Sum("total_amount"),
+            pending_orders=Count("id", filter=Q(order_status="Pending")),
+            delivered_orders=Count("id", filter=Q(order_status="Delivered")),
+            delivered_amount=Sum("total_amount", filter=Q(order_status="Delivered")),
+            cancelled_orders=Count("id", filter=Q(order_status="Cancelled")),
+            cancelled_amount=Sum("total_amount", filter=Q(order_status="Cancelled")),
+        )
+        .order_by("day")
+    )
+    DailySales.objects.bulk_create([
+        DailySales(**{k: (v if v is not None else 0) for k, v in d.items()})
+        for d in days
+    ], batch_size=500)
+
+    products = (
+        OrderItem.objects
+        .filter(product__isnull=False)
+        .annotate(day=TruncDate("order__created_at"))
+        .values("day", "product_id")
+        .annotate(qty=Sum("quantity"), total=Sum(F("price") * F("quantity")))
+        .order_by("day")
+    )
+    DailyProductSales.objects.bulk_create([
+        DailyProductSales(
+            day=p["day"],
+            product_id=p["product_id"],
+            quantity=p["qty"],
+            amount=p["total"] or 0,
+        )
+        for p in products
+    ], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('electricApp', '0019_order_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailySales',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('bucket', models.PositiveSmallIntegerField(default=0)),
+                ('orders', models.PositiveIntegerField(default=0)),
+                ('gross_amount', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('pending_orders', models.IntegerField(default=0)),
+                ('delivered_orders', models.IntegerField(default=0)),
+                ('delivered_amount', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('cancelled_orders', models.IntegerField(default=0)),
+                ('cancelled_amount', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+            ],
+            options={
+                'unique_together': {('day', 'bucket')},
+            },
+        ),
+        migrations.CreateModel(
+            name='DailyProductSales',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('quantity', models.PositiveIntegerField(default=0)),
+                ('amount', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('product', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='electricApp.product')),
+            ],
+            options={
+                'unique_together': {('day', 'product')},
+            },
+        ),
+        migrations.RunPython(fill_rollups, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 6.0.1 on 2026-10-18 09:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('electricApp', '0021_export_jobs'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='image_formats',
+            field=models.CharField(blank=True, max_length=20),
+        ),
+        migrations.AddField(
+            model_name='productimage',
+            name='image_formats',
+            field=models.CharField(blank=True, max_length=20),
+        ),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 6.0.1 on 2026-10-18 09:09
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Sum, Q
+
+
+def fill_ratings(apps, schema_editor):
+    # same numbers as ratings.rebuild_ratings(), with historical models
+    ProductReview = apps.get_model("electricApp", "ProductReview")
+    ProductRating = apps.get_model("electricApp", "ProductRating")
+
+    stars = {f"stars_{n}": Count("id", filter=Q(rating=n)) for n in range(1, 6)}
+    rows = (
+        ProductReview.objects
+        .filter(status="approved")
+        .values("product_id")
+        .annotate(count=Count("id"), total=Sum("rating"), **stars)
+        .order_by("product_id")
+    )
+    ProductRating.objects.bulk_create([
+        ProductRating(avg=round(row["total"] / row["count"], 2), **row)
+        for row in rows
+    ], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('electricApp', '0023_hot_query_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProductRating',
+            fields=[
+                ('product', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='rating', serialize=False, to='electricApp.product')),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('total', models.PositiveIntegerField(default=0)),
+                ('avg', models.DecimalField(decimal_places=2, default=0, max_digits=3)),
+                ('stars_1', models.PositiveIntegerField(default=0)),
+                ('stars_2', models.PositiveIntegerField(default=0)),
+                ('stars_3', models.PositiveIntegerField(default=0)),
+                ('stars_4', models.PositiveIntegerField(default=0)),
+                ('stars_5', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='productreview',
+            index=models.Index(fields=['product', 'status', '-id'], name='review_product_status_idx'),
+        ),
+        migrations.RunPython(fill_ratings, migrations.RunPython.noop),
+    ]
@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models import Q
 from django.contrib.auth.models import AbstractBaseUser, BaseUserManager, PermissionsMixin
 
 class UserManager(BaseUserManager):
@@ -77,7 +78,23 @@ class Brand(models.Model):
     def __str__(self):
         return self.name
 
-class Product(models.Model):
+# ---------- uploads : image name as loaded, signals.py builds derivatives only when it changes ----------
+class TracksImage:
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_image = instance.__dict__.get("image")
+        return instance
+
+    def image_changed(self):
+        # new file on this save (new rows included); remembered so a second save is a no-op
+        name = self.image.name if self.image else None
+        changed = bool(name) and name != getattr(self, "_loaded_image", None)
+        self._loaded_image = name
+        return changed
+
+
+class Product(TracksImage, models.Model):
     # Relations
     category = models.ForeignKey(Category, on_delete=models.CASCADE)
     subcategory = models.ForeignKey(Subcategory, on_delete=models.CASCADE)
@@ -100,12 +117,21 @@ class Product(models.Model):
 
     # Product Media
     image = models.ImageField(upload_to="products/", blank=True, null=True)
+    image_formats = models.CharField(max_length=20, blank=True)  # resized copies written, "avif,webp" (images.py)
     datasheet_url = models.URLField(blank=True, null=True)
 
     # Meta
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            # storefront: active products of a category / subcategory (search filters, facets)
+            models.Index(fields=["category", "subcategory"], condition=Q(is_active=True), name="product_active_cat_idx"),
+            # dashboard low stock list, only the few rows at or under the threshold
+            models.Index(fields=["stock"], condition=Q(stock__lte=10), name="product_low_stock_idx"),
+        ]
+
     def __str__(self):
         return self.name  
 
@@ -117,10 +143,11 @@ class ProductSpecification(models.Model):
     def __str__(self):
         return f"{self.key}: {self.value}"
 
-class ProductImage(models.Model):
+class ProductImage(TracksImage, models.Model):
     product = models.ForeignKey( Product, on_delete=models.CASCADE, related_name='images', blank=True
     )
     image = models.ImageField(upload_to='products/gallery/')
+    image_formats = models.CharField(max_length=20, blank=True)  # resized copies written (images.py)
     alt_text = models.CharField(max_length=255, blank=True)
     is_primary = models.BooleanField(default=False)
 
@@ -151,11 +178,20 @@ class Order(models.Model):
     total_amount = models.DecimalField(max_digits=10, decimal_places=2) 
     qty = models.IntegerField(default=1)
 
-    payment_status = models.CharField(max_length=20, choices=PAYMENT_STATUS)
+    payment_status = models.CharField(max_length=20, choices=PAYMENT_STATUS, db_index=True)
     order_status = models.CharField(max_length=20, choices=ORDER_STATUS, default="Pending")
     address = models.TextField(default="-")
 
-    created_at = models.DateTimeField(auto_now_add=True)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        indexes = [
+            # admin orders ?status= newest first, status exports by month
+            # (also serves plain order_status lookups, replaces the single column index)
+            models.Index(fields=["order_status", "-created_at"], name="order_status_created_idx"),
+            # customer "my orders", newest first
+            models.Index(fields=["user", "-created_at"], name="order_user_created_idx"),
+        ]
 
     def __str__(self):
         return self.order_id
@@ -194,9 +230,32 @@ class ProductReview(models.Model):
     )
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            # approved reviews on the storefront / moderation queue, newest first
+            models.Index(fields=["status", "-created_at"], name="review_status_created_idx"),
+            # per product review pages (id cursor)
+            models.Index(fields=["product", "status", "-id"], name="review_product_status_idx"),
+        ]
+
     def __str__(self):
         return f"{self.product.name} - {self.rating}★"
 
+# ---------- PRODUCT RATINGS (approved reviews only, kept by ratings.py, rebuild: manage.py rebuild_ratings) ----------
+class ProductRating(models.Model):
+    product = models.OneToOneField(Product, on_delete=models.CASCADE, primary_key=True, related_name="rating")
+    count = models.PositiveIntegerField(default=0)
+    total = models.PositiveIntegerField(default=0)  # sum of stars
+    avg = models.DecimalField(max_digits=3, decimal_places=2, default=0)
+    stars_1 = models.PositiveIntegerField(default=0)
+    stars_2 = models.PositiveIntegerField(default=0)
+    stars_3 = models.PositiveIntegerField(default=0)
+    stars_4 = models.PositiveIntegerField(default=0)
+    stars_5 = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.product_id} - {self.avg}★ ({self.count})"
+
 class WishList(models.Model):
     user = models.ForeignKey(CustomUser, on_delete=models.CASCADE)
     product = models.ForeignKey(Product, on_delete=models.CASCADE)
@@ -219,13 +278,106 @@ class Cart(models.Model):
 
     def __str__(self):
         return f"{self.user} - {self.product.name} ({self.quantity})"
+
+
+# ---------- STOCK HOLDS (short reservations, see holds.py, sweep: manage.py expire_holds) ----------
+class StockHold(models.Model):
+    user = models.ForeignKey(CustomUser, on_delete=models.CASCADE)
+    product = models.ForeignKey(Product, on_delete=models.CASCADE, related_name="holds")
+    quantity = models.PositiveIntegerField()
+    expires_at = models.DateTimeField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = ("user", "product")
+        indexes = [
+            # held quantity of a product: active holds only
+            models.Index(fields=["product", "expires_at"], name="hold_product_expiry_idx"),
+            # sweeper
+            models.Index(fields=["expires_at"], name="hold_expiry_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.user} - {self.product_id} x{self.quantity} until {self.expires_at}"
     
     
 class SaleBanner(models.Model):
     product = models.ForeignKey(Product, on_delete=models.CASCADE)
     discription = models.TextField()
     is_active = models.BooleanField(default=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["product"], condition=Q(is_active=True), name="banner_active_idx"),
+        ]
     
     def __str__(self):
         return f"{self.product} -- {self.discription}"
     
+
+
+# ---------- REPORT ROLLUPS (kept by rollups.py, rebuild: manage.py rebuild_sales_rollup) ----------
+class DailySales(models.Model):
+    day = models.DateField()  # order created_at date
+    bucket = models.PositiveSmallIntegerField(default=0)  # shard of the day, readers sum them
+    orders = models.PositiveIntegerField(default=0)
+    gross_amount = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    # current status of that day's orders
+    pending_orders = models.IntegerField(default=0)
+    delivered_orders = models.IntegerField(default=0)
+    delivered_amount = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    cancelled_orders = models.IntegerField(default=0)
+    cancelled_amount = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    class Meta:
+        unique_together = ("day", "bucket")
+
+    def __str__(self):
+        return f"{self.day}/{self.bucket} - {self.orders} orders"
+
+
+class DailyProductSales(models.Model):
+    day = models.DateField()
+    product = models.ForeignKey(Product, on_delete=models.CASCADE)
+    quantity = models.PositiveIntegerField(default=0)
+    amount = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    class Meta:
+        unique_together = ("day", "product")
+
+    def __str__(self):
+        return f"{self.day} - {self.product.name} ({self.quantity})"
+
+
+# ---------- EXPORT JOBS (run by manage.py run_export_jobs, see jobs.py) ----------
+class ExportJob(models.Model):
+    KIND_CHOICES = (
+        ("accounting_csv", "Accounting CSV"),
+        ("orders_csv", "Orders CSV"),
+        ("accounting_pdf", "Accounting PDF"),
+        ("orders_pdf", "Orders PDF"),
+        ("parcel_label", "Parcel label"),
+    )
+
+    STATUS_CHOICES = (
+        ("queued", "Queued"),
+        ("running", "Running"),
+        ("done", "Done"),
+        ("failed", "Failed"),
+    )
+
+    kind = models.CharField(max_length=30, choices=KIND_CHOICES)
+    params = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default="queued", db_index=True)
+    file = models.FileField(upload_to="exports/", blank=True, null=True)
+    filename = models.CharField(max_length=255, blank=True)  # download name, the stored file may carry a suffix
+    error = models.TextField(blank=True)
+
+    created_by = models.ForeignKey(CustomUser, on_delete=models.SET_NULL, null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.kind} #{self.id} ({self.status})"
@@ -0,0 +1,209 @@
+import random
+import time
+from django.db import transaction, IntegrityError, OperationalError
+from django.db.models import Case, When, F
+from django.utils.timezone import now
+from .models import Product, Order, OrderItem, Cart, StockHold
+from .cache import bump_product
+from .holds import held_quantity
+from .rollups import record_order
+
+
+# =============== ORDER PLACEMENT ===============
+# One transaction per order:
+#   1 query   -> lock + fetch all products (select_for_update, id order)
+#                with the quantities other shoppers hold (holds.py)
+#   1 insert  -> Order
+#   1 insert  -> OrderItem (bulk_create)
+#   1 update  -> stock for every product (CASE WHEN, stock >= 0 CHECK guards oversell)
+#   + daily sales rollup rows (rollups.record_order)
+# Checkout from cart (place_cart_order) is the same transaction with the
+# items read from the user's locked Cart rows, which are deleted at the end:
+#   1 query   -> lock + fetch cart rows        1 delete -> ordered cart rows
+# The buyer's own holds on the ordered products are deleted (only when there are some).
+# Lock contention (sqlite "database is locked", postgres deadlock) is retried.
+# ================================================
+
+ORDER_RETRIES = 4
+ORDER_RETRY_DELAY = 0.05  # seconds, grows per attempt + jitter
+# postgres deadlock / serialization failure / lock not available
+LOCK_SQLSTATES = {"40P01", "40001", "55P03"}
+
+
+class OrderError(Exception):
+    def __init__(self, message, status_code=400):
+        super().__init__(message)
+        self.message = message
+        self.status_code = status_code
+
+
+def generate_order_id():
+    return f"ORD{random.randint(100000000, 9999999999)}"
+
+
+def merge_items(items):
+    # [{"product_id": 1, "quantity": 2}, ...] -> {1: 2}, same product ids merged
+    if not items or not isinstance(items, list):
+        raise OrderError("Items must be a non-empty list")
+
+    merged = {}
+    for item in items:
+        product_id = item.get("product_id")
+        quantity = item.get("quantity")
+
+        if not product_id or not quantity:
+            raise OrderError("Each item must have product_id and quantity")
+
+        try:
+            product_id = int(product_id)
+            quantity = int(quantity)
+            if quantity <= 0:
+                raise ValueError
+        except (TypeError, ValueError):
+            raise OrderError("Quantity must be a positive number")
+
+        merged[product_id] = merged.get(product_id, 0) + quantity
+
+    return merged
+
+
+def _create_order_row(**fields):
+    # order_id is random, a unique clash just draws a new one
+    for attempt in range(3):
+        try:
+            with transaction.atomic():
+                return Order.objects.create(order_id=generate_order_id(), **fields)
+        except IntegrityError:
+            if attempt == 2:
+                raise
+
+
+def _lock_cart(user):
+    # user's cart rows -> {product_id: quantity}, locked until the order commits
+    merged = dict(
+        Cart.objects
+        .select_for_update()
+        .filter(user=user)
+        .order_by("product_id")
+        .values_list("product_id", "quantity")
+    )
+    if not merged:
+        raise OrderError("Cart is empty")
+    return merged
+
+
+def _place_order(user, merged_items, order_fields, from_cart=False):
+    with transaction.atomic():
+        if from_cart:
+            merged_items = _lock_cart(user)
+
+        at = now()
+        products = {
+            p.id: p
+            for p in Product.objects
+            .select_for_update()
+            .filter(id__in=merged_items.keys(), is_active=True)
+            .annotate(
+                held=held_quantity(at, exclude_user=user),
+                mine=held_quantity(at, user=user),
+            )
+            .order_by("id")
+        }
+
+        total_amount = 0
+        total_qty = 0
+        for product_id, quantity in merged_items.items():
+            product = products.get(product_id)
+            if product is None:
+                raise OrderError(f"Product with id {product_id} not found", 404)
+            if product.stock - product.held < quantity:
+                raise OrderError(f"Insufficient stock for {product.name}")
+
+            total_amount += product.price * quantity
+            total_qty += quantity
+
+        order = _create_order_row(
+            user=user,
+            total_amount=total_amount,
+            qty=total_qty,
+            order_status="Pending",
+            **order_fields
+        )
+
+        OrderItem.objects.bulk_create([
+            OrderItem(
+                order=order,
+                product=products[product_id],
+                price=products[product_id].price,
+                quantity=quantity
+            )
+            for product_id, quantity in merged_items.items()
+        ])
+
+        record_order(order, [
+            (product_id, quantity, products[product_id].price)
+            for product_id, quantity in merged_items.items()
+        ])
+
+        # ---------- STOCK : one conditional update ----------
+        try:
+            with transaction.atomic():
+                updated = Product.objects.filter(
+                    id__in=merged_items.keys()
+                ).update(stock=Case(
+                    *[
+                        When(id=product_id, then=F("stock") - quantity)
+                        for product_id, quantity in merged_items.items()
+                    ],
+                    default=F("stock"),
+                    output_field=Product._meta.get_field("stock"),
+                ))
+        except IntegrityError:
+            # stock would go below zero (someone else bought it first)
+            raise OrderError("Insufficient stock for one or more products")
+
+        if updated != len(merged_items):
+            raise OrderError("Insufficient stock for one or more products")
+
+        if from_cart:
+            Cart.objects.filter(user=user, product_id__in=merged_items.keys()).delete()
+        if any(p.mine for p in products.values()):
+            StockHold.objects.filter(user=user, product_id__in=merged_items.keys()).delete()
+
+        transaction.on_commit(
+            lambda: [bump_product(product_id) for product_id in merged_items]
+        )
+
+    return order
+
+
+def is_lock_error(error):
+    # only lock contention is worth a retry, other OperationalErrors are real failures
+    cause = error.__cause__
+    code = getattr(cause, "sqlstate", None) or getattr(cause, "pgcode", None)
+    if code:
+        return code in LOCK_SQLSTATES
+    # sqlite: "database is locked" / "database table is locked"
+    return "locked" in str(error)
+
+
+def _with_retries(user, merged_items, order_fields, from_cart=False):
+    for attempt in range(ORDER_RETRIES):
+        try:
+            return _place_order(user, merged_items, order_fields, from_cart)
+        except OperationalError as e:
+            # lock contention (sqlite busy / postgres deadlock) -> try again
+            if not is_lock_error(e):
+                raise
+            if attempt == ORDER_RETRIES - 1:
+                raise OrderError("Store is busy, please retry", 503)
+            time.sleep(ORDER_RETRY_DELAY * (attempt + 1) + random.random() * ORDER_RETRY_DELAY)
+
+
+def place_order(user, merged_items, **order_fields):
+    return _with_retries(user, merged_items, order_fields)
+
+
+def place_cart_order(user, **order_fields):
+    # checkout of everything in the user's cart, cart emptied in the same transaction
+    return _with_retries(user, None, order_fields, from_cart=True)
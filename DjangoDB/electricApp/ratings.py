@@ -0,0 +1,131 @@
+from django.db import transaction
+from django.db.models import Case, When, F, Q, Count, Sum, Value, DecimalField, FloatField
+from django.db.models.functions import Cast, Round
+from .models import ProductReview, ProductRating
+
+
+# =============== PRODUCT RATINGS ===============
+# ProductRating holds count / sum / avg / 1-5 star histogram of the APPROVED
+# reviews of a product, so lists and cards read it with a join instead of
+# loading reviews.
+#   moderate_reviews      -> set the status of many reviews (one UPDATE), ratings follow
+#                            in the same transaction (update_review_status, batch endpoint)
+#   record_rating_changes -> a review enters / leaves "approved", an approved review
+#                            is deleted (signals.py)
+#   rebuild_ratings       -> manage.py rebuild_ratings (after admin / shell edits)
+# Callers bump the product detail cache (cache.bump_products) on commit.
+# ================================================
+
+REVIEW_BATCH_MAX = 5000
+STAR_FIELDS = {n: f"stars_{n}" for n in range(1, 6)}
+RATING_COLUMNS = ["count", "total", *STAR_FIELDS.values()]
+
+AVG = Case(
+    When(count=0, then=Value(0)),
+    default=Round(Cast(F("total"), FloatField()) / F("count"), 2),
+    output_field=DecimalField(max_digits=3, decimal_places=2),
+)
+
+
+def rating_changes(reviews, new_status):
+    # reviews still holding their old status -> [(product_id, rating, +1 / -1)]
+    changes = []
+    for review in reviews:
+        was_approved = review.status == "approved"
+        if was_approved != (new_status == "approved"):
+            changes.append((review.product_id, review.rating, -1 if was_approved else 1))
+    return changes
+
+
+def record_rating_changes(changes, create=True):
+    # one insert for missing rows + one CASE update + one avg update, any number of products
+    # create=False only touches existing rows (delete cascades, product may be going away)
+    deltas = {}
+    for product_id, rating, sign in changes:
+        delta = deltas.setdefault(product_id, dict.fromkeys(RATING_COLUMNS, 0))
+        delta["count"] += sign
+        delta["total"] += sign * rating
+        if rating in STAR_FIELDS:
+            delta[STAR_FIELDS[rating]] += sign
+    deltas = {pid: d for pid, d in deltas.items() if any(d.values())}
+    if not deltas:
+        return []
+
+    if create:
+        ProductRating.objects.bulk_create(
+            [ProductRating(product_id=pid) for pid in deltas], ignore_conflicts=True
+        )
+
+    rows = ProductRating.objects.filter(product_id__in=deltas.keys())
+    rows.update(**{
+        column: Case(
+            *[When(product_id=pid, then=F(column) + d[column]) for pid, d in deltas.items() if d[column]],
+            default=F(column),
+            output_field=ProductRating._meta.get_field(column),
+        )
+        for column in RATING_COLUMNS
+        if any(d[column] for d in deltas.values())
+    })
+    rows.update(avg=AVG)
+    return list(deltas)
+
+
+def moderate_reviews(ids, new_status):
+    # -> {"matched", "updated", "not_found", "products"}; products = rating rows touched,
+    # bump their detail cache on commit
+    ids = list(dict.fromkeys(ids))
+    with transaction.atomic():
+        reviews = list(
+            ProductReview.objects
+            .select_for_update()
+            .filter(id__in=ids)
+            .only("id", "product_id", "rating", "status")
+        )
+        changing = [r for r in reviews if r.status != new_status]
+        products = record_rating_changes(rating_changes(changing, new_status))
+        updated = ProductReview.objects.filter(id__in=[r.id for r in changing]).update(status=new_status)
+
+    found = {r.id for r in reviews}
+    return {
+        "matched": len(reviews),
+        "updated": updated,
+        "not_found": [i for i in ids if i not in found],
+        "products": products,
+    }
+
+
+def rating_payload(avg, count, histogram=None):
+    # avg / count None -> product without approved reviews
+    data = {"avg": float(avg or 0), "count": count or 0}
+    if histogram is not None:
+        data["histogram"] = histogram
+    return data
+
+
+def product_rating_payload(product):
+    # product loaded with select_related("rating")
+    rating = getattr(product, "rating", None)
+    if rating is None:
+        return rating_payload(None, None, dict.fromkeys(map(str, STAR_FIELDS), 0))
+    return rating_payload(rating.avg, rating.count, {
+        str(n): getattr(rating, field) for n, field in STAR_FIELDS.items()
+    })
+
+
+def rebuild_ratings():
+    with transaction.atomic():
+        ProductRating.objects.all().delete()
+        rows = (
+            ProductReview.objects
+            .filter(status="approved")
+            .values("product_id")
+            .annotate(
+                count=Count("id"),
+                total=Sum("rating"),
+                **{field: Count("id", filter=Q(rating=n)) for n, field in STAR_FIELDS.items()},
+            )
+            .order_by("product_id")
+        )
+        ProductRating.objects.bulk_create([ProductRating(**row) for row in rows], batch_size=500)
+        ProductRating.objects.update(avg=AVG)
+    return ProductRating.objects.count()
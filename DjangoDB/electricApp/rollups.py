@@ -0,0 +1,180 @@
+from decimal import Decimal
+from django.db import transaction
+from django.db.models import Sum, Count, Case, When, F, Q, Value
+from django.db.models.functions import TruncDate
+from django.utils.timezone import localdate
+from .models import Order, OrderItem, DailySales, DailyProductSales
+
+
+# =============== DAILY SALES ROLLUP ===============
+# Reports read DailySales / DailyProductSales instead of scanning Order.
+#   record_order          -> new order (orders.place_order)
+#   record_status_change  -> update_order_status
+#   record_order_deleted  -> Order post_delete (signals.py), cascades included
+#   rebuild_rollups       -> manage.py rebuild_sales_rollup (after admin / shell edits)
+# Rows are keyed on the order created_at date, like the old created_at filters.
+# A day is split into SALES_BUCKETS DailySales rows (bucket = order id % N) so
+# concurrent checkouts update different rows instead of queueing on one;
+# readers always Sum() over the day's buckets. A rebuild puts a day in bucket 0.
+# ==================================================
+
+SALES_BUCKETS = 8
+
+# status -> (count column, amount column)
+STATUS_COLUMNS = {
+    "Pending": ("pending_orders", None),
+    "Delivered": ("delivered_orders", "delivered_amount"),
+    "Cancelled": ("cancelled_orders", "cancelled_amount"),
+}
+
+
+def _status_changes(order_status, amount, sign):
+    columns = STATUS_COLUMNS.get(order_status)
+    if not columns:
+        return {}
+    count_column, amount_column = columns
+    changes = {count_column: F(count_column) + sign}
+    if amount_column:
+        changes[amount_column] = F(amount_column) + sign * amount
+    return changes
+
+
+def _item_changes(items, sign):
+    # CASE updates of DailyProductSales quantity / amount for the given items
+    return {
+        "quantity": Case(
+            *[When(product_id=product_id, then=F("quantity") + sign * quantity) for product_id, quantity, _ in items],
+            default=F("quantity"),
+            output_field=DailyProductSales._meta.get_field("quantity"),
+        ),
+        "amount": Case(
+            *[When(product_id=product_id, then=F("amount") + sign * price * quantity) for product_id, quantity, price in items],
+            default=F("amount"),
+            output_field=DailyProductSales._meta.get_field("amount"),
+        ),
+    }
+
+
+def _day_row(order):
+    # the order's DailySales row, created if missing: one INSERT .. ON CONFLICT DO NOTHING,
+    # same cost whether or not it is the first order of the day / bucket
+    day = localdate(order.created_at)
+    bucket = order.id % SALES_BUCKETS
+    DailySales.objects.bulk_create([DailySales(day=day, bucket=bucket)], ignore_conflicts=True)
+    return DailySales.objects.filter(day=day, bucket=bucket)
+
+
+def record_order(order, items):
+    # items -> [(product_id, quantity, price), ...]
+    day = localdate(order.created_at)
+
+    _day_row(order).update(
+        orders=F("orders") + 1,
+        gross_amount=F("gross_amount") + order.total_amount,
+        **_status_changes(order.order_status, order.total_amount, 1)
+    )
+
+    # per product rows: one insert (existing rows skipped) + one CASE update
+    DailyProductSales.objects.bulk_create(
+        [DailyProductSales(day=day, product_id=product_id) for product_id, _, _ in items],
+        ignore_conflicts=True,
+    )
+    DailyProductSales.objects.filter(
+        day=day, product_id__in=[product_id for product_id, _, _ in items]
+    ).update(**_item_changes(items, 1))
+
+
+def record_status_change(order, old_status, new_status):
+    if old_status == new_status:
+        return
+
+    changes = _status_changes(old_status, order.total_amount, -1)
+    changes.update(_status_changes(new_status, order.total_amount, 1))
+    if not changes:
+        return
+
+    _day_row(order).update(**changes)
+
+
+def record_order_deleted(order, items):
+    # reverses record_order (+ its current status); items -> [(product_id, quantity, price), ...]
+    # The order may sit in bucket 0 after a rebuild, so the day's row holding it is
+    # its own bucket when that one counts orders, else any bucket that does.
+    day = localdate(order.created_at)
+    row = (
+        DailySales.objects
+        .filter(day=day, orders__gt=0)
+        .order_by(Case(When(bucket=order.id % SALES_BUCKETS, then=Value(0)), default=Value(1)), "bucket")
+        .values_list("id", flat=True)
+        .first()
+    )
+    if row is not None:
+        DailySales.objects.filter(id=row).update(
+            orders=F("orders") - 1,
+            gross_amount=F("gross_amount") - order.total_amount,
+            **_status_changes(order.order_status, order.total_amount, -1)
+        )
+
+    items = [item for item in items if item[0] is not None]
+    if items:
+        DailyProductSales.objects.filter(
+            day=day, product_id__in=[product_id for product_id, _, _ in items]
+        ).update(**_item_changes(items, -1))
+
+
+def rebuild_rollups():
+    with transaction.atomic():
+        DailySales.objects.all().delete()
+        DailyProductSales.objects.all().delete()
+
+        days = (
+            Order.objects
+            .annotate(day=TruncDate("created_at"))
+            .values("day")
+            .annotate(
+                orders=Count("id"),
+                gross_amount=Sum("total_amount"),
+                pending_orders=Count("id", filter=Q(order_status="Pending")),
+                delivered_orders=Count("id", filter=Q(order_status="Delivered")),
+                delivered_amount=Sum("total_amount", filter=Q(order_status="Delivered")),
+                cancelled_orders=Count("id", filter=Q(order_status="Cancelled")),
+                cancelled_amount=Sum("total_amount", filter=Q(order_status="Cancelled")),
+            )
+            .order_by("day")
+        )
+        DailySales.objects.bulk_create([
+            DailySales(
+                day=d["day"],
+                orders=d["orders"],
+                gross_amount=d["gross_amount"] or Decimal("0"),
+                pending_orders=d["pending_orders"],
+                delivered_orders=d["delivered_orders"],
+                delivered_amount=d["delivered_amount"] or Decimal("0"),
+                cancelled_orders=d["cancelled_orders"],
+                cancelled_amount=d["cancelled_amount"] or Decimal("0"),
+            )
+            for d in days
+        ], batch_size=500)
+
+        products = (
+            OrderItem.objects
+            .filter(product__isnull=False)
+            .annotate(day=TruncDate("order__created_at"))
+            .values("day", "product_id")
+            .annotate(
+                qty=Sum("quantity"),
+                total=Sum(F("price") * F("quantity")),
+            )
+            .order_by("day")
+        )
+        DailyProductSales.objects.bulk_create([
+            DailyProductSales(
+                day=p["day"],
+                product_id=p["product_id"],
+                quantity=p["qty"],
+                amount=p["total"] or Decimal("0"),
+            )
+            for p in products
+        ], batch_size=500)
+
+    return DailySales.objects.count(), DailyProductSales.objects.count()
@@ -0,0 +1,189 @@
+import re
+from django.db import connection
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+from .models import Product, ProductSpecification
+
+
+# =============== PRODUCT SEARCH INDEX ===============
+# sqlite      -> FTS5 table   electricapp_product_fts (rowid = product id)
+# postgresql  -> tsvector table electricapp_product_search + GIN index
+# other db    -> plain icontains lookups (no index)
+# Table is created in migration 0018 and kept in sync by signals.py
+# ====================================================
+
+SQLITE_TABLE = "electricapp_product_fts"
+POSTGRES_TABLE = "electricapp_product_search"
+
+PRODUCT_TABLE = Product._meta.db_table
+SPEC_TABLE = ProductSpecification._meta.db_table
+
+
+def search_vendor():
+    return connection.vendor if connection.vendor in ("sqlite", "postgresql") else None
+
+
+def search_terms(query):
+    # only word characters reach the index query, quotes / operators are dropped
+    return re.findall(r"\w+", query or "")[:10]
+
+
+# ---------- QUERY ----------
+def match_sql(terms):
+    # SQL returning ids of products matching every term (prefix match)
+    vendor = search_vendor()
+    if vendor == "sqlite":
+        fts_query = " ".join(f'"{t}"*' for t in terms)
+        return (
+            f"SELECT rowid FROM {SQLITE_TABLE} WHERE {SQLITE_TABLE} MATCH %s",
+            [fts_query],
+        )
+    if vendor == "postgresql":
+        ts_query = " & ".join(f"{t}:*" for t in terms)
+        return (
+            f"SELECT product_id FROM {POSTGRES_TABLE} "
+            f"WHERE document @@ to_tsquery('simple', %s)",
+            [ts_query],
+        )
+    return None, None
+
+
+def filter_matches(queryset, query):
+    terms = search_terms(query)
+    if not terms:
+        return queryset
+
+    sql, params = match_sql(terms)
+    if sql:
+        return queryset.filter(id__in=RawSQL(sql, params))
+
+    # ---------- fallback : no index for this database ----------
+    for term in terms:
+        queryset = queryset.filter(
+            Q(name__icontains=term)
+            | Q(sku__icontains=term)
+            | Q(part_number__icontains=term)
+            | Q(short_description__icontains=term)
+            | Q(specifications__key__icontains=term)
+            | Q(specifications__value__icontains=term)
+        ).distinct()
+    return queryset
+
+
+def ranked_ids(queryset, query, limit, offset):
+    # queryset is already filtered (and matched), returns one page of ids by rank
+    terms = search_terms(query)
+    vendor = search_vendor()
+
+    if not terms or vendor is None:
+        return list(
+            queryset.order_by("-id").values_list("id", flat=True)[offset:offset + limit]
+        )
+
+    ids_sql, ids_params = queryset.values("id").query.sql_with_params()
+
+    if vendor == "sqlite":
+        sql, params = match_sql(terms)
+        sql = (
+            f"{sql} AND rowid IN ({ids_sql}) "
+            f"ORDER BY rank LIMIT %s OFFSET %s"
+        )
+        params = params + list(ids_params) + [limit, offset]
+    else:
+        ts_query = " & ".join(f"{t}:*" for t in terms)
+        sql = (
+            f"SELECT product_id FROM {POSTGRES_TABLE} "
+            f"WHERE document @@ to_tsquery('simple', %s) AND product_id IN ({ids_sql}) "
+            f"ORDER BY ts_rank_cd(document, to_tsquery('simple', %s)) DESC, product_id DESC "
+            f"LIMIT %s OFFSET %s"
+        )
+        params = [ts_query] + list(ids_params) + [ts_query, limit, offset]
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return [row[0] for row in cursor.fetchall()]
+
+
+# ---------- INDEX SYNC ----------
+def index_products(product_ids):
+    product_ids = [int(pk) for pk in product_ids]
+    vendor = search_vendor()
+    if not product_ids or vendor is None:
+        return
+
+    placeholders = ", ".join(["%s"] * len(product_ids))
+
+    with connection.cursor() as cursor:
+        if vendor == "sqlite":
+            cursor.execute(
+                f"DELETE FROM {SQLITE_TABLE} WHERE rowid IN ({placeholders})",
+                product_ids
+            )
+            cursor.execute(
+                f"""
+                INSERT INTO {SQLITE_TABLE}
+                    (rowid, name, sku, part_number, short_description, specs)
+                SELECT p.id, p.name, p.sku, p.part_number, p.short_description,
+                    COALESCE((
+                        SELECT group_concat(s.key || ' ' || s.value, ' ')
+                        FROM "{SPEC_TABLE}" s WHERE s.product_id = p.id
+                    ), '')
+                FROM "{PRODUCT_TABLE}" p
+                WHERE p.id IN ({placeholders})
+                """,
+                product_ids
+            )
+        else:
+            cursor.execute(
+                f"""
+                INSERT INTO {POSTGRES_TABLE} (product_id, document)
+                SELECT p.id,
+                    setweight(to_tsvector('simple', p.name), 'A')
+                    || setweight(to_tsvector('simple', p.sku || ' ' || p.part_number), 'A')
+                    || setweight(to_tsvector('simple', COALESCE(string_agg(s.key || ' ' || s.value, ' '), '')), 'B')
+                    || setweight(to_tsvector('simple', p.short_description), 'C')
+                FROM "{PRODUCT_TABLE}" p
+                LEFT JOIN "{SPEC_TABLE}" s ON s.product_id = p.id
+                WHERE p.id IN ({placeholders})
+                GROUP BY p.id
+                ON CONFLICT (product_id) DO UPDATE SET document = EXCLUDED.document
+                """,
+                product_ids
+            )
+
+
+def unindex_products(product_ids):
+    product_ids = [int(pk) for pk in product_ids]
+    vendor = search_vendor()
+    if not product_ids or vendor is None:
+        return
+
+    placeholders = ", ".join(["%s"] * len(product_ids))
+    column = "rowid" if vendor == "sqlite" else "product_id"
+    table = SQLITE_TABLE if vendor == "sqlite" else POSTGRES_TABLE
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"DELETE FROM {table} WHERE {column} IN ({placeholders})",
+            product_ids
+        )
+
+
+def rebuild_index(chunk_size=1000):
+    vendor = search_vendor()
+    if vendor is None:
+        return 0
+
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {SQLITE_TABLE if vendor == 'sqlite' else POSTGRES_TABLE}")
+
+    total = 0
+    ids = []
+    for pk in Product.objects.values_list("id", flat=True).iterator(chunk_size=chunk_size):
+        ids.append(pk)
+        if len(ids) == chunk_size:
+            index_products(ids)
+            total += len(ids)
+            ids = []
+    index_products(ids)
+    return total + len(ids)
@@ -0,0 +1,265 @@
+import io
+import random
+from datetime import timedelta
+from decimal import Decimal
+from django.contrib.auth.hashers import make_password
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.utils.timezone import now
+from PIL import Image
+from .models import (
+    CustomUser, Category, Subcategory, Brand, Product, ProductSpecification,
+    ProductImage, Order, OrderItem,
+)
+from .cache import bump_taxonomy
+from .images import derived_formats, make_derivatives
+from .rollups import rebuild_rollups
+from .search import index_products, unindex_products
+
+
+# =============== SEED DATA ===============
+# Synthetic catalog / users / orders for benchmarks and local testing
+# (manage.py seed_data, manage.py bench_endpoints). Seeded rows are tagged:
+#   categories "Seed Category <n>", brands "Seed Brand <n>"
+#   products sku "SEED-<n>", users "seed_<n>", orders "SEED<n>"
+# Row n is built from its own Random(seed, n), so the same --seed gives the
+# same data and a second call only adds rows up to the new totals.
+# Writes are bulk_create (no signals): search index, rollups and the
+# taxonomy version are refreshed here instead. Seeded orders do not take stock.
+# =========================================
+
+SEED_CATEGORIES = 8
+SEED_SUBCATEGORIES = 5  # per category
+SEED_BRANDS = 20
+SEED_SPECS = 6          # per product
+SEED_GALLERY = 2        # gallery rows per product
+SEED_IMAGES = 8         # placeholder files shared by all products
+SEED_PASSWORD = "seed-password"
+SEED_BATCH = 1000
+
+SPEC_VALUES = {
+    "Voltage": ["12V", "24V", "110V", "230V", "415V"],
+    "Current": ["2A", "6A", "10A", "16A", "32A", "63A"],
+    "Power": ["5W", "9W", "18W", "40W", "100W", "1kW"],
+    "Poles": ["1P", "2P", "3P", "4P"],
+    "IP Rating": ["IP20", "IP44", "IP65", "IP67"],
+    "Material": ["PVC", "Copper", "Aluminium", "Polycarbonate", "Steel"],
+    "Colour": ["White", "Black", "Grey", "Red", "Blue"],
+    "Warranty": ["1 year", "2 years", "5 years"],
+}
+NAME_WORDS = [
+    "LED Panel", "MCB", "RCCB", "Isolator", "Contactor", "Cable", "Switch",
+    "Socket", "Floodlight", "Batten", "Relay", "Timer", "Junction Box", "Conduit",
+]
+ORDER_STATUSES = ["Pending", "Accept", "Packed", "Shipped", "Delivered", "Delivered", "Cancelled"]
+PAYMENT_STATUSES = ["Paid", "Paid", "Pending", "COD"]
+
+
+def _rng(seed, kind, n):
+    return random.Random(f"{seed}:{kind}:{n}")
+
+
+def _batches(start, stop, size=SEED_BATCH):
+    for first in range(start, stop, size):
+        yield range(first, min(first + size, stop))
+
+
+# ---------- IMAGES ----------
+def placeholder_images(count=SEED_IMAGES):
+    # solid colour JPEGs under products/seed/, derivatives built once
+    names = []
+    for n in range(count):
+        name = f"products/seed/seed-{n}.jpg"
+        if not default_storage.exists(name):
+            rng = _rng(0, "image", n)
+            colour = tuple(rng.randrange(40, 230) for _ in range(3))
+            buf = io.BytesIO()
+            Image.new("RGB", (800, 800), colour).save(buf, "JPEG", quality=80)
+            name = default_storage.save(name, ContentFile(buf.getvalue()))
+        make_derivatives(name)
+        names.append(name)
+    return names
+
+
+# ---------- TAXONOMY ----------
+def seed_taxonomy():
+    categories = []
+    for c in range(SEED_CATEGORIES):
+        category, _ = Category.objects.get_or_create(name=f"Seed Category {c}")
+        categories.append(category)
+
+    subcategories = []
+    for category in categories:
+        for s in range(SEED_SUBCATEGORIES):
+            sub, _ = Subcategory.objects.get_or_create(category=category, name=f"Seed Sub {s}")
+            subcategories.append(sub)
+
+    brands = []
+    for b in range(SEED_BRANDS):
+        brand, _ = Brand.objects.get_or_create(
+            name=f"Seed Brand {b}", defaults={"category": categories[b % len(categories)]}
+        )
+        brands.append(brand)
+
+    return subcategories, brands
+
+
+# ---------- PRODUCTS ----------
+def seed_products(total, seed=1, images=None):
+    start = Product.objects.filter(sku__startswith="SEED-").count()
+    if start >= total:
+        return 0
+
+    subcategories, brands = seed_taxonomy()
+    images = images or []
+    formats = {name: derived_formats(name) for name in images}
+
+    for batch in _batches(start, total):
+        products, specs, gallery = [], [], []
+        for n in batch:
+            rng = _rng(seed, "product", n)
+            sub = rng.choice(subcategories)
+            stock = rng.choice([0, 5, 25, 100, 500, 5000])
+            products.append(Product(
+                category_id=sub.category_id,
+                subcategory=sub,
+                brand=rng.choice(brands),
+                name=f"{rng.choice(NAME_WORDS)} {rng.choice(SPEC_VALUES['Current'])} {n}",
+                slug=f"seed-{n}",
+                sku=f"SEED-{n}",
+                part_number=f"PN{rng.randrange(10 ** 6, 10 ** 7)}",
+                price=Decimal(rng.randrange(2000, 2000000)) / 100,
+                stock=stock,
+                is_in_stock=stock > 0,
+                short_description=f"Seeded product {n}",
+                description=f"Synthetic product {n} for benchmarks. " * 5,
+                image=rng.choice(images) if images else None,
+                is_active=rng.random() > 0.05,
+            ))
+            products[-1].image_formats = formats.get(products[-1].image.name, "")
+            for key in rng.sample(sorted(SPEC_VALUES), SEED_SPECS):
+                specs.append((len(products) - 1, key, rng.choice(SPEC_VALUES[key])))
+            if images:
+                for g in range(SEED_GALLERY):
+                    gallery.append((len(products) - 1, rng.choice(images), g == 0))
+
+        with transaction.atomic():
+            Product.objects.bulk_create(products)
+            ProductSpecification.objects.bulk_create([
+                ProductSpecification(product=products[i], key=key, value=value)
+                for i, key, value in specs
+            ])
+            ProductImage.objects.bulk_create([
+                ProductImage(
+                    product=products[i], image=name, image_formats=formats[name],
+                    alt_text=products[i].name, is_primary=primary,
+                )
+                for i, name, primary in gallery
+            ])
+            index_products([p.id for p in products])
+
+    bump_taxonomy()
+    return total - start
+
+
+# ---------- USERS ----------
+def seed_users(total, seed=1):
+    start = CustomUser.objects.filter(username__startswith="seed_").count()
+    if start >= total:
+        return 0
+
+    password = make_password(SEED_PASSWORD)  # hashed once, same for every seeded user
+    for batch in _batches(start, total):
+        CustomUser.objects.bulk_create([
+            CustomUser(
+                username=f"seed_{n}",
+                email=f"seed_{n}@example.com",
+                full_name=f"Seed Customer {n}",
+                password=password,
+            )
+            for n in batch
+        ])
+    return total - start
+
+
+# ---------- ORDERS ----------
+def seed_orders(total, seed=1, days=365):
+    start = Order.objects.filter(order_id__startswith="SEED").count()
+    if start >= total:
+        return 0
+
+    user_ids = list(
+        CustomUser.objects.filter(username__startswith="seed_").order_by("id").values_list("id", flat=True)
+    )
+    products = list(
+        Product.objects.filter(sku__startswith="SEED-").order_by("id").values_list("id", "price")
+    )
+    if not user_ids or not products:
+        raise ValueError("Seed users and products first")
+
+    today = now()
+    for batch in _batches(start, total):
+        orders, items, created = [], [], {}
+        for n in batch:
+            rng = _rng(seed, "order", n)
+            lines = rng.sample(products, min(len(products), rng.randint(1, 4)))
+            quantities = [rng.randint(1, 3) for _ in lines]
+            user_id = rng.choice(user_ids)
+            orders.append(Order(
+                user_id=user_id,
+                order_id=f"SEED{n}",
+                customer_name=f"Seed Customer {user_id}",
+                customer_email=f"customer{user_id}@example.com",
+                contact_number=f"9{rng.randrange(10 ** 8, 10 ** 9)}",
+                total_amount=sum(price * q for (_, price), q in zip(lines, quantities)),
+                qty=sum(quantities),
+                payment_status=rng.choice(PAYMENT_STATUSES),
+                order_status=rng.choice(ORDER_STATUSES),
+                address=f"{n} Seed Street, Sector {n % 50}, Seed City",
+            ))
+            items.append([(pid, price, q) for (pid, price), q in zip(lines, quantities)])
+            created.setdefault(rng.randrange(days), []).append(len(orders) - 1)
+
+        with transaction.atomic():
+            Order.objects.bulk_create(orders)
+            OrderItem.objects.bulk_create([
+                OrderItem(order=order, product_id=pid, price=price, quantity=q)
+                for order, lines in zip(orders, items)
+                for pid, price, q in lines
+            ])
+            # created_at is auto_now_add, spread it out afterwards (one UPDATE per day)
+            for days_ago, indexes in created.items():
+                Order.objects.filter(id__in=[orders[i].id for i in indexes]).update(
+                    created_at=today - timedelta(days=days_ago)
+                )
+
+    rebuild_rollups()
+    return total - start
+
+
+def seed_data(products=0, users=0, orders=0, seed=1, images=True):
+    # grows the seeded data up to the given totals -> rows created per kind
+    names = placeholder_images() if images and products else []
+    return {
+        "products": seed_products(products, seed=seed, images=names),
+        "users": seed_users(users, seed=seed),
+        "orders": seed_orders(orders, seed=seed),
+    }
+
+
+def clear_seed_data():
+    with transaction.atomic():
+        product_ids = list(Product.objects.filter(sku__startswith="SEED-").values_list("id", flat=True))
+        deleted = {
+            "orders": Order.objects.filter(order_id__startswith="SEED").delete()[1].get(Order._meta.label, 0),
+            "products": len(product_ids),
+            "users": CustomUser.objects.filter(username__startswith="seed_").count(),
+        }
+        unindex_products(product_ids)
+        Product.objects.filter(sku__startswith="SEED-").delete()
+        CustomUser.objects.filter(username__startswith="seed_").delete()
+        Brand.objects.filter(name__startswith="Seed Brand ").delete()
+        Category.objects.filter(name__startswith="Seed Category ").delete()
+        rebuild_rollups()
+    return deleted
@@ -0,0 +1,91 @@
+from django.db import transaction
+from django.db.models.signals import post_save, pre_delete, post_delete
+from django.dispatch import receiver
+from .models import (
+    Category, Subcategory, Brand, Product, ProductSpecification, ProductImage, ProductReview, Order,
+)
+from .cache import bump_taxonomy, bump_product, retire_product
+from .search import index_products, unindex_products
+from .images import make_derivatives
+from .ratings import record_rating_changes
+from .rollups import record_order_deleted
+
+
+# ---------- TAXONOMY : any category / subcategory / brand write ----------
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Subcategory)
+@receiver(post_delete, sender=Subcategory)
+@receiver(post_save, sender=Brand)
+@receiver(post_delete, sender=Brand)
+def taxonomy_changed(sender, **kwargs):
+    transaction.on_commit(bump_taxonomy)
+
+
+# ---------- SEARCH INDEX + DETAIL CACHE : product + its specifications ----------
+# The index is written in the transaction, cache versions are bumped after
+# commit: a reader rebuilding a payload in between would otherwise cache
+# pre-commit data under the new version.
+def bump_after_commit(product_id):
+    transaction.on_commit(lambda: bump_product(product_id))
+
+
+@receiver(post_save, sender=Product)
+def product_saved(sender, instance, **kwargs):
+    index_products([instance.id])
+    bump_after_commit(instance.id)
+    if instance.image_changed():
+        name = instance.image.name
+        transaction.on_commit(lambda: make_derivatives(name))
+
+
+@receiver(post_delete, sender=Product)
+def product_deleted(sender, instance, **kwargs):
+    unindex_products([instance.id])
+    product_id = instance.id
+    transaction.on_commit(lambda: retire_product(product_id))
+
+
+@receiver(post_save, sender=ProductSpecification)
+@receiver(post_delete, sender=ProductSpecification)
+def specification_changed(sender, instance, **kwargs):
+    index_products([instance.product_id])
+    bump_after_commit(instance.product_id)
+
+
+# ---------- PRODUCT DETAIL CACHE : gallery images ----------
+@receiver(post_save, sender=ProductImage)
+@receiver(post_delete, sender=ProductImage)
+def image_changed(sender, instance, **kwargs):
+    bump_after_commit(instance.product_id)
+
+
+# ---------- RATINGS : approved review deleted (user / admin delete, cascades) ----------
+@receiver(post_delete, sender=ProductReview)
+def review_deleted(sender, instance, **kwargs):
+    if instance.status == "approved":
+        record_rating_changes([(instance.product_id, instance.rating, -1)], create=False)
+        bump_after_commit(instance.product_id)
+
+
+# ---------- IMAGE DERIVATIVES : resized WebP / AVIF copies of new uploads ----------
+# Other edits (price, alt text, ...) queue nothing, existing files are covered
+# by manage.py build_image_derivatives.
+@receiver(post_save, sender=ProductImage)
+def image_saved(sender, instance, **kwargs):
+    if instance.image_changed():
+        name = instance.image.name
+        transaction.on_commit(lambda: make_derivatives(name))
+
+
+# ---------- SALES ROLLUP : deleted orders (admin / shell deletes, user delete cascades) ----------
+# Items are read before the delete (the cascade removes them before the order),
+# the rollup rows are updated after it, both inside the delete transaction.
+@receiver(pre_delete, sender=Order)
+def order_deleting(sender, instance, **kwargs):
+    instance._rollup_items = list(instance.items.values_list("product_id", "quantity", "price"))
+
+
+@receiver(post_delete, sender=Order)
+def order_deleted(sender, instance, **kwargs):
+    record_order_deleted(instance, getattr(instance, "_rollup_items", []))
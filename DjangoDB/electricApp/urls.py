@@ -1,5 +1,6 @@
 from django.urls import path
 from . import views
+from .metrics import metrics_view
 from userApp.views import *
 
 #  Admin site API'S GET and POST
@@ -22,19 +23,26 @@ urlpatterns = [
 
     path("products/", views.products_list),# GET DATA
     path("products/add/", views.add_product),
-    path("products/<int:pk>/", views.product_detail),
+    path("products/bulk-update/", views.product_bulk_update),
+    path("products/import/", views.product_import),
+    path("products/export/", views.product_export),
+    path("products/<int:id>/", views.product_detail),
     path("products/update/<int:pk>/", views.product_update),
     path("products/delete/<int:pk>/", views.delete_product), 
    
  
     path("orders/", views.admin_orders),# GET DATA
+    path("orders/parcel-labels/", views.parcel_labels),
+    path("orders/<int:id>/", views.admin_order_detail),
     path("orders/<int:id>/status/", views.update_order_status),
     path("orders/<int:id>/parcel-label/", views.download_parcel_label),
 
     path("admin/reviews/", admin_reviews),
     path("admin/reviews/<int:id>/status/", update_review_status),
+    path("admin/reviews/batch-status/", review_batch_status),
  
 
+    path("metrics/", metrics_view),
     path("dashboard/overview/", views.dashboard_overview),
     path("reports/accounting/dashboard/", views.accounting_dashboard),
     path("reports/accounting/export-csv/", views.accounting_export_csv),
@@ -42,5 +50,8 @@ urlpatterns = [
     path("reports/orders/dashboard/", views.orders_dashboard),
     path("reports/orders/export-csv/", views.orders_export_csv),
     path("reports/orders/export-pdf/", views.orders_export_pdf),
+    path("reports/jobs/", views.export_jobs),
+    path("reports/jobs/<int:id>/", views.export_job_detail),
+    path("reports/jobs/<int:id>/download/", views.export_job_download),
 
 ]
\ No newline at end of file
@@ -6,23 +6,37 @@ from django.contrib.auth import authenticate
 from rest_framework_simplejwt.tokens import RefreshToken
 from django.shortcuts import get_object_or_404
 from rest_framework import status
-from reportlab.lib.pagesizes import A6,A4
-from reportlab.pdfgen import canvas
-from reportlab.lib.units import mm
-from django.http import HttpResponse
-from reportlab.graphics.barcode import code128
-from reportlab.lib.utils import ImageReader
-import qrcode
+from django.http import HttpResponse, FileResponse, StreamingHttpResponse
 import csv
-import io
 import json
-import random
+import tempfile
 from django.utils.text import slugify
-from datetime import timedelta
-from django.db.models import Sum
-from django.utils.timezone import now
-from decimal import Decimal
+from datetime import datetime, timedelta
+from django.db.models import Sum, Count, Min, Max, Q
+from django.db.models.functions import TruncMonth
+from django.db import transaction
+from django.utils.timezone import now, make_aware
+from django.utils.dateparse import parse_date
+from decimal import Decimal, InvalidOperation
 from .models import *
+from .cache import taxonomy_response, product_detail_response, cached_for
+from .search import filter_matches, ranked_ids
+from .orders import OrderError, merge_items, place_order, place_cart_order
+from .holds import available_stock
+from .rollups import record_status_change
+from .jobs import clean_params
+from .exports import (
+    month_bounds, stream_csv, accounting_csv_rows, orders_csv_rows,
+    write_accounting_pdf, write_orders_pdf,
+)
+from .images import image_fields
+from .ratings import rating_payload
+from .catalog import (
+    RowError, bulk_update_items, bulk_update_filtered,
+    import_format, read_rows, import_products,
+    export_products, export_csv_rows, export_jsonl_lines,
+)
+from .labels import LABEL_BATCH_MAX, write_parcel_labels, open_cached_label, invalidate_labels
 
 
 # =============== HERE IS CODE SEQUENCE ===============
@@ -45,28 +59,40 @@ from .models import *
 
 # PRODUCTS
 # add_product               → Admin: create product with images & specs
-# products_list             → List all products
+# products_list             → List products (optional ?fields= / ?limit=&cursor=)
+# product_search            → Storefront search (index + filters + facets)
 # product_detail            → Single product details
+# product_stock             → Live available stock (?ids=, stock minus holds)
 # product_update            → Admin: update product
 # delete_product            → Admin: delete product
+# product_bulk_update       → Admin: price / stock / active for many products at once
+# product_import            → Admin: CSV / JSONL upsert on sku (see catalog.py)
+# product_export            → Admin: all products as CSV / JSONL (?file_format=, streamed)
 
 # ORDERS
 # create_order              → Create new order
-# admin_orders              → Admin: list all orders
+# checkout_cart             → Create order from the user's cart (cart cleared)
+# admin_orders              → Admin: list orders (filters, sort, ?page= compact rows)
 # update_order_status       → Admin: update order status
-# admin_order_detail        → Admin: order details
-# download_parcel_label     → Generate parcel label PDF
+# admin_order_detail        → Admin: single order with items
+# download_parcel_label     → Parcel label PDF (cached on disk, see labels.py)
+# parcel_labels             → Admin: one PDF with labels for ?ids= / ?status= orders
 
-# ACCOUNTING
+# ACCOUNTING  (reports read the DailySales / DailyProductSales rollup, see rollups.py)
 # accounting_dashboard      → Sales & profit dashboard
-# accounting_export_csv     → Export accounting CSV
+# accounting_export_csv     → Export accounting CSV (streamed)
 # accounting_export_pdf     → Export accounting PDF
 
 # ORDERS ANALYTICS
 # orders_dashboard          → Orders KPIs & charts
-# orders_export_csv         → Orders CSV export
+# orders_export_csv         → Orders CSV export (streamed, ?status=)
 # orders_export_pdf         → Orders PDF export
 
+# EXPORT JOBS  (run by manage.py run_export_jobs, see jobs.py)
+# export_jobs               → Admin: list jobs | POST: queue an export
+# export_job_detail         → Admin: job status
+# export_job_download       → Admin: finished export file
+
 # MAIN DASHBOARD
 # dashboard_overview        → Complete admin dashboard overview
 # ================================================
@@ -240,14 +266,7 @@ def categories(request):
             status=status.HTTP_403_FORBIDDEN
         )
 
-    data = []
-    for cat in Category.objects.all():
-        data.append({
-            "id": cat.id,
-            "name": cat.name,
-        })
-
-    return Response({"data": data})
+    return taxonomy_response(request, "categories")
 
 
 @api_view(['GET', 'POST'])
@@ -272,17 +291,7 @@ def add_subcategory(request):
                 status=status.HTTP_403_FORBIDDEN
             )
 
-        data = []
-        for sub in Subcategory.objects.select_related('category').all():
-            data.append({
-                "id": sub.id,
-                "name": sub.name,
-                "category": {
-                    "id": sub.category.id,
-                    "name": sub.category.name
-                }
-            })
-        return Response({'data':data})
+        return taxonomy_response(request, "subcategories")
 
 
     # ---------- POST : add subcategory ----------
@@ -421,17 +430,7 @@ def get_brands(request):
                 {"error": "Unauthorized"},
                 status=status.HTTP_403_FORBIDDEN
             )
-        data = []
-        for brd in Brand.objects.select_related('category').all():
-            data.append({
-                "id": brd.id,
-                "name": brd.name,
-                "category": {
-                    "id": brd.category.id,
-                    "name": brd.category.name
-                }
-            })
-        return Response({'data':data})
+        return taxonomy_response(request, "brands")
     
 @api_view(["DELETE"])
 @permission_classes([IsAuthenticated])
@@ -532,74 +531,206 @@ def add_product(request):
     except Exception as e:
         return Response({"error": str(e)}, status=500)
 
+# ---------- PRODUCT LIST : fields + cursor ----------
+# public field name -> columns needed from Product (single joined query)
+PRODUCT_LIST_FIELDS = {
+    "id": ("id",),
+    "name": ("name",),
+    "price": ("price",),
+    "stock": ("stock",),
+    "is_active": ("is_active",),
+    "create_at": ("created_at",),
+    "category": ("category_id", "category__name"),
+    "subcategory": ("subcategory_id", "subcategory__name"),
+    "image": ("image", "image_formats"),
+    "rating": ("rating__avg", "rating__count"),  # ProductRating join, see ratings.py
+}
+PRODUCT_LIST_MAX_LIMIT = 100
+
+
+def product_list_row(row, fields):
+    data = {}
+    for field in fields:
+        if field == "create_at":
+            data[field] = row["created_at"]
+        elif field == "category":
+            data[field] = {
+                "id": row["category_id"],
+                "name": row["category__name"]
+            }
+        elif field == "subcategory":
+            data[field] = {
+                "id": row["subcategory_id"],
+                "name": row["subcategory__name"]
+            }
+        elif field == "rating":
+            data[field] = rating_payload(row["rating__avg"], row["rating__count"])
+        elif field == "image":
+            # sized WebP + srcset, see images.py
+            data.update(image_fields(row["image"], formats=row["image_formats"]))
+        else:
+            data[field] = row[field]
+    return data
+
+
 @api_view(["GET"])
 def products_list(request):
+    # ?fields=id,name,price  -> only these keys (and columns) are returned
+    fields_param = request.GET.get("fields")
+    if fields_param:
+        fields = [f.strip() for f in fields_param.split(",") if f.strip()]
+        unknown = [f for f in fields if f not in PRODUCT_LIST_FIELDS]
+        if unknown:
+            return Response(
+                {"error": f"Unknown fields: {', '.join(unknown)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+    else:
+        fields = list(PRODUCT_LIST_FIELDS)
 
-    products = Product.objects.select_related("category").all().order_by("-id")
-    data = []
-    for p in products:
-            data.append({
-                "id": p.id,
-                "name": p.name,
-                "price": p.price,
-                "stock": p.stock,
-                "is_active": p.is_active,
-                "create_at":p.created_at,
-                "category": {
-                    "id": p.category.id,
-                    "name": p.category.name
-                },
-                 "subcategory": {
-                    "id": p.subcategory.id,
-                    "name": p.subcategory.name
-                },
-                "image": p.image.url if p.image else None,
-            })
+    columns = {"id"}
+    for f in fields:
+        columns.update(PRODUCT_LIST_FIELDS[f])
 
-    return Response({"data": data})
+    products = Product.objects.order_by("-id").values(*columns)
+
+    # ---------- LEGACY : full list when no limit / cursor ----------
+    limit = request.GET.get("limit")
+    cursor = request.GET.get("cursor")
+    if limit is None and cursor is None:
+        return Response({"data": [product_list_row(p, fields) for p in products]})
+
+    # ---------- KEYSET PAGE : id < cursor ----------
+    try:
+        limit = min(int(limit or 20), PRODUCT_LIST_MAX_LIMIT)
+        if limit <= 0:
+            raise ValueError
+        if cursor:
+            products = products.filter(id__lt=int(cursor))
+    except ValueError:
+        return Response(
+            {"error": "limit and cursor must be positive numbers"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    rows = list(products[:limit + 1])
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    return Response({
+        "data": [product_list_row(p, fields) for p in rows],
+        "next_cursor": rows[-1]["id"] if has_more else None,
+    })
 
 @api_view(["GET"])
-def product_detail(request, id):
-    product = get_object_or_404(Product, id=id)
+@permission_classes([AllowAny])
+def product_search(request):
+    query = request.GET.get("q", "").strip()
+    products = Product.objects.filter(is_active=True)
 
-    specs = [
-        {"key": s.key, "value": s.value}
-        for s in product.specifications.all()
-    ]
+    # ---------- FILTERS ----------
+    # facet filters are kept apart: each facet is counted without its own filter
+    facet_filters = {}
+    try:
+        for key in ("category", "subcategory", "brand"):
+            if request.GET.get(key):
+                facet_filters[key] = Q(**{f"{key}_id": int(request.GET[key])})
+        price_filter = Q()
+        if request.GET.get("min_price"):
+            price_filter &= Q(price__gte=Decimal(request.GET["min_price"]))
+        if request.GET.get("max_price"):
+            price_filter &= Q(price__lte=Decimal(request.GET["max_price"]))
+        if price_filter:
+            facet_filters["price"] = price_filter
+
+        limit = min(int(request.GET.get("limit", 20)), PRODUCT_LIST_MAX_LIMIT)
+        offset = int(request.GET.get("offset", 0))
+        if limit <= 0 or offset < 0:
+            raise ValueError
+    except (ValueError, InvalidOperation):
+        return Response(
+            {"error": "Invalid filter or paging value"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
 
-    images = [
-        {
-            "id": img.id,
-            "url": img.image.url,
-            "is_primary": img.is_primary
-        }
-        for img in product.images.all()
-    ]
+    if request.GET.get("in_stock", "").lower() == "true":
+        products = products.filter(stock__gt=0)
+
+    # ---------- MATCH + RANK (search index) ----------
+    matched = filter_matches(products, query)
+
+    def narrowed(skip=None):
+        result = matched
+        for key, condition in facet_filters.items():
+            if key != skip:
+                result = result.filter(condition)
+        return result
+
+    products = narrowed()
+    total = products.count()
+    ids = ranked_ids(products, query, limit, offset)
+
+    fields = list(PRODUCT_LIST_FIELDS)
+    columns = {"id"}
+    for f in fields:
+        columns.update(PRODUCT_LIST_FIELDS[f])
+    rows = {
+        r["id"]: r
+        for r in Product.objects.filter(id__in=ids).values(*columns)
+    }
 
-    data = {
-        "id": product.id,
-        "name": product.name,
-        "price": product.price,
-        "stock": product.stock,
-        "sku":product.sku,
-        "part_number": product.part_number,
-        "is_active": product.is_active,
-        "category": {
-            "id": product.category.id,
-            "name": product.category.name
-        },
-        "subcategory": {
-            "id": product.subcategory.id,
-            "name": product.subcategory.name
+    # ---------- FACETS ----------
+    def facet(key):
+        id_field, name_field = f"{key}_id", f"{key}__name"
+        return [
+            {"id": f[id_field], "name": f[name_field], "count": f["count"]}
+            for f in (
+                narrowed(skip=key).filter(**{f"{id_field}__isnull": False})
+                .values(id_field, name_field)
+                .annotate(count=Count("id", distinct=True))
+                .order_by("-count")
+            )
+        ]
+
+    price = narrowed(skip="price").aggregate(min=Min("price"), max=Max("price"))
+
+    return Response({
+        "query": query,
+        "count": total,
+        "data": [product_list_row(rows[i], fields) for i in ids if i in rows],
+        "facets": {
+            "category": facet("category"),
+            "subcategory": facet("subcategory"),
+            "brand": facet("brand"),
+            "price": price,
         },
-        "description": product.description,
-        "specifications": specs,
-        "short_description":product.short_description,
-        "datasheet_url": product.datasheet_url,
-        "images": images,
-    }
+    })
+
+@api_view(["GET"])
+def product_detail(request, id):
+    # cached per product, invalidated by product / spec / image signals
+    return product_detail_response(request, id)
+
+
+STOCK_IDS_MAX = 100
+
 
-    return Response(data)
+@api_view(["GET"])
+def product_stock(request):
+    # ?ids=1,2,3 -> {"stock": {"1": available}}, live (not cached): stock minus
+    # other shoppers' active holds, polled by product / cart pages during sales
+    try:
+        ids = [int(i) for i in request.GET.get("ids", "").split(",") if i.strip()]
+    except ValueError:
+        return Response({"error": "ids must be numbers"}, status=status.HTTP_400_BAD_REQUEST)
+    if not ids or len(ids) > STOCK_IDS_MAX:
+        return Response(
+            {"error": f"Give 1 to {STOCK_IDS_MAX} product ids"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    user = request.user if request.user.is_authenticated else None
+    return Response({"stock": {str(pid): qty for pid, qty in available_stock(ids, user).items()}})
 
 @api_view(['PUT'])
 @permission_classes([IsAuthenticated])
@@ -628,127 +759,237 @@ def delete_product(request, pk):
 
     return Response({"message": "Product deleted successfully"})
 
-def generate_order_id():
-    return f"ORD{random.randint(100000000, 9999999999)}"
 
 @api_view(["POST"])
 @permission_classes([IsAuthenticated])
-def create_order(request):
-    user = request.user
+def product_bulk_update(request):
+    if request.user.role != "admin":
+        return Response(
+            {"error": "Admin role required"},
+            status=status.HTTP_403_FORBIDDEN
+        )
 
-    customer_name = request.data.get("customer_name")
-    customer_email = request.data.get("customer_email")
-    contact_number = request.data.get('contact_number')
-    payment_status = request.data.get("payment_status", "Pending")
-    address = request.data.get("address", "-")
+    # {"items": [{"id", "price", "stock", "is_active"}, ...]}
+    # or {"filter": {"brand": 3}, "patch": {"price_percent": 5}}  (see catalog.py)
     items = request.data.get("items")
+    try:
+        if items is not None:
+            result = bulk_update_items(items)
+        else:
+            result = bulk_update_filtered(request.data.get("filter"), request.data.get("patch"))
+    except RowError as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
-    # ---------- BASIC VALIDATION ----------
-    if not customer_name:
-        return Response(
-            {"error": "Customer name is required"},
-            status=status.HTTP_400_BAD_REQUEST
-        )
+    return Response({"message": "Products updated", **result})
 
-    if not items or not isinstance(items, list):
+
+@api_view(["POST"])
+@permission_classes([IsAuthenticated])
+def product_import(request):
+    if request.user.role != "admin":
         return Response(
-            {"error": "Items must be a non-empty list"},
-            status=status.HTTP_400_BAD_REQUEST
+            {"error": "Admin role required"},
+            status=status.HTTP_403_FORBIDDEN
         )
 
-    # ---------- MERGE SAME PRODUCT IDS ----------
-    merged_items = {}
-    for item in items:
-        product_id = item.get("product_id")
-        quantity = item.get("quantity")
+    upload = request.FILES.get("file")
+    if not upload:
+        return Response({"error": "file is required"}, status=status.HTTP_400_BAD_REQUEST)
 
-        if not product_id or not quantity:
-            return Response(
-                {"error": "Each item must have product_id and quantity"},
-                status=status.HTTP_400_BAD_REQUEST
-            )
-
-        try:
-            quantity = int(quantity)
-            if quantity <= 0:
-                raise ValueError
-        except ValueError:
-            return Response(
-                {"error": "Quantity must be a positive number"},
-                status=status.HTTP_400_BAD_REQUEST
-            )
+    try:
+        fmt = import_format(upload.name, request.data.get("file_format"))
+    except ValueError as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
-        # merge quantity if same product_id
-        merged_items[product_id] = merged_items.get(product_id, 0) + quantity
+    dry_run = str(request.data.get("dry_run")).lower() == "true"
+    try:
+        report = import_products(read_rows(upload.file, fmt), dry_run=dry_run)
+    except UnicodeDecodeError:
+        return Response({"error": "File must be UTF-8"}, status=status.HTTP_400_BAD_REQUEST)
+    except csv.Error as e:
+        return Response({"error": f"Invalid CSV: {e}"}, status=status.HTTP_400_BAD_REQUEST)
 
-    total_amount = 0
-    total_qty = 0
-    order_items_data = []
+    return Response(report)
 
-    # ---------- VALIDATE PRODUCTS + STOCK ----------
-    for product_id, quantity in merged_items.items():
-        try:
-            product = Product.objects.get(id=product_id, is_active=True)
-        except Product.DoesNotExist:
-            return Response(
-                {"error": f"Product with id {product_id} not found"},
-                status=status.HTTP_404_NOT_FOUND
-            )
 
-        if product.stock < quantity:
-            return Response(
-                {"error": f"Insufficient stock for {product.name}"},
-                status=status.HTTP_400_BAD_REQUEST
-            )
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def product_export(request):
+    if request.user.role != "admin":
+        return Response(
+            {"error": "Admin role required"},
+            status=status.HTTP_403_FORBIDDEN
+        )
 
-        item_total = product.price * quantity
-        total_amount += item_total
-        total_qty += quantity
+    # not ?format=, DRF reads that one for renderer selection
+    try:
+        fmt = import_format("", request.GET.get("file_format", "csv"))
+    except ValueError as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
-        order_items_data.append({
-            "product": product,
-            "price": product.price,
-            "quantity": quantity
-        })
+    if fmt == "csv":
+        return stream_csv(export_csv_rows(export_products()), "products.csv")
 
-    # ---------- CREATE ORDER ----------
-    order = Order.objects.create(
-        user=user,
-        order_id=generate_order_id(),
-        customer_name=customer_name,
-        customer_email=customer_email,
-        total_amount=total_amount,
-        contact_number = contact_number,
-        qty=total_qty,
-        payment_status=payment_status,
-        order_status="Pending",
-        address=address
+    response = StreamingHttpResponse(
+        export_jsonl_lines(export_products()),
+        content_type="application/x-ndjson"
     )
+    response["Content-Disposition"] = 'attachment; filename="products.jsonl"'
+    return response
 
-    # ---------- CREATE ORDER ITEMS ----------
-    for data in order_items_data:
-        OrderItem.objects.create(
-            order=order,
-            product=data["product"],
-            price=data["price"],
-            quantity=data["quantity"]
-        )
+def order_fields(request):
+    # customer / delivery fields shared by create_order and checkout_cart
+    return {
+        "customer_name": request.data.get("customer_name"),
+        "customer_email": request.data.get("customer_email"),
+        "contact_number": request.data.get("contact_number"),
+        "payment_status": request.data.get("payment_status", "Pending"),
+        "address": request.data.get("address", "-"),
+    }
 
-        # reduce stock
-        product = data["product"]
-        product.stock -= data["quantity"]
-        product.save(update_fields=["stock"])
 
+def order_created(order):
     return Response(
         {
             "message": "Order created successfully",
             "order_id": order.order_id,
-            "total_amount": float(total_amount),
-            "total_qty": total_qty
+            "total_amount": float(order.total_amount),
+            "total_qty": order.qty
         },
         status=status.HTTP_201_CREATED
     )
 
+
+@api_view(["POST"])
+@permission_classes([IsAuthenticated])
+def create_order(request):
+    user = request.user
+    fields = order_fields(request)
+    items = request.data.get("items")
+
+    # ---------- BASIC VALIDATION ----------
+    if not fields["customer_name"]:
+        return Response(
+            {"error": "Customer name is required"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    # ---------- MERGE + PLACE (one transaction, see orders.py) ----------
+    try:
+        merged_items = merge_items(items)
+        order = place_order(user, merged_items, **fields)
+    except OrderError as e:
+        return Response({"error": e.message}, status=e.status_code)
+
+    return order_created(order)
+
+
+@api_view(["POST"])
+@permission_classes([IsAuthenticated])
+def checkout_cart(request):
+    # order from the user's Cart rows, cart cleared in the same transaction
+    fields = order_fields(request)
+
+    if not fields["customer_name"]:
+        return Response(
+            {"error": "Customer name is required"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    try:
+        order = place_cart_order(request.user, **fields)
+    except OrderError as e:
+        return Response({"error": e.message}, status=e.status_code)
+
+    return order_created(order)
+
+# ---------- ADMIN ORDERS : filters / sort / paging ----------
+ORDER_SORTS = {
+    "newest": ("-created_at", "-id"),
+    "oldest": ("created_at", "id"),
+    "total_desc": ("-total_amount", "-id"),
+    "total_asc": ("total_amount", "id"),
+}
+ORDER_PAGE_MAX = 100
+
+
+def filter_orders(request, orders):
+    # ?status= &payment= &date_from=YYYY-MM-DD &date_to=YYYY-MM-DD &customer=
+    # raises ValueError on a bad date
+    order_status = request.GET.get("status")
+    payment = request.GET.get("payment")
+    date_from = request.GET.get("date_from")
+    date_to = request.GET.get("date_to")
+    customer = request.GET.get("customer")
+
+    if order_status:
+        orders = orders.filter(order_status=order_status)
+    if payment:
+        orders = orders.filter(payment_status=payment)
+
+    # whole-day bounds on created_at so the index is used (no __date cast)
+    if date_from:
+        day = parse_date(date_from)
+        if not day:
+            raise ValueError
+        orders = orders.filter(created_at__gte=make_aware(datetime.combine(day, datetime.min.time())))
+    if date_to:
+        day = parse_date(date_to)
+        if not day:
+            raise ValueError
+        orders = orders.filter(created_at__lt=make_aware(datetime.combine(day + timedelta(days=1), datetime.min.time())))
+
+    if customer:
+        orders = orders.filter(
+            Q(customer_name__icontains=customer)
+            | Q(customer_email__icontains=customer)
+            | Q(order_id__icontains=customer)
+        )
+    return orders
+
+
+def admin_order_row(request, o):
+    items_data = []
+    total_qty = 0
+    product_image = None
+
+    for item in o.items.all():
+        total_qty += item.quantity
+
+        # first product image for preview
+        image = image_fields(item.product.image.name, request, formats=item.product.image_formats)["image"]
+        if not product_image and image:
+            product_image = image
+
+        items_data.append({
+            "product_id": item.product.id,
+            "product_name": item.product.name,
+            "price": float(item.price),
+            "quantity": item.quantity,
+            "image": image
+        })
+
+    return {
+        "id": o.id,
+        "order_id": o.order_id,
+
+        "customer": o.customer_name,
+        "customer_email": o.customer_email,
+        "address": o.address,
+
+        "total": float(o.total_amount),
+        "total_qty": total_qty,
+
+        "payment_status": o.payment_status,
+        "status": o.order_status,
+
+        "product_image": product_image,  # order thumbnail
+        "date": o.created_at.strftime("%d %b %Y"),
+
+        "items": items_data
+    }
+
+
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
 def admin_orders(request):
@@ -758,62 +999,87 @@ def admin_orders(request):
             status=status.HTTP_403_FORBIDDEN
         )
 
-    # Prefetch items + products (PERFORMANCE FIX)
-    orders = (
-        Order.objects
-        .prefetch_related("items__product")
-        .order_by("-created_at")
-    )
+    sort = request.GET.get("sort", "newest")
+    if sort not in ORDER_SORTS:
+        return Response(
+            {"error": f"sort must be one of {', '.join(ORDER_SORTS)}"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
 
-    data = []
+    try:
+        orders = filter_orders(request, Order.objects.order_by(*ORDER_SORTS[sort]))
+    except ValueError:
+        return Response(
+            {"error": "Dates must be YYYY-MM-DD"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
 
-    for o in orders:
-        items_data = []
-        total_qty = 0
-        product_image = None
-
-        for item in o.items.all():
-            total_qty += item.quantity
-
-            # first product image for preview
-            if not product_image and item.product.image:
-                product_image = request.build_absolute_uri(item.product.image.url)
-
-            items_data.append({
-                "product_id": item.product.id,
-                "product_name": item.product.name,
-                "price": float(item.price),
-                "quantity": item.quantity,
-                "image": (
-                    request.build_absolute_uri(item.product.image.url)
-                    if item.product.image else None
-                )
-            })
+    # ---------- LEGACY : full list with items when no page ----------
+    if "page" not in request.GET:
+        # Prefetch items + products (PERFORMANCE FIX)
+        orders = orders.prefetch_related("items__product")
+        data = [admin_order_row(request, o) for o in orders]
+        return Response({
+            "count": len(data),
+            "data": data
+        })
 
-        data.append({
-            "id": o.id,
-            "order_id": o.order_id,
+    # ---------- PAGE : compact rows, items via orders/<id>/ ----------
+    try:
+        page = int(request.GET.get("page", 1))
+        page_size = min(int(request.GET.get("page_size", 20)), ORDER_PAGE_MAX)
+        if page < 1 or page_size < 1:
+            raise ValueError
+    except ValueError:
+        return Response(
+            {"error": "page and page_size must be positive numbers"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
 
-            "customer": o.customer_name,
-            "customer_email": o.customer_email,
-            "address": o.address,
+    total = orders.count()
+    offset = (page - 1) * page_size
+    rows = orders.values(
+        "id", "order_id", "customer_name", "customer_email", "total_amount",
+        "qty", "payment_status", "order_status", "created_at"
+    )[offset:offset + page_size]
 
-            "total": float(o.total_amount),
-            "total_qty": total_qty,
+    return Response({
+        "count": total,
+        "page": page,
+        "page_size": page_size,
+        "num_pages": (total + page_size - 1) // page_size,
+        "data": [
+            {
+                "id": o["id"],
+                "order_id": o["order_id"],
+                "customer": o["customer_name"],
+                "customer_email": o["customer_email"],
+                "total": float(o["total_amount"]),
+                "total_qty": o["qty"],
+                "payment_status": o["payment_status"],
+                "status": o["order_status"],
+                "date": o["created_at"].strftime("%d %b %Y"),
+            }
+            for o in rows
+        ]
+    })
 
-            "payment_status": o.payment_status,
-            "status": o.order_status,
 
-            "product_image": product_image,  # order thumbnail
-            "date": o.created_at.strftime("%d %b %Y"),
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def admin_order_detail(request, id):
+    if request.user.role != "admin":
+        return Response(
+            {"error": "Admin role required"},
+            status=status.HTTP_403_FORBIDDEN
+        )
 
-            "items": items_data
-        })
+    try:
+        order = Order.objects.prefetch_related("items__product").get(id=id)
+    except Order.DoesNotExist:
+        return Response({"error": "Order not found"}, status=404)
 
-    return Response({
-        "count": len(data),
-        "data": data
-    })
+    return Response({"data": admin_order_row(request, order)})
 
 @api_view(["PUT"])
 @permission_classes([IsAuthenticated])
@@ -824,10 +1090,25 @@ def update_order_status(request, id):
             status=status.HTTP_400_BAD_REQUEST
         )
 
-    status = request.data.get("status")
-    order = Order.objects.get(id=id)
-    order.order_status = status
-    order.save()
+    new_status = request.data.get("status")
+    if new_status not in dict(Order.ORDER_STATUS):
+        return Response(
+            {"error": "Invalid order status"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    # lock the row so the rollup sees the real old status
+    with transaction.atomic():
+        try:
+            order = Order.objects.select_for_update().get(id=id)
+        except Order.DoesNotExist:
+            return Response({"error": "Order not found"}, status=404)
+
+        old_status = order.order_status
+        order.order_status = new_status
+        order.save(update_fields=["order_status"])
+        record_status_change(order, old_status, new_status)
+        transaction.on_commit(lambda: invalidate_labels(order.id))
 
     return Response({"message": "Order status updated"})
 
@@ -851,10 +1132,7 @@ def client_order_detail(request):
                 "product": i.product.name,
                 "price": float(i.price),
                 "quantity": i.quantity,
-                "image": (
-                    request.build_absolute_uri(i.product.image.url)
-                    if i.product.image else None
-                )
+                "image": image_fields(i.product.image.name, request, formats=i.product.image_formats)["image"]
             })
 
         data.append({
@@ -882,91 +1160,70 @@ def download_parcel_label(request, id):
     except Order.DoesNotExist:
         return Response({"error": "Order not found"}, status=404)
 
-    response = HttpResponse(content_type="application/pdf")
-    response["Content-Disposition"] = (
-        f'attachment; filename="parcel_{order.order_id}.pdf"'
+    # rendered once per label content, repeats are a plain file serve
+    return FileResponse(
+        open_cached_label(order),
+        as_attachment=True,
+        filename=f"parcel_{order.order_id}.pdf",
+        content_type="application/pdf"
     )
 
-    c = canvas.Canvas(response, pagesize=A6)
-    width, height = A6
-
-    x_margin = 6 * mm
-    y = height - 10 * mm
-
-    def text(txt, size=9, bold=False):
-        nonlocal y
-        font = "Helvetica-Bold" if bold else "Helvetica"
-        c.setFont(font, size)
-        c.drawString(x_margin, y, txt)
-        y -= 4.5 * mm
-
-    # ================= HEADER =================
-    c.setFillColorRGB(0.1, 0.1, 0.1)
-    c.rect(0, height - 18 * mm, width, 18 * mm, fill=1)
-    c.setFillColorRGB(1, 1, 1)
-    c.setFont("Helvetica-Bold", 12)
-    c.drawCentredString(width / 2, height - 12 * mm, "PARCEL SHIPPING LABEL")
-    c.setFillColorRGB(0, 0, 0)
-
-    y = height - 24 * mm
-
-    # ================= DATA TO ENCODE =================
-    # 👇 VERY IMPORTANT: URL so scanner shows data
-    order_url = f"https://www.lab.arthkarya.com/admin/orders/{order.id}"
-
-    # ================= BARCODE =================
-    barcode = code128.Code128(
-        order_url,
-        barHeight=12 * mm,
-        barWidth=0.4
-    )
-    barcode.drawOn(c, x_margin, y - 12 * mm)
-    y -= 16 * mm
-
-    # ================= ORDER INFO =================
-    text(f"Order ID : {order.order_id}", bold=True)
-    text(f"Date     : {order.created_at.strftime('%d %b %Y')}")
-    text(f"Payment  : {order.payment_status}")
-    y -= 2 * mm
-
-    # ================= CUSTOMER =================
-    text("Customer Details", 10, True)
-    text(f"Name  : {order.customer_name}")
-    text(f"Email : {order.customer_email or '-'}")
-    y -= 2 * mm
-
-    # ================= ADDRESS =================
-    text("Shipping Address", 10, True)
-    for line in order.address.split(","):
-        text(line.strip(), 8)
-    y -= 2 * mm
-
-    # ================= ITEMS =================
-    text("Items", 10, True)
-    for item in order.items.all():
-        text(f"- {item.product.name} x{item.quantity}", 8)
-
-    y -= 2 * mm
-    text(f"Total Qty : {order.qty}", bold=True)
-    text(f"Amount    : ₹{order.total_amount}", bold=True)
-
-    # ================= QR CODE =================
-    qr = qrcode.make(order_url)
-    qr_buf = io.BytesIO()
-    qr.save(qr_buf)
-    qr_buf.seek(0)
-
-    c.drawImage(
-        ImageReader(qr_buf),
-        width - 32 * mm,
-        6 * mm,
-        26 * mm,
-        26 * mm
+
+@api_view(["GET", "POST"])
+@permission_classes([IsAuthenticated])
+def parcel_labels(request):
+    if request.user.role != "admin":
+        return Response(
+            {"error": "Admin role required"},
+            status=status.HTTP_403_FORBIDDEN
+        )
+
+    # POST {"order_ids": [...], "status": "Packed"} or GET ?ids=1,2,3&status=Packed
+    if request.method == "POST":
+        ids = request.data.get("order_ids") or []
+        order_status = request.data.get("status")
+    else:
+        ids = [i for i in request.GET.get("ids", "").split(",") if i]
+        order_status = request.GET.get("status")
+
+    try:
+        ids = [int(i) for i in ids]
+    except (TypeError, ValueError):
+        return Response({"error": "Invalid order ids"}, status=status.HTTP_400_BAD_REQUEST)
+
+    if not ids and not order_status:
+        return Response(
+            {"error": "Pass order ids or a status"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    if order_status and order_status not in dict(Order.ORDER_STATUS):
+        return Response({"error": "Invalid order status"}, status=status.HTTP_400_BAD_REQUEST)
+
+    orders = Order.objects.all()
+    if ids:
+        orders = orders.filter(id__in=ids)
+    if order_status:
+        orders = orders.filter(order_status=order_status)
+
+    count = orders.count()
+    if not count:
+        return Response({"error": "No orders found"}, status=404)
+    if count > LABEL_BATCH_MAX:
+        return Response(
+            {"error": f"Too many orders ({count}), max {LABEL_BATCH_MAX} per batch"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    # rendered into a spooled temp file, then streamed out in chunks
+    output = tempfile.SpooledTemporaryFile(max_size=5 * 1024 * 1024)
+    write_parcel_labels(
+        output,
+        orders.order_by("id").prefetch_related("items__product").iterator(chunk_size=100)
     )
+    output.seek(0)
 
-    c.showPage()
-    c.save()
-    return response
+    filename = f"parcel_labels_{order_status or 'orders'}_{now():%Y%m%d}.pdf".lower()
+    return FileResponse(output, as_attachment=True, filename=filename, content_type="application/pdf")
 
 @api_view(["GET"])
 def accounting_dashboard(request):
@@ -979,36 +1236,40 @@ def accounting_dashboard(request):
     month = request.GET.get("month")
     year = request.GET.get("year")
 
-    orders = Order.objects.filter(order_status="Delivered")
+    sales = DailySales.objects.all()
 
     if month and year:
-        orders = orders.filter(
-            created_at__month=int(month),
-            created_at__year=int(year),
+        sales = sales.filter(
+            day__month=int(month),
+            day__year=int(year),
         )
 
-    gross_sales = orders.aggregate(
-        total=Sum("total_amount")
+    gross_sales = sales.aggregate(
+        total=Sum("delivered_amount")
     )["total"] or Decimal("0")
 
     discount = gross_sales * Decimal("0.05")
     tax = gross_sales * Decimal("0.12")
     net_profit = gross_sales - discount - tax
 
-    # ===== Monthly Profit (last 6 months) =====
-    labels, data = [], []
-    today = now().date()
-
-    for i in range(5, -1, -1):
-        month_date = today.replace(day=1) - timedelta(days=i * 30)
-        total = Order.objects.filter(
-            order_status="Delivered",
-            created_at__year=month_date.year,
-            created_at__month=month_date.month,
-        ).aggregate(Sum("total_amount"))["total_amount__sum"] or Decimal("0")
+    # ===== Monthly Profit (last 6 months, one group-by on the rollup) =====
+    months = []
+    month_start = now().date().replace(day=1)
+    for i in range(6):
+        months.insert(0, month_start)
+        month_start = (month_start - timedelta(days=1)).replace(day=1)
+
+    monthly = dict(
+        DailySales.objects
+        .filter(day__gte=months[0])
+        .annotate(month=TruncMonth("day"))
+        .values("month")
+        .annotate(total=Sum("delivered_amount"))
+        .values_list("month", "total")
+    )
 
-        labels.append(month_date.strftime("%b"))
-        data.append(float(total))
+    labels = [m.strftime("%b") for m in months]
+    data = [float(monthly.get(m) or 0) for m in months]
 
     return Response({
         "kpis": {
@@ -1028,82 +1289,21 @@ def accounting_export_csv(request):
     month = request.GET.get("month")
     year = request.GET.get("year")
 
-    orders = Order.objects.filter(order_status="Delivered")
-
-    if month and year:
-        orders = orders.filter(
-            created_at__month=int(month),
-            created_at__year=int(year),
-        )
-
-    response = HttpResponse(content_type="text/csv")
-    response["Content-Disposition"] = 'attachment; filename="accounting_report.csv"'
-
-    writer = csv.writer(response)
-    writer.writerow([
-        "Order ID",
-        "Date",
-        "Customer",
-        "Gross Amount",
-        "Discount (5%)",
-        "Tax (12%)",
-        "Net Amount",
-        "Payment Status",
-    ])
-
-    for o in orders:
-        discount = o.total_amount * Decimal("0.05")
-        tax = o.total_amount * Decimal("0.12")
-        net = o.total_amount - discount - tax
-
-        writer.writerow([
-            o.order_id,
-            o.created_at.strftime("%d-%m-%Y"),
-            o.customer_name,
-            float(o.total_amount),
-            float(discount),
-            float(tax),
-            float(net),
-            o.payment_status,
-        ])
+    # validate before streaming starts, errors can't be sent mid-file
+    try:
+        if month and year:
+            month_bounds(month, year)
+    except ValueError:
+        return Response({"error": "Invalid month or year"}, status=400)
 
-    return response
+    return stream_csv(accounting_csv_rows(month, year), "accounting_report.csv")
 
 @api_view(["GET"])
 def accounting_export_pdf(request):
-    orders = Order.objects.filter(order_status="Delivered")
-
     response = HttpResponse(content_type="application/pdf")
     response["Content-Disposition"] = 'attachment; filename="accounting_report.pdf"'
 
-    c = canvas.Canvas(response, pagesize=A4)
-    width, height = A4
-
-    y = height - 50
-    c.setFont("Helvetica-Bold", 16)
-    c.drawString(50, y, "Accounting Report")
-
-    y -= 40
-    c.setFont("Helvetica", 11)
-
-    total = orders.aggregate(Sum("total_amount"))["total_amount__sum"] or Decimal("0")
-    discount = total * Decimal("0.05")
-    tax = total * Decimal("0.12")
-    net = total - discount - tax
-
-    lines = [
-        f"Gross Sales: ₹{float(total)}",
-        f"Discount (5%): ₹{float(discount)}",
-        f"Tax (12%): ₹{float(tax)}",
-        f"Net Profit: ₹{float(net)}",
-    ]
-
-    for line in lines:
-        c.drawString(50, y, line)
-        y -= 20
-
-    c.showPage()
-    c.save()
+    write_accounting_pdf(response)
     return response
 
 
@@ -1116,35 +1316,40 @@ def orders_dashboard(request):
     month = request.GET.get("month")
     year = request.GET.get("year")
 
-    orders = Order.objects.all()
+    sales = DailySales.objects.all()
+    product_sales = DailyProductSales.objects.all()
 
     if month and year:
-        orders = orders.filter(
-            created_at__month=int(month),
-            created_at__year=int(year),
+        sales = sales.filter(
+            day__month=int(month),
+            day__year=int(year),
+        )
+        product_sales = product_sales.filter(
+            day__month=int(month),
+            day__year=int(year),
         )
 
     # ================= KPIs =================
-    kpis = {
-        "total_orders": orders.count(),
-        "pending": orders.filter(order_status="Pending").count(),
-        "delivered": orders.filter(order_status="Delivered").count(),
-        "cancelled": orders.filter(order_status="Cancelled").count(),
-    }
+    totals = sales.aggregate(
+        total_orders=Sum("orders"),
+        pending=Sum("pending_orders"),
+        delivered=Sum("delivered_orders"),
+        cancelled=Sum("cancelled_orders"),
+    )
+    kpis = {key: value or 0 for key, value in totals.items()}
 
     # ================= DAILY SALES =================
     daily = (
-        orders
-        .filter(order_status="Delivered")
-        .values("created_at__date")
-        .annotate(total=Sum("total_amount"))
-        .order_by("created_at__date")
+        sales
+        .values("day")
+        .annotate(delivered_amount=Sum("delivered_amount"), delivered=Sum("delivered_orders"))
+        .filter(delivered__gt=0)
+        .order_by("day")
     )
 
     # ================= TOP PRODUCTS =================
     top_products = (
-        OrderItem.objects
-        .filter(order__in=orders)
+        product_sales
         .values("product__name")
         .annotate(qty=Sum("quantity"))
         .order_by("-qty")[:5]
@@ -1153,8 +1358,8 @@ def orders_dashboard(request):
     return Response({"data":{
         "kpis": kpis,
         "daily_sales": {
-            "labels": [d["created_at__date"].strftime("%d %b") for d in daily],
-            "data": [float(d["total"]) for d in daily],
+            "labels": [d["day"].strftime("%d %b") for d in daily],
+            "data": [float(d["delivered_amount"]) for d in daily],
         },
         "top_products": [
             {
@@ -1170,137 +1375,170 @@ def orders_dashboard(request):
 def orders_export_csv(request):
     month = request.GET.get("month")
     year = request.GET.get("year")
+    order_status = request.GET.get("status")
+
+    try:
+        if month and year:
+            month_bounds(month, year)
+    except ValueError:
+        return Response({"error": "Invalid month or year"}, status=400)
 
-    orders = Order.objects.prefetch_related("items__product")
+    return stream_csv(orders_csv_rows(month, year, order_status), "orders_report.csv")
 
-    if month and year:
-        orders = orders.filter(
-            created_at__month=int(month),
-            created_at__year=int(year),
+@api_view(["GET"])
+def orders_export_pdf(request):
+    response = HttpResponse(content_type="application/pdf")
+    response["Content-Disposition"] = 'attachment; filename="orders_report.pdf"'
+
+    write_orders_pdf(response)
+    return response
+
+
+# =============== EXPORT JOBS ===============
+def export_job_row(request, job):
+    return {
+        "id": job.id,
+        "kind": job.kind,
+        "params": job.params,
+        "status": job.status,
+        "error": job.error,
+        "created_at": job.created_at,
+        "started_at": job.started_at,
+        "finished_at": job.finished_at,
+        "download_url": (
+            request.build_absolute_uri(f"/api/reports/jobs/{job.id}/download/")
+            if job.status == "done" else None
+        ),
+    }
+
+
+@api_view(["GET", "POST"])
+@permission_classes([IsAuthenticated])
+def export_jobs(request):
+    if request.user.role != "admin":
+        return Response(
+            {"error": "Admin role required"},
+            status=status.HTTP_403_FORBIDDEN
         )
 
-    response = HttpResponse(content_type="text/csv")
-    response["Content-Disposition"] = 'attachment; filename="orders_report.csv"'
+    if request.method == "GET":
+        jobs = ExportJob.objects.filter(created_by=request.user).order_by("-id")[:50]
+        return Response({"data": [export_job_row(request, job) for job in jobs]})
 
-    writer = csv.writer(response)
-    writer.writerow([
-        "Order ID",
-        "Date",
-        "Customer",
-        "Product",
-        "Quantity",
-        "Order Status",
-        "Amount",
-    ])
+    kind = request.data.get("kind")
+    try:
+        params = clean_params(kind, request.data)
+    except ValueError as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
-    for order in orders:
-        for item in order.items.all():
-            writer.writerow([
-                order.order_id,
-                order.created_at.strftime("%d-%m-%Y"),
-                order.customer_name,
-                item.product.name,      # ✅ FIX HERE
-                item.quantity,
-                order.order_status,
-                float(order.total_amount),
-            ])
+    job = ExportJob.objects.create(kind=kind, params=params, created_by=request.user)
+    return Response(
+        {"message": "Export queued", "data": export_job_row(request, job)},
+        status=status.HTTP_202_ACCEPTED
+    )
 
-    return response
 
 @api_view(["GET"])
-def orders_export_pdf(request):
-    response = HttpResponse(content_type="application/pdf")
-    response["Content-Disposition"] = 'attachment; filename="orders_report.pdf"'
+@permission_classes([IsAuthenticated])
+def export_job_detail(request, id):
+    if request.user.role != "admin":
+        return Response(
+            {"error": "Admin role required"},
+            status=status.HTTP_403_FORBIDDEN
+        )
+
+    try:
+        job = ExportJob.objects.get(id=id)
+    except ExportJob.DoesNotExist:
+        return Response({"error": "Job not found"}, status=404)
 
-    c = canvas.Canvas(response, pagesize=A4)
-    width, height = A4
+    return Response({"data": export_job_row(request, job)})
 
-    y = height - 40
-    c.setFont("Helvetica-Bold", 16)
-    c.drawString(50, y, "Orders Report")
 
-    y -= 30
-    c.setFont("Helvetica", 11)
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def export_job_download(request, id):
+    if request.user.role != "admin":
+        return Response(
+            {"error": "Admin role required"},
+            status=status.HTTP_403_FORBIDDEN
+        )
 
-    statuses = ["Pending", "Delivered", "Cancelled"]
+    try:
+        job = ExportJob.objects.get(id=id)
+    except ExportJob.DoesNotExist:
+        return Response({"error": "Job not found"}, status=404)
+
+    if job.status != "done" or not job.file:
+        return Response({"error": f"Job is {job.status}"}, status=status.HTTP_409_CONFLICT)
+
+    # file is streamed in chunks by FileResponse, nothing is rendered here
+    return FileResponse(
+        job.file.open("rb"),
+        as_attachment=True,
+        filename=job.filename or job.file.name.rsplit("/", 1)[-1]
+    )
 
-    for s in statuses:
-        count = Order.objects.filter(order_status=s).count()
-        c.drawString(50, y, f"{s} Orders: {count}")
-        y -= 20
+DASHBOARD_CACHE_SECONDS = 30
 
-    c.showPage()
-    c.save()
-    return response
 
-@api_view(["GET"])
-def dashboard_overview(request):
+def build_dashboard_overview():
     today = now().date()
     start_of_week = today - timedelta(days=6)
 
-    # ================= TOTAL COUNTS =================
-    total_orders = Order.objects.count()
-
-    total_sales = (
-        Order.objects
-        .filter(order_status="Delivered")
-        .aggregate(total=Sum("total_amount"))["total"]
-        or Decimal("0.00")
+    # ================= TOTAL COUNTS (conditional aggregates) =================
+    order_stats = DailySales.objects.aggregate(
+        total_orders=Sum("orders"),
+        total_sales=Sum("delivered_amount"),
+    )
+    product_stats = Product.objects.aggregate(
+        total_products=Count("id"),
+        low_stock=Count("id", filter=Q(stock__lte=10)),
     )
-
     total_customers = CustomUser.objects.filter(role="customer").count()
-    total_products = Product.objects.count()
-
-    low_stock_count = Product.objects.filter(stock__lte=10).count()
 
     # ================= RECENT ORDERS =================
-    recent_orders_qs = Order.objects.order_by("-created_at")[:5]
-
-    recent_orders = []
-    for o in recent_orders_qs:
-        recent_orders.append({
-            "order_id": o.order_id,
-            "customer": o.customer_name,
-            "amount": float(o.total_amount),
-            "status": o.order_status,
-        })
+    recent_orders = [
+        {
+            "order_id": o["order_id"],
+            "customer": o["customer_name"],
+            "amount": float(o["total_amount"]),
+            "status": o["order_status"],
+        }
+        for o in Order.objects.order_by("-created_at").values(
+            "order_id", "customer_name", "total_amount", "order_status"
+        )[:5]
+    ]
 
     # ================= LOW STOCK PRODUCTS =================
-    low_stock_products = []
-    for p in Product.objects.filter(stock__lte=10)[:5]:
-        low_stock_products.append({
-            "name": p.name,
-            "stock": p.stock,
-        })
+    low_stock_products = list(
+        Product.objects.filter(stock__lte=10).values("name", "stock")[:5]
+    )
+
+    # ================= WEEKLY SALES CHART (rollup rows) =================
+    daily = dict(
+        DailySales.objects
+        .filter(day__gte=start_of_week)
+        .values("day")
+        .annotate(total=Sum("delivered_amount"))
+        .values_list("day", "total")
+    )
 
-    # ================= WEEKLY SALES CHART =================
     chart_labels = []
     chart_data = []
-
     for i in range(7):
         day = start_of_week + timedelta(days=i)
-
-        total = (
-            Order.objects
-            .filter(
-                order_status="Delivered",
-                created_at__date=day
-            )
-            .aggregate(total=Sum("total_amount"))["total"]
-            or Decimal("0.00")
-        )
-
         chart_labels.append(day.strftime("%a"))  # Mon Tue Wed
-        chart_data.append(float(total))
+        chart_data.append(float(daily.get(day) or 0))
 
     # ================= RESPONSE =================
-    return Response({
+    return {
         "stats": {
-            "total_orders": total_orders,
-            "total_sales": float(total_sales),
+            "total_orders": order_stats["total_orders"] or 0,
+            "total_sales": float(order_stats["total_sales"] or Decimal("0.00")),
             "customers": total_customers,
-            "products": total_products,
-            "low_stock": low_stock_count,
+            "products": product_stats["total_products"],
+            "low_stock": product_stats["low_stock"],
         },
 
         "chart": {
@@ -1310,4 +1548,12 @@ def dashboard_overview(request):
 
         "recent_orders": recent_orders,
         "low_stock_products": low_stock_products,
-    })
+    }
+
+
+@api_view(["GET"])
+def dashboard_overview(request):
+    # 6 queries at most, then served from cache for DASHBOARD_CACHE_SECONDS
+    return Response(
+        cached_for("dashboard:overview", DASHBOARD_CACHE_SECONDS, build_dashboard_overview)
+    )
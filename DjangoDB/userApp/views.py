@@ -9,6 +9,13 @@ import json
 import random
 from django.utils.text import slugify
 from electricApp.models import *
+from electricApp.images import image_fields, IMAGE_BANNER_WIDTH
+from electricApp.carts import CartError, parse_cart_ops, apply_cart_ops, cart_summary
+from electricApp.holds import HoldError, place_holds, release_holds
+from electricApp.ratings import REVIEW_BATCH_MAX, moderate_reviews, product_rating_payload
+from electricApp.cache import bump_products
+from django.db import transaction
+from django.db.models import Count, Q
 from django.conf import settings
 from django.core.mail import send_mail
 from smtplib import SMTPException
@@ -29,9 +36,11 @@ from smtplib import SMTPException
 
 # REVIEWS (PRODUCT)
 # submit_review            → Client: submit product review (pending)
-# admin_reviews             → Admin: view all reviews (approve / reject)
+# admin_reviews             → Admin: view all reviews / ?status= &page= moderation queue
 # client_reviews            → Client: view approved reviews only
-# update_review_status      → Admin: update review status
+# product_reviews           → Client: one product's approved reviews (cursor) + rating summary
+# update_review_status      → Admin: update review status (keeps ProductRating in step)
+# review_batch_status       → Admin: approve / reject a list of review ids at once
 
 # ===================== END REVIEWS =====================
 
@@ -269,6 +278,16 @@ def submit_review(request):
     if not rating or not comment:
         return Response({"error": "Rating & comment required"}, status=400)
 
+    try:
+        rating = int(rating)
+        if not 1 <= rating <= 5:
+            raise ValueError
+    except (TypeError, ValueError):
+        return Response({"error": "Rating must be 1 to 5"}, status=400)
+
+    if not Product.objects.filter(id=product_id).exists():
+        return Response({"error": "Product not found"}, status=404)
+
     ProductReview.objects.create(
         product_id=product_id,
         user=request.user,
@@ -281,6 +300,9 @@ def submit_review(request):
         "message": "Review submitted, waiting for approval"
     })
 
+REVIEW_PAGE_MAX = 200
+
+
 # get all product reviews to admin site for (aproved and reject) 
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
@@ -301,24 +323,72 @@ def admin_reviews(request):
             status=status.HTTP_403_FORBIDDEN
         )
 
-    reviews = ProductReview.objects.select_related(
-        "product", "user"
-    ).order_by("-created_at")
+    # ?status=pending|approved|rejected  &sort=oldest (queue order)  &page= &page_size=
+    review_status = request.GET.get("status")
+    if review_status and review_status not in dict(ProductReview.STATUS_CHOICES):
+        return Response({"error": "Invalid status"}, status=400)
+    order = ("created_at", "id") if request.GET.get("sort") == "oldest" else ("-created_at", "-id")
+
+    reviews = ProductReview.objects.order_by(*order)
+    if review_status:
+        reviews = reviews.filter(status=review_status)
+
+    # ---------- LEGACY : full list when no page ----------
+    if "page" not in request.GET:
+        reviews = reviews.select_related("product", "user")
+
+        data = [{
+            "id": r.id,
+            "product_id": r.product.id,
+            "product": r.product.name,
+            "user": r.user.username if r.user else "Guest",
+            "rating": r.rating,
+            "comment": r.comment,
+            "status": r.status,
+            "date": r.created_at.strftime("%d %b %Y")
+        } for r in reviews]
 
-    data = [{
-        "id": r.id,
-        "product_id": r.product.id,
-        "product": r.product.name,
-        "user": r.user.username if r.user else "Guest",
-        "rating": r.rating,
-        "comment": r.comment,
-        "status": r.status,
-        "date": r.created_at.strftime("%d %b %Y")
-    } for r in reviews]
+        return Response({
+            "count": len(data),
+            "reviews": data
+        })
+
+    # ---------- PAGE : moderation queue ----------
+    try:
+        page = int(request.GET.get("page", 1))
+        page_size = min(int(request.GET.get("page_size", 50)), REVIEW_PAGE_MAX)
+        if page < 1 or page_size < 1:
+            raise ValueError
+    except ValueError:
+        return Response({"error": "page and page_size must be positive numbers"}, status=400)
+
+    # per status totals for the queue tabs, one query
+    status_counts = ProductReview.objects.aggregate(**{
+        value: Count("id", filter=Q(status=value)) for value, _ in ProductReview.STATUS_CHOICES
+    })
+    total = status_counts[review_status] if review_status else sum(status_counts.values())
+    offset = (page - 1) * page_size
+    rows = reviews.values(
+        "id", "product_id", "product__name", "user__username",
+        "rating", "comment", "status", "created_at"
+    )[offset:offset + page_size]
 
     return Response({
-        "count": len(data),
-        "reviews": data
+        "count": total,
+        "page": page,
+        "page_size": page_size,
+        "num_pages": (total + page_size - 1) // page_size,
+        "status_counts": status_counts,
+        "reviews": [{
+            "id": r["id"],
+            "product_id": r["product_id"],
+            "product": r["product__name"],
+            "user": r["user__username"] or "Guest",
+            "rating": r["rating"],
+            "comment": r["comment"],
+            "status": r["status"],
+            "date": r["created_at"].strftime("%d %b %Y")
+        } for r in rows]
     })
 
 # get all product and render to client side 
@@ -359,6 +429,67 @@ def client_reviews(request):
         "reviews": data
     })
 
+# one product's approved reviews, newest first, ?limit= &cursor=<last id>
+PRODUCT_REVIEWS_LIMIT = 10
+PRODUCT_REVIEWS_MAX_LIMIT = 50
+
+
+@api_view(["GET"])
+@permission_classes([AllowAny])
+def product_reviews(request, product_id):
+    is_admin = (
+        request.user.is_authenticated
+        and getattr(request.user, "role", None) == "admin"
+    )
+
+    has_internal_cookie = (
+        request.COOKIES.get(settings.COOKIE_NAME_KEY)
+        == settings.INTERNAL_SECRET_VALUE
+    )
+
+    if not (is_admin or has_internal_cookie):
+        return Response(
+            {"error": "Unauthorized"},
+            status=status.HTTP_403_FORBIDDEN
+        )
+
+    try:
+        limit = min(int(request.GET.get("limit", PRODUCT_REVIEWS_LIMIT)), PRODUCT_REVIEWS_MAX_LIMIT)
+        cursor = request.GET.get("cursor")
+        cursor = int(cursor) if cursor else None
+        if limit <= 0:
+            raise ValueError
+    except ValueError:
+        return Response(
+            {"error": "limit and cursor must be positive numbers"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    product = get_object_or_404(Product.objects.select_related("rating"), id=product_id)
+
+    reviews = ProductReview.objects.filter(product_id=product_id, status="approved")
+    if cursor:
+        reviews = reviews.filter(id__lt=cursor)
+    rows = list(
+        reviews.order_by("-id")
+        .values("id", "user__username", "rating", "comment", "created_at")[:limit + 1]
+    )
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    return Response({
+        "product_id": product.id,
+        "rating": product_rating_payload(product),
+        "reviews": [{
+            "id": r["id"],
+            "user": r["user__username"] or "Guest",
+            "rating": r["rating"],
+            "comment": r["comment"],
+            "date": r["created_at"].strftime("%d %b %Y")
+        } for r in rows],
+        "next_cursor": rows[-1]["id"] if has_more else None,
+    })
+
 # admin update product reviews status (pending to aproved and rejected)
 @api_view(["PUT"])
 @permission_classes([IsAuthenticated])
@@ -367,12 +498,44 @@ def update_review_status(request, id):
         return Response({"error": "Unauthorized"}, status=403)
 
     status_val = request.data.get("status")
-    review = ProductReview.objects.get(id=id)
-    review.status = status_val
-    review.save()
+    if status_val not in dict(ProductReview.STATUS_CHOICES):
+        return Response({"error": "Invalid status"}, status=400)
+
+    # rating summary follows reviews entering / leaving "approved" (ratings.py)
+    result = moderate_reviews([id], status_val)
+    if not result["matched"]:
+        return Response({"error": "Review not found"}, status=404)
+    transaction.on_commit(lambda: bump_products(result["products"]))
 
     return Response({"message": "Review status updated"})
 
+
+@api_view(["POST"])
+@permission_classes([IsAuthenticated])
+def review_batch_status(request):
+    if request.user.role != "admin":
+        return Response({"error": "Unauthorized"}, status=403)
+
+    # {"ids": [1, 2, 3], "status": "approved" | "rejected" | "pending"}
+    status_val = request.data.get("status")
+    ids = request.data.get("ids")
+    if status_val not in dict(ProductReview.STATUS_CHOICES):
+        return Response({"error": "Invalid status"}, status=400)
+    if not isinstance(ids, list) or not ids:
+        return Response({"error": "ids must be a non-empty list"}, status=400)
+    if len(ids) > REVIEW_BATCH_MAX:
+        return Response({"error": f"At most {REVIEW_BATCH_MAX} ids per request"}, status=400)
+    try:
+        ids = [int(i) for i in ids]
+    except (TypeError, ValueError):
+        return Response({"error": "ids must be numbers"}, status=400)
+
+    result = moderate_reviews(ids, status_val)
+    products = result.pop("products")
+    transaction.on_commit(lambda: bump_products(products))
+
+    return Response({"message": "Review status updated", **result})
+
 # ===============Reviews EDN ========================
 
 @api_view(["POST"])
@@ -407,7 +570,7 @@ def wishlist_items(request):
             "product_id": i.product.id,
             "name": i.product.name,
             "price": i.product.price,
-            "image": i.product.image.url if i.product.image else None,
+            **image_fields(i.product.image.name, formats=i.product.image_formats),
         })
 
     return Response({"data": data})
@@ -462,29 +625,41 @@ def add_to_cart(request):
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
 def cart_items(request):
-    items = Cart.objects.filter(user=request.user).select_related("product")
+    # lines + totals + stock check in one query (electricApp/carts.py)
+    return Response(cart_summary(request.user))
 
-    data = []
-    total = 0
 
-    for i in items:
-        subtotal = i.quantity * i.product.price
-        total += subtotal
+@api_view(["POST"])
+@permission_classes([IsAuthenticated])
+def cart_batch(request):
+    # {"ops": [{"op": "add" | "set" | "remove", "product_id": 1, "quantity": 2}, ...]}
+    try:
+        ops = parse_cart_ops(request.data.get("ops"))
+        apply_cart_ops(request.user, ops)
+    except CartError as e:
+        return Response({"error": e.message}, status=e.status_code)
 
-        data.append({
-            "id": i.id,
-            "product_id": i.product.id,
-            "name": i.product.name,
-            "price": float(i.product.price),
-            "quantity": i.quantity,
-            "subtotal": float(subtotal),
-            "image": i.product.image.url if i.product.image else None,
-        })
+    return Response(cart_summary(request.user))
 
-    return Response({
-        "items": data,
-        "total": float(total)
-    })
+@api_view(["POST", "DELETE"])
+@permission_classes([IsAuthenticated])
+def cart_reserve(request):
+    # POST: hold the cart's quantities for STOCK_HOLD_SECONDS (checkout started)
+    # DELETE: give the holds back (checkout abandoned)
+    if request.method == "DELETE":
+        release_holds(request.user)
+        return Response({"message": "Holds released"})
+
+    items = dict(Cart.objects.filter(user=request.user).values_list("product_id", "quantity"))
+    if not items:
+        return Response({"error": "Cart is empty"}, status=400)
+
+    try:
+        expires_at = place_holds(request.user, items)
+    except HoldError as e:
+        return Response({"error": e.message}, status=e.status_code)
+
+    return Response({"expires_at": expires_at.isoformat(), **cart_summary(request.user)})
 
 @api_view(["PUT"])
 @permission_classes([IsAuthenticated])
@@ -532,9 +707,13 @@ def remove_from_cart(request, cart_id):
 @api_view(['GET'])
 @permission_classes([AllowAny])
 def sale_banner(request):
-    banners = SaleBanner.objects.filter(is_active=True)
+    banners = list(
+        SaleBanner.objects
+        .filter(is_active=True)
+        .select_related("product__category", "product__subcategory")
+    )
 
-    if not banners.exists():
+    if not banners:
         return Response({"message": "Please create sales banner"})
 
     data = []
@@ -544,7 +723,7 @@ def sale_banner(request):
             "category": banner.product.category.name if banner.product.category else None,
             "subcategory": banner.product.subcategory.name if banner.product.subcategory else None,
             "description": banner.discription,
-            "image": banner.product.image.url if banner.product.image else None
+            **image_fields(banner.product.image.name, width=IMAGE_BANNER_WIDTH, formats=banner.product.image_formats)
         })
 
     return Response({"banners": data})